@@ -0,0 +1,37 @@
+"""
+Thread scaling of the chunked beam reductions.
+
+Times the first (uncached) Beam.statistics() pass and the threaded 2-D
+phase-space histogram on a synthetic beam for increasing worker counts.
+
+Usage:
+    python benchmarks/bench_reductions.py [n_particles]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+from synapticTrack.beam import Beam
+from synapticTrack.utils.parallel import histogram2d
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    func(*args, **kwargs)
+    return time.perf_counter() - start
+
+def main(n_particles=20_000_000):
+    rng = np.random.default_rng(0)
+    data = rng.normal(scale=[1.0, 1.0, 1.0, 1.0, 0.1, 0.001], size=(n_particles, 6))
+    print(f"{'workers':<10}{'statistics s':>14}{'histogram2d s':>16}")
+    workers = 1
+    while workers <= (os.cpu_count() or 1):
+        stats_s = min(timed(Beam(data, 40, 8, 0.0, 0.010).statistics, workers=workers) for _ in range(3))
+        hist_s = min(timed(histogram2d, data[:, 0], data[:, 1], bins=200, range=[(-5, 5), (-5, 5)],
+                           workers=workers) for _ in range(3))
+        print(f"{workers:<10}{stats_s:>14.3f}{hist_s:>16.3f}")
+        workers *= 2
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000_000)
@@ -0,0 +1,73 @@
+"""
+Throughput of the whitespace-delimited text readers.
+
+Compares the shared np.loadtxt path used by TrackIO.read and the ScannerIO
+readers with the previous pd.read_csv(sep=r'\s+', engine='python') path on
+a synthetic 1M-particle TRACK coord.out and a 10k-point Allison scan.
+
+Usage:
+    python benchmarks/bench_text_readers.py [n_particles]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from synapticTrack.io import TrackIO, ScannerIO
+
+def make_track_file(filename, n):
+    rng = np.random.default_rng(0)
+    particles = np.column_stack([np.arange(n), np.ones(n), rng.normal(size=(n, 6))])
+    with open(filename, 'w') as f:
+        f.write(" Nseed      iq         dt[nsec]         dW[MeV/u]           x[cm]"
+                "           x'[mrad]            y[cm]           y'[mrad]\n")
+        np.savetxt(f, particles, fmt=['%7d', '%6d'] + ['%17.5E'] * 6)
+
+def make_allison_file(filename, n):
+    rng = np.random.default_rng(1)
+    with open(filename, 'w') as f:
+        f.write("# X [mm]\tX' [mrad]\tX current [A]\tHV [100V]\tY current [A]\n")
+        np.savetxt(f, rng.normal(size=(n, 5)), fmt='%.6e', delimiter='\t')
+
+def legacy_track_read(filename):
+    columns = ["Nseed", "iq", "dt", "dW", "x", "xp", "y", "yp"]
+    return pd.read_csv(filename, sep=r'\s+', skiprows=1, names=columns, engine='python')
+
+def legacy_allison_read(filename):
+    cols = ["x", "xp", "x_current", "hv", "y_current"]
+    return pd.read_csv(filename, sep=r'\s+', skiprows=1, names=cols, engine='python')
+
+def throughput(func, filename, repeat=3):
+    size_mb = os.path.getsize(filename) / 1e6
+    best = min(_timed(func, filename) for _ in range(repeat))
+    return size_mb / best, best
+
+def _timed(func, filename):
+    start = time.perf_counter()
+    func(filename)
+    return time.perf_counter() - start
+
+def main(n_particles=1_000_000):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        track_file = os.path.join(tmpdir, "coord.out")
+        allison_file = os.path.join(tmpdir, "allison.txt")
+        make_track_file(track_file, n_particles)
+        make_allison_file(allison_file, 10_000)
+
+        cases = [
+            ("TRACK coord.out (python engine)", legacy_track_read, track_file),
+            ("TRACK coord.out (TrackIO.read)",
+             lambda f: TrackIO.read(f, 40, 8, 0.0, 0.010), track_file),
+            ("Allison scan (python engine)", legacy_allison_read, allison_file),
+            ("Allison scan (ScannerIO)", ScannerIO.read_allison_scanner, allison_file),
+        ]
+        print(f"{'reader':<36}{'MB/s':>10}{'seconds':>10}")
+        for name, func, filename in cases:
+            rate, seconds = throughput(func, filename)
+            print(f"{name:<36}{rate:>10.1f}{seconds:>10.3f}")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
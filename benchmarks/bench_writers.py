@@ -0,0 +1,70 @@
+"""
+Write/read round-trip times of the JuTrack and TRACK beam writers.
+
+Compares the previous DataFrame.to_csv writers with the chunked text
+writer (text_io.write_columns) and the raw float64 JuTrack binary format
+on a synthetic beam.
+
+Usage:
+    python benchmarks/bench_writers.py [n_particles]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from synapticTrack.beam import Beam
+from synapticTrack.io import JuTrackIO, TrackIO
+
+def make_beam(n):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.normal(scale=[1.0, 1.0, 1.0, 1.0, 0.1, 0.001], size=(n, 6)),
+                      columns=['x', 'xp', 'y', 'yp', 'dt', 'dW'])
+    return Beam(df, 40, 8, 0.0, 0.010)
+
+def legacy_jutrack_write(filename, beam):
+    JuTrackIO.convert_to_jutrack_coordinates(beam).to_csv(filename, sep=' ', index=False, header=False)
+
+def legacy_track_write(filename, beam):
+    df = pd.DataFrame({
+        "Nseed": np.arange(beam.macroparticles), "iq": beam.charge_state,
+        "dt": beam.state['dt'], "dW": beam.state['dW'],
+        "x": beam.state['x'] / 10, "xp": beam.state['xp'],
+        "y": beam.state['y'] / 10, "yp": beam.state['yp']})
+    df.to_csv(filename, sep=' ', index=False, header=False, float_format='%.6e')
+
+def read_jutrack(filename):
+    return JuTrackIO.read(filename, 40, 8, 0.0, 0.010)
+
+def timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+def main(n_particles=1_000_000):
+    beam = make_beam(n_particles)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        jutrack_text = os.path.join(tmpdir, "beam.dat")
+        jutrack_binary = os.path.join(tmpdir, "beam.bin")
+        track_text = os.path.join(tmpdir, "coord.out")
+        cases = [
+            ("JuTrack text (to_csv)", legacy_jutrack_write, read_jutrack, jutrack_text),
+            ("JuTrack text (write)", JuTrackIO.write, read_jutrack, jutrack_text),
+            ("JuTrack binary", JuTrackIO.write_binary,
+             lambda f: JuTrackIO.read_binary(f, 40, 8, 0.0, 0.010), jutrack_binary),
+            ("TRACK coord.out (to_csv)", legacy_track_write, None, track_text),
+            ("TRACK coord.out (write)", TrackIO.write,
+             lambda f: TrackIO.read(f, 40, 8, 0.0, 0.010), track_text),
+        ]
+        print(f"{'writer':<28}{'write s':>10}{'read s':>10}{'MB':>10}")
+        for name, write, read, filename in cases:
+            write_s = min(timed(write, filename, beam) for _ in range(3))
+            read_s = min(timed(read, filename) for _ in range(3)) if read else float('nan')
+            size_mb = os.path.getsize(filename) / 1e6
+            print(f"{name:<28}{write_s:>10.3f}{read_s:>10.3f}{size_mb:>10.1f}")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
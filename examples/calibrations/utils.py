@@ -88,12 +88,10 @@ def get_rms_beam_size(output_dir, exclude_allison=1, verbose=0):
     sim_rms_x = np.zeros(4, dtype=float)
     sim_rms_y = np.zeros(4, dtype=float)
 
-    for i, file in enumerate(coord_list):
-        filename = os.path.join(output_dir, file)
-
-        beam_io_manager = BeamDataIOManager()
-        beam = beam_io_manager.read(code='track', filename=filename, mass_number=40, charge_state=8, beam_current=0, reference_energy=0.10)
+    filenames = [os.path.join(output_dir, file) for file in coord_list]
+    beams = BeamDataIOManager.read_many('track', filenames, mass_number=40, charge_state=8, beam_current=0, reference_energy=0.10)
 
+    for i, beam in enumerate(beams):
         sim_rms_size.loc[len(sim_rms_size)] = beam.rms_size
         sim_rms_size.loc[i, 'z'] = float(z_scanner[i])*10
 
@@ -119,11 +117,9 @@ def get_beam_data(output_dir, output_files):
 
     beam_centroid = pd.DataFrame(columns=['z', 'x', 'xp', 'y', 'yp', 'dt', 'dW'])
     beam_rms_size = pd.DataFrame(columns=['z', 'x', 'xp', 'y', 'yp', 'dt', 'dW'])
-    for i, file in enumerate(output_files):
-        filename = os.path.join(output_dir, file)
-
-        beam_io_manager = BeamDataIOManager() 
-        beam = beam_io_manager.read(code='track', filename=filename, mass_number=40, charge_state=8, beam_current=0, reference_energy=0.10)
+    filenames = [os.path.join(output_dir, file) for file in output_files]
+    beams = BeamDataIOManager.read_many('track', filenames, mass_number=40, charge_state=8, beam_current=0, reference_energy=0.10)
+    for i, beam in enumerate(beams):
         beam_centroid.loc[len(beam_centroid)] = beam.centroid
         beam_rms_size.loc[len(beam_rms_size)] = beam.rms_size
         beam_centroid.loc[i, 'z'] = z_scanner[i]*10
@@ -15,7 +15,7 @@ setup(
     install_requires=[
         "torch>=2.9.1",
         "gymnasium>=1.2.2",
-        "numpy>=1.20",
+        "numpy>=1.23",
         "scipy>=1.7",
         "matplotlib>=3.4",
         "pandas>=1.3",
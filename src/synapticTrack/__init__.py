@@ -1,5 +1,5 @@
 from .analysis import *
-from .beam import Beam, BeamWS, BeamAS, Twiss
+from .beam import Beam, BeamWS, BeamAS, Twiss, BeamStatistics, MultiSpeciesBeam, BeamEnsemble
 from .io import BeamDataIOManager
 from .lattice import *
 from .opt import *
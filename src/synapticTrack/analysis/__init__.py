@@ -1 +1,6 @@
 from .scanner_analysis import *
+from .emittance_analysis import *
+from .profile_fit import *
+from .scan_series import *
+from .allison_analysis import *
+from .batch_analysis import *
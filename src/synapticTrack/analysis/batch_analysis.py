@@ -0,0 +1,125 @@
+import os
+import glob
+import time
+import importlib.util
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from synapticTrack.analysis.scan_series import SCAN_ANALYSES
+from synapticTrack.io import BeamDataIOManager
+
+# Results table format -> writer, by file suffix
+RESULTS_WRITERS = {
+    '.csv': lambda table, filename: table.to_csv(filename, index=False),
+    '.parquet': lambda table, filename: table.to_parquet(filename, index=False),
+    '.jsonl': lambda table, filename: table.to_json(filename, orient='records', lines=True)
+}
+
+# Packages pandas can write Parquet with; one of them must be installed (extra 'parquet')
+PARQUET_ENGINES = ('pyarrow', 'fastparquet')
+
+def find_scan_files(path: str, pattern: str = '*.txt') -> list:
+    """
+    Expands a scan file, a directory (searched recursively for `pattern`) or a glob into sorted file names.
+    """
+    if os.path.isdir(path):
+        return sorted(str(p) for p in Path(path).rglob(pattern) if p.is_file())
+    if glob.has_magic(path):
+        return sorted(p for p in glob.glob(path, recursive=True) if os.path.isfile(p))
+    return [path]
+
+def analyze_scan_files(scanner: str, filenames, workers: int = None, progress=None) -> pd.DataFrame:
+    """
+    Analyzes many scan files in a process pool, without plotting.
+
+    A file that cannot be read or analyzed does not stop the batch; its
+    row has status 'error' and the exception message.
+
+    Args:
+        scanner (str): 'wire' or 'allison'.
+        filenames (list of str): Scan files.
+        workers (int, optional): Number of worker processes. Defaults to the CPU count;
+                                 1 analyzes serially in this process.
+        progress (callable, optional): progress(done, total), called as results arrive.
+
+    Returns:
+        pd.DataFrame: One row per file, in input order: scan_id, file, status, error, warnings,
+                      seconds and the results of analyze_wire_scanner / analyze_allison_scanner_2d.
+    """
+    if scanner not in SCAN_ANALYSES:
+        raise KeyError(f"Unknown scanner '{scanner}'")
+    tasks = [(scanner, str(filename)) for filename in filenames]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(tasks)))
+
+    if workers == 1:
+        rows = _collect(map(_analyze_task, tasks), len(tasks), progress)
+    else:
+        chunksize = max(1, len(tasks) // (workers * 16))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            rows = _collect(executor.map(_analyze_task, tasks, chunksize=chunksize), len(tasks), progress)
+    return pd.DataFrame(rows, columns=_result_columns(rows))
+
+def check_results_format(filename: str) -> str:
+    """
+    Checks that a results table can be written to `filename`, before any scan is analyzed.
+
+    Returns:
+        str: The file suffix.
+
+    Raises:
+        ValueError: For a suffix other than .csv, .parquet or .jsonl.
+        ImportError: For .parquet without a Parquet engine (pip install synapticTrack[parquet]).
+    """
+    suffix = Path(filename).suffix.lower()
+    if suffix not in RESULTS_WRITERS:
+        raise ValueError(f"Unsupported results format '{suffix}'; use one of {list(RESULTS_WRITERS)}")
+    if suffix == '.parquet' and not any(importlib.util.find_spec(engine) for engine in PARQUET_ENGINES):
+        raise ImportError("Writing Parquet needs pyarrow or fastparquet; install synapticTrack[parquet]")
+    return suffix
+
+def write_results_table(table: pd.DataFrame, filename: str):
+    """
+    Writes a results table as CSV, Parquet or JSON lines, chosen by the file suffix.
+    """
+    RESULTS_WRITERS[check_results_format(filename)](table, filename)
+
+def _collect(results, total, progress):
+    rows = []
+    for row in results:
+        rows.append(row)
+        if progress is not None:
+            progress(len(rows), total)
+    return rows
+
+def _result_columns(rows):
+    columns = {key: None for key in ['scan_id', 'file', 'status', 'error', 'warnings', 'seconds']}
+    for row in rows:
+        columns.update(dict.fromkeys(row))
+    return list(columns)
+
+def _analyze_task(task):
+    """Process-pool worker for analyze_scan_files: one results row per file."""
+    scanner, filename = task
+    analysis, _ = SCAN_ANALYSES[scanner]
+    start = time.perf_counter()
+    row = {'scan_id': Path(filename).stem, 'file': filename, 'status': 'ok', 'error': None}
+    try:
+        # Fit warnings are kept in the row instead of flooding stderr from every worker
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            scan = BeamDataIOManager.read_scanner(scanner, filename)
+            results = analysis(scan, plot=False)
+        row['warnings'] = '; '.join(dict.fromkeys(str(w.message) for w in caught)) or None
+        row.update({key: [float(v) for v in value] if isinstance(value, (list, tuple, np.ndarray)) else float(value)
+                    for key, value in results.items()})
+    except Exception as e:
+        row['status'] = 'error'
+        row['error'] = f"{type(e).__name__}: {e}"
+    row['seconds'] = time.perf_counter() - start
+    return row
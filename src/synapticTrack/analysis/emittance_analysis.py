@@ -0,0 +1,141 @@
+import numpy as np
+import pandas as pd
+
+from synapticTrack.beam import Twiss
+from synapticTrack.utils.math_functions import compute_mahalanobis_squared
+from synapticTrack.utils.stats import Moments
+
+# Planes of Beam / BeamEnsemble columns for fractional emittances
+EMITTANCE_PLANES = {'x': ('x', 'xp'), 'y': ('y', 'yp'), 'z': ('dt', 'dW')}
+
+# Bins of the cumulative histogram used for weighted quantiles
+QUANTILE_BINS = 4096
+
+def fractional_emittance(u, up, fractions=(0.9,), weights=None) -> np.ndarray:
+    """
+    Emittances enclosing given fractions of a phase-space distribution.
+
+    Each point gets its squared Mahalanobis distance d² from the RMS
+    ellipse; the ellipse holding a fraction f has area ε_rms · d²_f, with
+    d²_f the f-quantile of d². Unweighted quantiles for all fractions come
+    from one np.partition (O(N)); weighted ones from a cumulative
+    histogram of d². Stacked (..., N) arrays of runs or planes are
+    handled in one call when unweighted.
+
+    Args:
+        u (np.ndarray): (..., N) positions.
+        up (np.ndarray): (..., N) angles.
+        fractions (sequence of float, optional): Enclosed fractions in (0, 1]. Defaults to (0.9,).
+        weights (np.ndarray, optional): (N,) non-negative weights, e.g. Allison currents;
+                                        only for a single 1-D distribution.
+
+    Returns:
+        np.ndarray: (..., n_fractions) emittances, NaN where the RMS ellipse is non-physical.
+    """
+    u = np.asarray(u, dtype=np.float64)
+    up = np.asarray(up, dtype=np.float64)
+    fractions = np.atleast_1d(np.asarray(fractions, dtype=np.float64))
+    if np.any(fractions <= 0) or np.any(fractions > 1):
+        raise ValueError("fractions must lie in (0, 1]")
+    if u.shape != up.shape or u.shape[-1] == 0:
+        raise ValueError("u and up must have the same non-empty shape")
+
+    if weights is None:
+        du = u - u.mean(axis=-1, keepdims=True)
+        dup = up - up.mean(axis=-1, keepdims=True)
+        twiss = Twiss.from_moments_batch(np.mean(du * du, axis=-1), np.mean(dup * dup, axis=-1),
+                                         np.mean(du * dup, axis=-1))
+        d2 = compute_mahalanobis_squared(du, dup, {key: value[..., np.newaxis] for key, value in twiss.items()})
+        thresholds = partition_quantiles(d2, fractions)
+    else:
+        if u.ndim != 1:
+            raise ValueError("Weighted fractional emittances take one 1-D distribution")
+        weights = np.clip(np.asarray(weights, dtype=np.float64), 0, None)
+        moments = Moments().update(np.column_stack([u, up]), weights)
+        center, sigma = moments.mean(), moments.covariance()
+        twiss = Twiss.from_moments_batch(sigma[0, 0], sigma[1, 1], sigma[0, 1])
+        d2 = compute_mahalanobis_squared(u - center[0], up - center[1], twiss)
+        thresholds = histogram_quantiles(d2, fractions, weights)
+    return twiss['emittance'][..., np.newaxis] * thresholds
+
+def partition_quantiles(values: np.ndarray, fractions) -> np.ndarray:
+    """
+    Lower quantiles along the last axis by partial selection: the smallest
+    value with at least a fraction f of the entries at or below it, for all
+    fractions from one np.partition.
+
+    Returns:
+        np.ndarray: (..., n_fractions)
+    """
+    n = values.shape[-1]
+    kth = np.clip(np.ceil(np.asarray(fractions) * n).astype(np.int64) - 1, 0, n - 1)
+    # NaN distances (non-physical ellipses) sort last; keep them out of the selection
+    values = np.where(np.isnan(values), np.inf, values)
+    selected = np.partition(values, np.unique(kth), axis=-1)[..., kth]
+    return np.where(np.isinf(selected), np.nan, selected)
+
+def histogram_quantiles(values: np.ndarray, fractions, weights: np.ndarray, bins: int = QUANTILE_BINS) -> np.ndarray:
+    """
+    Weighted quantiles of 1-D values from a cumulative histogram, linearly
+    interpolated inside the bin; O(N) for any number of fractions.
+    """
+    fractions = np.asarray(fractions, dtype=np.float64)
+    valid = np.isfinite(values)
+    if not valid.any() or weights[valid].sum() <= 0:
+        return np.full(len(fractions), np.nan)
+    values, weights = values[valid], weights[valid]
+    hist, edges = np.histogram(values, bins=bins, range=(0.0, values.max()), weights=weights)
+    cumulative = np.concatenate([[0.0], np.cumsum(hist)]) / hist.sum()
+    return np.interp(fractions, cumulative, edges)
+
+def beam_fractional_emittances(beam, fractions=(0.9, 0.95, 0.99), planes=('x', 'y', 'z')) -> pd.DataFrame:
+    """
+    Fractional emittances of the planes of a Beam.
+
+    Args:
+        beam (Beam): Beam (or BeamSelection).
+        fractions (sequence of float, optional): Enclosed fractions. Defaults to (0.9, 0.95, 0.99).
+        planes (sequence of str, optional): Any of 'x', 'y', 'z'. Defaults to all three.
+
+    Returns:
+        pd.DataFrame: One row per fraction, one column per plane.
+    """
+    result = {}
+    for plane in planes:
+        u, up = EMITTANCE_PLANES[plane]
+        result[plane] = fractional_emittance(beam.column(u), beam.column(up), fractions)
+    return pd.DataFrame(result, index=pd.Index(np.atleast_1d(fractions), name='fraction'))
+
+def ensemble_fractional_emittances(ensemble, fractions=(0.9, 0.95, 0.99), plane: str = 'x',
+                                   runs_per_block: int = None) -> np.ndarray:
+    """
+    Fractional emittances of one plane of every run of a BeamEnsemble.
+
+    Args:
+        ensemble (BeamEnsemble): Runs with equal particle counts.
+        fractions (sequence of float, optional): Enclosed fractions. Defaults to (0.9, 0.95, 0.99).
+        plane (str, optional): 'x', 'y' or 'z'. Defaults to 'x'.
+        runs_per_block (int, optional): Runs processed together. Defaults to about 2^20 particles per block.
+
+    Returns:
+        np.ndarray: (n_runs, n_fractions) emittances.
+    """
+    u, up = (ensemble.columns.index(col) for col in EMITTANCE_PLANES[plane])
+    step = runs_per_block or max(1, (1 << 20) // max(ensemble.macroparticles, 1))
+    blocks = [fractional_emittance(ensemble.data[start:start + step, :, u],
+                                   ensemble.data[start:start + step, :, up], fractions)
+              for start in range(0, ensemble.runs, step)]
+    return np.concatenate(blocks)
+
+def allison_fractional_emittance(beamas, fractions=(0.9, 0.95, 0.99)) -> pd.Series:
+    """
+    Fractional emittances of Allison scanner data, weighted by the measured current.
+
+    Args:
+        beamas (BeamAS): object with x, xp, x_current arrays
+
+    Returns:
+        pd.Series: Emittance [mm·mrad] per fraction.
+    """
+    emittances = fractional_emittance(beamas.x, beamas.xp, fractions, weights=beamas.x_current)
+    return pd.Series(emittances, index=pd.Index(np.atleast_1d(fractions), name='fraction'))
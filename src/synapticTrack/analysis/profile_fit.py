@@ -0,0 +1,189 @@
+import numpy as np
+import pandas as pd
+
+GAUSSIAN_PARAMETERS = ['amplitude', 'center', 'sigma', 'offset']
+
+def pad_profiles(positions, currents):
+    """
+    Packs ragged profiles into NaN-padded arrays.
+
+    Args:
+        positions (sequence of array-like): Positions of each profile.
+        currents (sequence of array-like): Currents of each profile, same lengths.
+
+    Returns:
+        tuple: (x, y, mask), each (n_profiles, max_points); mask is True on measured points.
+    """
+    lengths = [len(p) for p in positions]
+    if lengths != [len(c) for c in currents]:
+        raise ValueError("Each profile needs as many currents as positions")
+    x = np.full((len(lengths), max(lengths, default=0)), np.nan)
+    y = np.full_like(x, np.nan)
+    for i, (p, c) in enumerate(zip(positions, currents)):
+        x[i, :len(p)] = p
+        y[i, :len(c)] = c
+    return x, y, ~np.isnan(x) & ~np.isnan(y)
+
+def gaussian_initial_guess(x, y, mask=None, method: str = 'log_parabola') -> np.ndarray:
+    """
+    Closed-form starting values of utils.gaussian for many profiles at once.
+
+    'moments' takes the current-weighted centre and RMS width, the peak
+    current and a zero offset, as analyze_wire_scanner does. 'log_parabola'
+    subtracts the smallest current as offset and fits a parabola to the log
+    of the points above 20% of the peak by weighted linear least squares,
+    which gives centre, width and amplitude directly; profiles where that
+    fails keep the moment estimate.
+
+    Args:
+        x (np.ndarray): (n_profiles, n_points) positions.
+        y (np.ndarray): (n_profiles, n_points) currents.
+        mask (np.ndarray, optional): Measured points. Defaults to the finite entries.
+        method (str, optional): 'moments' or 'log_parabola'. Defaults to 'log_parabola'.
+
+    Returns:
+        np.ndarray: (n_profiles, 4) amplitude, center, sigma, offset.
+    """
+    x, y, mask = _as_profiles(x, y, mask)
+    w = np.where(mask, y, 0.0)
+    xs = np.where(mask, x, 0.0)
+    total = w.sum(axis=1)
+    center = (w * xs).sum(axis=1) / total
+    # Noisy, partly negative currents can give a negative variance; those widths are NaN
+    with np.errstate(invalid='ignore'):
+        sigma = np.sqrt((w * (xs - center[:, None])**2).sum(axis=1) / total)
+    peak = np.where(mask, y, -np.inf).max(axis=1)
+    guess = np.column_stack([peak, center, sigma, np.zeros(len(x))])
+    if method == 'moments':
+        return guess
+    if method != 'log_parabola':
+        raise ValueError("method must be 'moments' or 'log_parabola'")
+
+    offset = np.where(mask, y, np.inf).min(axis=1)
+    signal = y - offset[:, None]
+    amplitude = peak - offset
+    use = mask & (signal > 0.2 * amplitude[:, None])
+    # Weighting the log by signal^2 undoes the noise amplification of the log on the tails
+    weight = np.where(use, signal, 0.0)**2
+    logs = np.log(np.where(use, signal, 1.0))
+    u = np.where(use, x, 0.0) - center[:, None]
+    powers = np.stack([np.ones_like(u), u, u**2], axis=-1)
+    normal = np.einsum('np,npi,npj->nij', weight, powers, powers)
+    rhs = np.einsum('np,npi,np->ni', weight, powers, logs)
+    valid = (use.sum(axis=1) >= 3) & (np.abs(np.linalg.det(normal)) > 0)
+    coeffs = np.full((len(x), 3), np.nan)
+    if valid.any():
+        coeffs[valid] = np.linalg.solve(normal[valid], rhs[valid][..., None])[..., 0]
+    c, b, a = coeffs.T
+    valid &= a < 0
+    with np.errstate(invalid='ignore', divide='ignore', over='ignore'):
+        fitted = np.column_stack([np.exp(c - b**2 / (4 * a)), center - b / (2 * a), np.sqrt(-1 / (2 * a)), offset])
+    guess[valid] = fitted[valid]
+    return guess
+
+def fit_gaussians(x, y, mask=None, p0=None, max_iter: int = 100, tol: float = 1e-10,
+                  method: str = 'log_parabola') -> pd.DataFrame:
+    """
+    Fits utils.gaussian (amplitude, center, sigma, offset) to many profiles at once.
+
+    A vectorized Levenberg-Marquardt: every iteration builds the 4x4
+    normal equations of all profiles in one einsum and solves them with
+    one batched np.linalg.solve. Each profile has its own damping and
+    stops when its relative change in squared residual falls below `tol`;
+    finished profiles are left out of later iterations.
+
+    Args:
+        x (np.ndarray): (n_profiles, n_points) positions, NaN-padded (see pad_profiles).
+        y (np.ndarray): (n_profiles, n_points) currents.
+        mask (np.ndarray, optional): Measured points. Defaults to the finite entries.
+        p0 (np.ndarray, optional): (n_profiles, 4) starting values. Defaults to gaussian_initial_guess().
+        max_iter (int, optional): Maximum iterations. Defaults to 100.
+        tol (float, optional): Relative cost change for convergence. Defaults to 1e-10.
+        method (str, optional): Initial-guess method when p0 is None.
+
+    Returns:
+        pd.DataFrame: One row per profile: amplitude, center, sigma, offset, residual
+                      (sum of squares), iterations and converged.
+    """
+    x, y, mask = _as_profiles(x, y, mask)
+    params = gaussian_initial_guess(x, y, mask, method) if p0 is None else np.array(p0, dtype=np.float64)
+    n = len(x)
+    xs = np.where(mask, x, 0.0)
+    ys = np.where(mask, y, 0.0)
+    damping = np.full(n, 1e-3)
+    cost = _cost(xs, ys, mask, params)
+    iterations = np.zeros(n, dtype=np.int64)
+    converged = np.zeros(n, dtype=bool)
+    active = np.isfinite(cost) & np.all(np.isfinite(params), axis=1)
+
+    for _ in range(max_iter):
+        idx = np.flatnonzero(active)
+        if len(idx) == 0:
+            break
+        p = params[idx]
+        residual, jacobian = _residual_and_jacobian(xs[idx], ys[idx], mask[idx], p)
+        jtj = np.einsum('npi,npj->nij', jacobian, jacobian)
+        gradient = np.einsum('npi,np->ni', jacobian, residual)
+        diagonal = np.einsum('nii->ni', jtj)
+        system = jtj + (damping[idx, None] * np.maximum(diagonal, 1e-12))[:, :, None] * np.eye(4)
+        try:
+            step = -np.linalg.solve(system, gradient[..., None])[..., 0]
+        except np.linalg.LinAlgError:
+            # A singular profile (e.g. flat current) only costs a per-profile least-squares step
+            step = _solve_each(system, gradient)
+        trial = p + step
+        trial[:, 2] = np.abs(trial[:, 2])
+        trial_cost = _cost(xs[idx], ys[idx], mask[idx], trial)
+
+        better = np.isfinite(trial_cost) & (trial_cost <= cost[idx])
+        change = np.abs(cost[idx] - trial_cost) / np.maximum(cost[idx], np.finfo(float).tiny)
+        params[idx[better]] = trial[better]
+        damping[idx] = np.where(better, damping[idx] / 10, damping[idx] * 10)
+        iterations[idx] += 1
+        done = better & (change < tol)
+        # A step that cannot lower the cost with very large damping has reached the minimum
+        stalled = ~better & (damping[idx] > 1e10)
+        converged[idx[done | stalled]] = True
+        cost[idx[better]] = trial_cost[better]
+        active[idx[done | stalled]] = False
+
+    result = pd.DataFrame(params, columns=GAUSSIAN_PARAMETERS)
+    result['residual'] = cost
+    result['iterations'] = iterations
+    result['converged'] = converged
+    return result
+
+def _as_profiles(x, y, mask):
+    x = np.atleast_2d(np.asarray(x, dtype=np.float64))
+    y = np.atleast_2d(np.asarray(y, dtype=np.float64))
+    if x.shape != y.shape:
+        raise ValueError("x and y must have the same shape")
+    if mask is None:
+        mask = np.isfinite(x) & np.isfinite(y)
+    return x, y, np.atleast_2d(np.asarray(mask, dtype=bool))
+
+def _model(x, params):
+    amplitude, center, sigma, offset = (params[:, i, None] for i in range(4))
+    return amplitude * np.exp(-(x - center)**2 / (2 * sigma**2)) + offset
+
+def _cost(x, y, mask, params):
+    with np.errstate(over='ignore', invalid='ignore', divide='ignore'):
+        return np.sum(np.where(mask, _model(x, params) - y, 0.0)**2, axis=1)
+
+def _residual_and_jacobian(x, y, mask, params):
+    amplitude, center, sigma, _ = (params[:, i, None] for i in range(4))
+    du = x - center
+    shape = np.exp(-du**2 / (2 * sigma**2))
+    residual = np.where(mask, amplitude * shape + params[:, 3, None] - y, 0.0)
+    jacobian = np.stack([shape,
+                         amplitude * shape * du / sigma**2,
+                         amplitude * shape * du**2 / sigma**3,
+                         np.ones_like(shape)], axis=-1)
+    jacobian *= mask[..., None]
+    return residual, jacobian
+
+def _solve_each(system, gradient):
+    steps = np.zeros_like(gradient)
+    for i in range(len(system)):
+        steps[i] = -np.linalg.lstsq(system[i], gradient[i], rcond=None)[0]
+    return steps
@@ -0,0 +1,124 @@
+import os
+import json
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+from synapticTrack.analysis.scanner_analysis import analyze_wire_scanner, analyze_allison_scanner_2d
+
+# Bump when the analysis changes, so persisted results of older versions are recomputed
+SCAN_SERIES_VERSION = 2
+
+# Scanner type -> (analysis function, fitted planes)
+SCAN_ANALYSES = {
+    'wire': (analyze_wire_scanner, ('x', 'y')),
+    'allison': (analyze_allison_scanner_2d, ('x', 'xp'))
+}
+
+class ScanSeriesAnalyzer:
+    """
+    Analyzer for a series of scans of one scanner type, e.g. a steering campaign.
+
+    Each Gaussian fit is warm-started from the fit of the previous scan in
+    the series, falling back to the moment-based guess when that does not
+    converge. Results are memoized by a content hash of the scan data and
+    the analysis parameters, so re-analyzing a series after adding scans
+    only fits the new ones. With `cache_file`, the memo is kept in a JSON
+    file across sessions.
+    """
+
+    def __init__(self, scanner: str = 'wire', warm_start: bool = True, cache_file: str = None):
+        if scanner not in SCAN_ANALYSES:
+            raise KeyError(f"Unknown scanner '{scanner}'")
+        self._scanner = scanner
+        self._warm_start = warm_start
+        self._cache_file = None if cache_file is None else str(cache_file)
+        self._results = {}
+        self._hits = 0
+        self._misses = 0
+        if self._cache_file is not None and os.path.exists(self._cache_file):
+            with open(self._cache_file) as f:
+                self._results = json.load(f)
+
+    @property
+    def scanner(self):
+        return self._scanner
+
+    @property
+    def hits(self):
+        """Gets the number of scans served from the memo."""
+        return self._hits
+
+    @property
+    def misses(self):
+        """Gets the number of scans analyzed."""
+        return self._misses
+
+    def __len__(self):
+        return len(self._results)
+
+    def key(self, scan) -> str:
+        """
+        Content hash of a scan's data and the analysis parameters.
+        """
+        data = scan.data
+        params = {
+            "scanner": self._scanner,
+            "version": SCAN_SERIES_VERSION,
+            "warm_start": self._warm_start,
+            "columns": list(map(str, data.columns))
+        }
+        h = hashlib.blake2b(digest_size=16)
+        h.update(json.dumps(params, sort_keys=True).encode())
+        h.update(np.ascontiguousarray(data.to_numpy(dtype=np.float64)).tobytes())
+        return h.hexdigest()
+
+    def analyze(self, scans) -> pd.DataFrame:
+        """
+        Analyzes scans in series order.
+
+        Args:
+            scans (iterable of BeamWS or BeamAS): Scans, in acquisition order.
+
+        Returns:
+            pd.DataFrame: One row of analysis results per scan, indexed by scan_id.
+        """
+        analysis, planes = SCAN_ANALYSES[self._scanner]
+        rows, scan_ids = [], []
+        previous = None
+        for scan in scans:
+            key = self.key(scan)
+            result = self._results.get(key)
+            if result is None:
+                p0 = None
+                if self._warm_start and previous is not None:
+                    p0 = {plane: previous[f"gaussian_fit_params_{plane}"] for plane in planes}
+                result = _to_serializable(analysis(scan, plot=False, p0=p0))
+                self._results[key] = result
+                self._misses += 1
+            else:
+                self._hits += 1
+            rows.append(result)
+            scan_ids.append(scan.scan_id)
+            previous = result
+
+        if self._cache_file is not None:
+            self.save()
+        return pd.DataFrame(rows, index=pd.Index(scan_ids, name='scan_id'))
+
+    def save(self, filename: str = None):
+        """Writes the memo to `filename`, by default the analyzer's cache file."""
+        filename = filename or self._cache_file
+        if filename is None:
+            raise ValueError("No cache file given")
+        with open(filename, 'w') as f:
+            json.dump(self._results, f)
+
+    def clear(self):
+        """Drops all memoized results."""
+        self._results.clear()
+
+def _to_serializable(result: dict) -> dict:
+    return {key: [float(v) for v in value] if isinstance(value, (list, tuple, np.ndarray)) else float(value)
+            for key, value in result.items()}
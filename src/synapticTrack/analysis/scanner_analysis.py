@@ -4,16 +4,16 @@ import pandas as pd
 
 from scipy.optimize import curve_fit
 
-from synapticTrack.utils import gaussian
+from synapticTrack.utils import gaussian, Moments
+from synapticTrack.analysis.profile_fit import fit_gaussians, pad_profiles
 from synapticTrack.visualizations import wire_scanner_plot, allison_scanner_plot
 
 def _weighted_rms_and_center(values, weights):
     """Return center and RMS."""
-    average = np.sum(values * weights) / np.sum(weights)
-    variance = np.sum(weights * (values - average)**2) / np.sum(weights)
-    return average, np.sqrt(variance)
+    moments = Moments().update(values, weights)
+    return moments.mean()[0], np.sqrt(moments.variance()[0])
 
-def analyze_wire_scanner(beamws, plot=True, filename=None) -> dict:
+def analyze_wire_scanner(beamws, plot=True, filename=None, p0=None) -> dict:
     """
     Analyze Wire scanner data
     Computes beam profile Gaussian fit 
@@ -22,9 +22,12 @@ def analyze_wire_scanner(beamws, plot=True, filename=None) -> dict:
     Args:
         beamas (BeamWS): object with x_position, x_current, y_position, y_current array
         plot (bool): whether to show phase space plot
+        p0 (dict, optional): starting values {'x': [a, x0, sigma, offset], 'y': [...]}
+                             of the Gaussian fits, e.g. the fit of the previous scan;
+                             defaults to moment-based guesses
 
     Returns:
-        dict with results
+        dict with results; gaussian_fit_params_x/_y hold the full fit parameters
     """
 
     x = beamws.x_position
@@ -37,10 +40,9 @@ def analyze_wire_scanner(beamws, plot=True, filename=None) -> dict:
     y_center, sigma_y = _weighted_rms_and_center(y, iy)
 
     # Gaussian fit
-    popt_x, _ = curve_fit(gaussian, x, ix, 
-                          p0=[np.max(ix), x_center, sigma_x, 0])
-    popt_y, _ = curve_fit(gaussian, y, iy, 
-                          p0=[np.max(ix), y_center, sigma_y, 0])
+    p0 = p0 or {}
+    popt_x = _fit_gaussian(x, ix, p0.get('x'), [np.max(ix), x_center, sigma_x, 0])
+    popt_y = _fit_gaussian(y, iy, p0.get('y'), [np.max(ix), y_center, sigma_y, 0])
 
     x_center_fit = popt_x[1]
     y_center_fit = popt_y[1]
@@ -58,12 +60,91 @@ def analyze_wire_scanner(beamws, plot=True, filename=None) -> dict:
         "gaussian_fit_x_center": x_center_fit,
         "gaussian_fit_y_center": y_center_fit,
         "gaussian_fit_sigma_x": sigma_x_fit,
-        "gaussian_fit_sigma_y": sigma_y_fit
+        "gaussian_fit_sigma_y": sigma_y_fit,
+        "gaussian_fit_params_x": list(popt_x),
+        "gaussian_fit_params_y": list(popt_y)
     }
 
     return results
 
-def analyze_allison_scanner_2d(beamas, plot=True, bins=150, density=True, projection=True, filename=None) -> dict:
+def _fit_gaussian(x, current, p0, fallback):
+    """
+    Gaussian fit from p0, e.g. the fit of the previous scan, falling back to the cold fit
+    from the moment-based guess.
+
+    p0 is only used when it is finite with a positive sigma; curve_fit returns
+    non-finite starting values unchanged instead of raising. A warm fit that is
+    not finite, or whose cost is above that of the cold starting guess, is
+    refitted cold and the better of the two fits is kept.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    current = np.asarray(current, dtype=np.float64)
+    warm = None
+    if p0 is not None and np.all(np.isfinite(p0)) and p0[2] > 0:
+        try:
+            warm = curve_fit(gaussian, x, current, p0=p0)[0]
+        except RuntimeError:
+            pass
+        if warm is not None and np.all(np.isfinite(warm)) and \
+                _fit_cost(x, current, warm) <= _fit_cost(x, current, fallback):
+            return warm
+    cold = curve_fit(gaussian, x, current, p0=fallback)[0]
+    if warm is not None and np.all(np.isfinite(warm)) and _fit_cost(x, current, warm) < _fit_cost(x, current, cold):
+        return warm
+    return cold
+
+def _fit_cost(x, current, params):
+    """Sum of squared residuals of a Gaussian fit; inf when not finite."""
+    with np.errstate(all='ignore'):
+        cost = np.sum((gaussian(x, *params) - current)**2)
+    return cost if np.isfinite(cost) else np.inf
+
+def analyze_wire_scanners(scans, method: str = 'log_parabola') -> pd.DataFrame:
+    """
+    Analyze many wire scans at once.
+
+    Computes the same quantities as analyze_wire_scanner for every scan,
+    with all x and y profiles fitted together by the batched Gaussian
+    fitter (analysis.profile_fit.fit_gaussians).
+
+    Args:
+        scans (list of BeamWS): Wire scans, of any lengths.
+        method (str): Initial-guess method of the fit, 'log_parabola' or 'moments'.
+
+    Returns:
+        pd.DataFrame: One row per scan (indexed by scan_id) with the keys of
+                      analyze_wire_scanner plus per-plane convergence flags.
+    """
+    scans = list(scans)
+    positions, currents = [], []
+    for beamws in scans:
+        positions += [beamws.x_position.to_numpy(), beamws.y_position.to_numpy()]
+        currents += [beamws.x_current.to_numpy(), beamws.y_current.to_numpy()]
+    x, y, mask = pad_profiles(positions, currents)
+    fits = fit_gaussians(x, y, mask, method=method)
+    fit_x, fit_y = fits.iloc[0::2].reset_index(drop=True), fits.iloc[1::2].reset_index(drop=True)
+
+    rows = []
+    for i, (pos_x, cur_x, pos_y, cur_y) in enumerate(zip(positions[0::2], currents[0::2],
+                                                          positions[1::2], currents[1::2])):
+        x_center, sigma_x = _weighted_rms_and_center(pos_x, cur_x)
+        y_center, sigma_y = _weighted_rms_and_center(pos_y, cur_y)
+        rows.append({
+            "x_center": x_center,
+            "y_center": y_center,
+            "sigma_x": sigma_x,
+            "sigma_y": sigma_y,
+            "gaussian_fit_x_center": fit_x['center'][i],
+            "gaussian_fit_y_center": fit_y['center'][i],
+            "gaussian_fit_sigma_x": fit_x['sigma'][i],
+            "gaussian_fit_sigma_y": fit_y['sigma'][i],
+            "converged_x": bool(fit_x['converged'][i]),
+            "converged_y": bool(fit_y['converged'][i])
+        })
+    return pd.DataFrame(rows, index=pd.Index([beamws.scan_id for beamws in scans], name='scan_id'))
+
+def analyze_allison_scanner_2d(beamas, plot=True, bins=150, density=True, projection=True, filename=None,
+                               p0=None) -> dict:
     """
     Analyze 2D Allison scanner data (phase space distribution).
     Computes beam center, beam size, divergence, and emittance.
@@ -74,22 +155,22 @@ def analyze_allison_scanner_2d(beamas, plot=True, bins=150, density=True, projec
         plot (bool): whether to show phase space plot
         bins (int): number of bins for histogram
         density (bool): if True, plot density map, else scatter plot
+        p0 (dict, optional): starting values {'x': [a, x0, sigma, offset], 'xp': [...]}
+                             of the Gaussian fits; defaults to moment-based guesses
 
     Returns:
-        dict with results
+        dict with results; gaussian_fit_params_x/_xp hold the full fit parameters
     """
     x = beamas.x
     xp = beamas.xp
     x_current = beamas.x_current
 
-    # Compute beam center and RMS
-    x_center, sigma_x = _weighted_rms_and_center(x, x_current)
-    xp_center, sigma_xp = _weighted_rms_and_center(xp, x_current)
-
-    # Compute weighted covariance between x and xp
-    x_centered = x - x_center
-    xp_centered = xp - xp_center
-    covariance_x_xp = np.sum(x_current * x_centered * xp_centered) / np.sum(x_current)
+    # Beam center, RMS and x-xp covariance, weighted by current, in one pass
+    moments = Moments().update(np.column_stack([x, xp]), x_current)
+    x_center, xp_center = moments.mean()
+    sigma = moments.covariance()
+    sigma_x, sigma_xp = np.sqrt(sigma[0, 0]), np.sqrt(sigma[1, 1])
+    covariance_x_xp = sigma[0, 1]
 
     emittance_rms = np.sqrt(sigma_x**2 * sigma_xp**2 - covariance_x_xp**2)
 
@@ -97,10 +178,9 @@ def analyze_allison_scanner_2d(beamas, plot=True, bins=150, density=True, projec
     emittance_geometric = sigma_x * sigma_xp  # [mm·mrad]
 
     # Gaussian fit
-    popt_x, _ = curve_fit(gaussian, x, x_current,
-                          p0=[np.max(x_current), x_center, sigma_x, 0])
-    popt_xp, _ = curve_fit(gaussian, xp, x_current,
-                          p0=[np.max(x_current), xp_center, sigma_xp, 0])
+    p0 = p0 or {}
+    popt_x = _fit_gaussian(x, x_current, p0.get('x'), [np.max(x_current), x_center, sigma_x, 0])
+    popt_xp = _fit_gaussian(xp, x_current, p0.get('xp'), [np.max(x_current), xp_center, sigma_xp, 0])
 
     x_center_fit = popt_x[1]
     xp_center_fit = popt_xp[1]
@@ -122,6 +202,8 @@ def analyze_allison_scanner_2d(beamas, plot=True, bins=150, density=True, projec
         "gaussian_fit_sigma_xp": sigma_xp_fit,
         "covariance_x_xp": covariance_x_xp,
         "emittance_rms": emittance_rms,
-        "emittance_geometric": emittance_geometric
+        "emittance_geometric": emittance_geometric,
+        "gaussian_fit_params_x": list(popt_x),
+        "gaussian_fit_params_xp": list(popt_xp)
     }
 
@@ -1,3 +1,6 @@
-from .beam import Beam
+from .beam import Beam, BeamSelection
 from .beam_scanner import BeamWS, BeamAS
 from .twiss import Twiss
+from .beam_statistics import BeamStatistics
+from .multi_species_beam import MultiSpeciesBeam
+from .beam_ensemble import BeamEnsemble
@@ -1,6 +1,15 @@
+import numpy as np
 import pandas as pd
+from contextlib import contextmanager
+from functools import lru_cache
 from periodictable import elements
 
+from synapticTrack.beam.beam_statistics import BeamStatistics
+from synapticTrack.beam.twiss import Twiss
+from synapticTrack.utils.math_functions import compute_mahalanobis_squared
+from synapticTrack.utils.parallel import REDUCTION_CHUNK_SIZE, map_chunks
+
+@lru_cache(maxsize=None)
 def get_ion_species_name(mass_number, charge_state):
     """
         Determines the ion species name.
@@ -31,24 +40,88 @@ def get_ion_species_name(mass_number, charge_state):
     symbol = best_match.symbol
     return f"{symbol}{charge_state}+"
 
+BEAM_COLUMNS = ['x', 'xp', 'y', 'yp', 'dt', 'dW']
+MOMENT_BLOCK_SIZE = REDUCTION_CHUNK_SIZE  # particles per block when accumulating moments
+PARTICLE_DTYPES = (np.float64, np.float32)
+TWISS_PLANE_COLUMNS = {'x': ('x', 'xp'), 'y': ('y', 'yp'), 'z': ('dt', 'dW')}
+
+def as_particle_array(state, columns=None, order: str = None, dtype=np.float64):
+    """
+    Validates particle coordinates and returns them as a contiguous floating-point array.
+
+    Arrays that already have the requested layout are used as they are;
+    DataFrames are copied.
+
+    Args:
+        state (np.ndarray or pd.DataFrame): (N, k) particle coordinates.
+        columns (list of str, optional): Column names of an array state.
+                                         Defaults to ['x', 'xp', 'y', 'yp', 'dt', 'dW'].
+        order (str, optional): 'C' or 'F'. Defaults to the layout of an array state, or 'C'.
+        dtype (optional): np.float64, or np.float32 for half the memory. Defaults to np.float64.
+
+    Returns:
+        tuple: (np.ndarray, list of column names)
+    """
+    if order not in (None, 'C', 'F'):
+        raise ValueError("order must be 'C' or 'F'")
+    if np.dtype(dtype) not in PARTICLE_DTYPES:
+        raise ValueError("dtype must be float64 or float32")
+    if isinstance(state, pd.DataFrame):
+        if state.empty:
+            raise ValueError("state DataFrame cannot be empty")
+        columns = [str(col) for col in state.columns]
+        data = np.array(state.to_numpy(dtype=dtype), order=order or 'C')
+    elif isinstance(state, np.ndarray):
+        if state.ndim != 2 or state.shape[0] == 0:
+            raise ValueError("state array must be a non-empty (N, k) array")
+        if order is None:
+            order = 'F' if state.flags.f_contiguous and not state.flags.c_contiguous else 'C'
+        data = np.require(state, dtype=dtype, requirements=[order, 'W'])
+        columns = list(columns) if columns is not None else list(BEAM_COLUMNS[:state.shape[1]])
+        if len(columns) != data.shape[1]:
+            raise ValueError(f"Got {len(columns)} column names for {data.shape[1]} columns")
+    else:
+        raise TypeError("state must be a NumPy array or a pandas DataFrame")
+    return data, columns
+
 class Beam:
-    def __init__(self, state: pd.DataFrame, mass_number: int, charge_state: int, beam_current: float, reference_energy: float):
+    def __init__(self, state, mass_number: int, charge_state: int, beam_current: float, reference_energy: float,
+                 columns=None, order: str = None, dtype=np.float64, ids=None):
         """
         Initializes a Beam object.
 
+        The phase space is held in one contiguous (N, k) array;
+        column properties are read-only views into it and `state` is a
+        DataFrame built on demand over the same memory. Moments are cached,
+        see statistics(); the particles are changed through set_column(),
+        edit() or apply_map(), which keep the cache consistent.
+
         Args:
-            state (pd.DataFrame): DataFrame representing the beam state.
+            state (np.ndarray or pd.DataFrame): (N, k) particle coordinates, or a DataFrame
+                                                (copied into a new array).
             mass_number (int): Mass number of the ion species.
             charge_state (int): Charge state of the ion.
             beam_current (float): Beam current in uA.
             reference_energy (float): Reference beam energy in MeV/u.
+            columns (list of str, optional): Column names of an array state.
+                                             Defaults to ['x', 'xp', 'y', 'yp', 'dt', 'dW'].
+            order (str, optional): 'C' (particle-major) or 'F' (column-major) memory layout.
+                                   Defaults to the layout of an array state, or 'C'.
+            dtype (optional): Storage type, np.float64 or np.float32. float32 halves the memory;
+                              moments are still accumulated in float64. Defaults to np.float64.
+            ids (np.ndarray, optional): Particle IDs, e.g. TRACK particle numbers. Defaults to
+                                        the particle index.
         """
-        if not isinstance(state, pd.DataFrame):
-            raise TypeError("state must be a pandas DataFrame")
-        if state.empty:
-            raise ValueError("state DataFrame cannot be empty")
-
-        self._state = state
+        data, columns = as_particle_array(state, columns, order, dtype)
+        self._data = data
+        self._columns = columns
+        self._index = {col: i for i, col in enumerate(columns)}
+        self._state = None
+        self._statistics = None
+        self._version = 0
+        self._ids = None if ids is None else np.asarray(ids)
+        if self._ids is not None and self._ids.shape != (data.shape[0],):
+            raise ValueError(f"ids must have shape ({data.shape[0]},)")
         self._mass_number = mass_number
         self._charge_state = charge_state
         self._beam_current = beam_current
@@ -57,43 +130,108 @@ class Beam:
 
     @property
     def state(self):
-        """Gets the beam state DataFrame."""
+        """Gets the beam state as a read-only DataFrame sharing memory with the particle array."""
+        if self._state is None:
+            self._state = pd.DataFrame(self.data, columns=self._columns, copy=False)
         return self._state
 
+    @property
+    def data(self):
+        """Gets a read-only view of the (N, k) particle array."""
+        return _read_only(self._data)
+
+    @property
+    def columns(self):
+        """Gets the column names of the particle array."""
+        return list(self._columns)
+
+    @property
+    def dtype(self):
+        """Gets the storage type of the particle array."""
+        return self._data.dtype
+
+    def astype(self, dtype) -> "Beam":
+        """
+        Returns a copy of the beam stored as `dtype` (np.float64 or np.float32).
+        """
+        order = 'F' if self._data.flags.f_contiguous and not self._data.flags.c_contiguous else 'C'
+        return Beam(self._data.astype(dtype, order=order), self._mass_number, self._charge_state,
+                    self._beam_current, self._reference_energy, columns=self._columns, dtype=dtype,
+                    ids=self._ids)
+
+    def column(self, name: str) -> np.ndarray:
+        """Gets one column as a read-only view into the particle array."""
+        try:
+            return _read_only(self._data[:, self._index[name]])
+        except KeyError:
+            raise KeyError(f"Column '{name}' not in beam state") from None
+
+    def to_numpy(self, columns=None) -> np.ndarray:
+        """
+        Gets the particle array (read-only), or a copy with the given columns in the given order.
+        """
+        if columns is None or list(columns) == self._columns:
+            return self.data
+        return self._data[:, self._indices(columns)]
+
+    def set_column(self, name: str, values):
+        """
+        Overwrites one column, e.g. set_column('x', beam.x + 1.0), and drops the cached moments.
+        """
+        if name not in self._index:
+            raise KeyError(f"Column '{name}' not in beam state")
+        with self.edit() as data:
+            data[:, self._index[name]] = values
+
+    @contextmanager
+    def edit(self):
+        """
+        Gives writable access to the (N, k) particle array; the cached moments are
+        dropped when the block exits.
+
+        Example:
+            with beam.edit() as data:
+                data[:, 0] += 1.0
+        """
+        try:
+            yield self._data
+        finally:
+            self.invalidate()
+
     @property
     def x(self):
         """Gets the x-coordinates from the beam state."""
-        return self._state['x']
+        return self.column('x')
 
     @property
     def xp(self):
         """Gets the x' (x prime) coordinates."""
-        return self._state['xp']
+        return self.column('xp')
 
     @property
     def y(self):
         """Gets the y-coordinates."""
-        return self._state['y']
+        return self.column('y')
 
     @property
     def yp(self):
         """Gets the y' (y prime) coordinates."""
-        return self._state['yp']
+        return self.column('yp')
 
     @property
     def dt(self):
         """Gets the time deviation."""
-        return self._state['dt']
+        return self.column('dt')
 
     @property
     def dW(self):
         """Gets the energy deviation."""
-        return self._state['dW']
+        return self.column('dW')
 
     @property
     def macroparticles(self):
         """Gets the number of macroparticles."""
-        return self._state.shape[0]
+        return self._data.shape[0]
 
     @property
     def species(self):
@@ -128,11 +266,8 @@ class Beam:
         Returns:
             pd.Series: Centroid values with keys ['x', 'xp', 'y', 'yp', 'dt', 'dW']
         """
-        expected_columns = ['x', 'xp', 'y', 'yp', 'dt', 'dW']
-        missing = [col for col in expected_columns if col not in self._state.columns]
-        if missing:
-            raise ValueError(f"Missing expected columns in beam state: {missing}")
-        return self._state[expected_columns].mean()
+        index = self._indices(BEAM_COLUMNS)
+        return pd.Series(self.statistics().mean()[index], index=BEAM_COLUMNS)
 
     @property
     def rms_size(self):
@@ -142,9 +277,353 @@ class Beam:
         Returns:
             pd.Series: RMS size for ['x', 'xp', 'y', 'yp', 'dt', 'dW']
         """
-        expected_columns = ['x', 'xp', 'y', 'yp', 'dt', 'dW']
-        missing = [col for col in expected_columns if col not in self._state.columns]
+        index = self._indices(BEAM_COLUMNS)
+        variance = np.diag(self.statistics().covariance(ddof=1))[index]
+        return pd.Series(np.sqrt(variance), index=BEAM_COLUMNS)
+
+    def statistics(self, workers: int = None) -> BeamStatistics:
+        """
+        Gets the moment accumulator of all columns.
+
+        The first moments and the full covariance matrix are computed in one
+        blocked pass on first use and cached, in float64 whatever the storage
+        type; centroid, rms_size and Twiss are derived from them. Blocks are
+        reduced in a thread pool and merged in order. set_column(), edit()
+        and apply_map() keep the cache consistent.
+
+        Args:
+            workers (int, optional): Threads for the first pass. Defaults to
+                                     utils.parallel.get_num_threads().
+        """
+        if self._statistics is None:
+            stats = BeamStatistics(self._columns)
+            partials = map_chunks(lambda start, stop: BeamStatistics(self._columns).update(self._block(start, stop)),
+                                  self.macroparticles, workers, MOMENT_BLOCK_SIZE)
+            for partial in partials:
+                stats.merge(partial)
+            self._statistics = stats
+        return self._statistics
+
+    def _block(self, start: int, stop: int) -> np.ndarray:
+        return self._data[start:stop]
+
+    def mean(self) -> np.ndarray:
+        """Gets the cached first-moment vector, in the order of `columns`."""
+        return self.statistics().mean()
+
+    def covariance(self, ddof: int = 0) -> np.ndarray:
+        """Gets the cached covariance matrix, in the order of `columns`."""
+        return self.statistics().covariance(ddof=ddof)
+
+    def invalidate(self):
+        """
+        Drops the cached moments. Selections of this beam see the change on their next use.
+        """
+        self._statistics = None
+        self._version += 1
+
+    @property
+    def ids(self) -> np.ndarray:
+        """Gets the particle IDs (the particle index unless given at construction)."""
+        if self._ids is None:
+            return np.arange(self.macroparticles)
+        return self._ids
+
+    def select(self, selection) -> "BeamSelection":
+        """
+        Selects particles without copying the particle array.
+
+        Args:
+            selection (np.ndarray): Boolean mask over the particles, or particle indices.
+
+        Returns:
+            BeamSelection: View on the selected particles with its own cached moments.
+        """
+        selection = np.asarray(selection)
+        if selection.dtype == bool:
+            if selection.shape != (self.macroparticles,):
+                raise ValueError(f"Mask must have shape ({self.macroparticles},)")
+            indices = np.flatnonzero(selection)
+        else:
+            indices = selection.astype(np.int64, copy=False)
+        return BeamSelection(self, indices)
+
+    def where(self, aperture: float = None, core: tuple = None, halo: tuple = None,
+              exclude_ids=None, **cuts) -> "BeamSelection":
+        """
+        Selects particles by cuts, as a view (see select()). All given cuts must hold.
+
+        Args:
+            aperture (float, optional): Keep particles with x^2 + y^2 < aperture^2 [mm].
+            core (tuple, optional): (plane, d2) keeps particles whose squared Mahalanobis
+                                    distance in the 'x', 'y' or 'z' plane is <= d2.
+            halo (tuple, optional): (plane, d2) keeps particles with distance > d2.
+            exclude_ids (array-like, optional): Particle IDs to drop, e.g. lost particles.
+            **cuts: Per-column ranges (low, high) keeping low <= value < high; either
+                    bound may be None. For example where(dW=(None, 0.01)).
+
+        Returns:
+            BeamSelection: View on the particles passing all cuts.
+        """
+        mask = np.ones(self.macroparticles, dtype=bool)
+        for name, (low, high) in cuts.items():
+            values = self.column(name)
+            if low is not None:
+                mask &= values >= low
+            if high is not None:
+                mask &= values < high
+        if aperture is not None:
+            mask &= self.x**2 + self.y**2 < aperture**2
+        if core is not None:
+            mask &= self._mahalanobis_squared(core[0]) <= core[1]
+        if halo is not None:
+            mask &= self._mahalanobis_squared(halo[0]) > halo[1]
+        if exclude_ids is not None:
+            mask &= ~np.isin(self.ids, exclude_ids)
+        return self.select(mask)
+
+    def apply_map(self, matrix: np.ndarray, offset: np.ndarray = None, scale=None, out: np.ndarray = None) -> "Beam":
+        """
+        Applies a linear transfer map v -> R v + offset to every particle.
+
+        The particles are multiplied block by block with one matmul each, in
+        place unless `out` is given. Cached moments are mapped analytically
+        (Σ' = R Σ Rᵀ) instead of being recomputed from the particles.
+
+        Args:
+            matrix (np.ndarray): (k, k) transfer matrix in the order of `columns`, or an
+                                 (m, k, k) stack of element maps applied first to last.
+            offset (np.ndarray, optional): (k,) shift added after the map, or (m, k) with a stack.
+            scale (sequence of float, optional): Factors converting each beam column to the
+                                                 units of the map, e.g. 1e-3 for x [mm] -> [m].
+                                                 Defaults to the beam units (mm, mrad, ns, MeV/u).
+            out (np.ndarray, optional): Preallocated (N, k) array of the beam's dtype for the
+                                        mapped particles; the beam itself is left unchanged.
+
+        Returns:
+            Beam: This beam, or a new Beam over `out`.
+        """
+        matrix, offset = _affine_map(matrix, offset, len(self._columns), scale)
+        if out is None:
+            for start in range(0, self.macroparticles, MOMENT_BLOCK_SIZE):
+                rows = self._row_index(slice(start, start + MOMENT_BLOCK_SIZE))
+                self._data[rows] = _map_rows(self._data[rows], matrix, offset)
+            self._after_map(matrix, offset)
+            return self
+
+        if out.shape != (self.macroparticles, len(self._columns)) or out.dtype != self.dtype:
+            raise ValueError(f"out must be a {self.dtype} array of shape {(self.macroparticles, len(self._columns))}")
+        for start in range(0, self.macroparticles, MOMENT_BLOCK_SIZE):
+            rows = slice(start, start + MOMENT_BLOCK_SIZE)
+            out[rows] = _map_rows(self._data[self._row_index(rows)], matrix, offset)
+        beam = Beam(out, self._mass_number, self._charge_state, self._beam_current,
+                    self._reference_energy, columns=self._columns, dtype=self.dtype, ids=self.ids)
+        if self._statistics is not None:
+            beam._statistics = self._statistics.transform(matrix, offset)
+        return beam
+
+    def _row_index(self, rows: slice):
+        return rows
+
+    def _after_map(self, matrix: np.ndarray, offset: np.ndarray):
+        statistics = self._statistics
+        self.invalidate()
+        if statistics is not None:
+            self._statistics = statistics.transform(matrix, offset)
+
+    def _mahalanobis_squared(self, plane: str) -> np.ndarray:
+        if plane not in TWISS_PLANE_COLUMNS:
+            raise ValueError("plane must be 'x', 'y', or 'z'")
+        u, up = TWISS_PLANE_COLUMNS[plane]
+        i, j = self._indices([u, up])
+        mean, sigma = self.mean(), self.covariance()
+        twiss_param = Twiss.from_moments(sigma[i, i], sigma[j, j], sigma[i, j])
+        return compute_mahalanobis_squared(self.column(u) - mean[i], self.column(up) - mean[j], twiss_param)
+
+    def _indices(self, columns) -> list:
+        missing = [col for col in columns if col not in self._index]
         if missing:
             raise ValueError(f"Missing expected columns in beam state: {missing}")
-        return self._state[expected_columns].std()
+        return [self._index[col] for col in columns]
+
+
+class BeamSelection(Beam):
+    def __init__(self, parent: Beam, indices: np.ndarray):
+        """
+        Particle subset of a Beam, sharing the parent's particle array.
+
+        Only the particle indices are stored. Moments are accumulated
+        block by block from the parent array and cached per selection, so
+        core/halo or surviving-particle statistics need no copy of the
+        particles. The cache is checked against a version counter of the
+        parent and recomputed after the parent changed. Selections chain:
+        select() and where() on a selection return a selection of the same
+        parent. Column access (x, data, state, ...) gathers the selected
+        particles into a new read-only array; set_column(), edit() and
+        apply_map() write through to the parent.
+
+        Args:
+            parent (Beam): Beam the particles are selected from.
+            indices (np.ndarray): Indices of the selected particles in the parent.
+        """
+        if isinstance(parent, BeamSelection):
+            indices = parent._selected[indices]
+            parent = parent._parent
+        indices = np.asarray(indices, dtype=np.int64)
+        if indices.ndim != 1:
+            raise ValueError("indices must be one-dimensional")
+        if len(indices) and (indices.min() < -parent.macroparticles or indices.max() >= parent.macroparticles):
+            raise IndexError("Particle index out of range")
+        self._parent = parent
+        self._selected = indices
+        self._data = parent._data
+        self._columns = parent._columns
+        self._index = parent._index
+        self._state = None
+        self._statistics = None
+        self._version = 0
+        self._parent_version = parent._version
+        self._ids = None
+        self._mass_number = parent._mass_number
+        self._charge_state = parent._charge_state
+        self._beam_current = parent._beam_current
+        self._species = parent._species
+        self._reference_energy = parent._reference_energy
+
+    @property
+    def parent(self) -> Beam:
+        """Gets the Beam the particles are selected from."""
+        return self._parent
+
+    @property
+    def indices(self) -> np.ndarray:
+        """Gets the indices of the selected particles in the parent."""
+        return self._selected
+
+    @property
+    def macroparticles(self):
+        """Gets the number of selected particles."""
+        return len(self._selected)
+
+    @property
+    def ids(self) -> np.ndarray:
+        """Gets the IDs of the selected particles."""
+        return self._parent.ids[self._selected]
+
+    @property
+    def data(self):
+        """Gets a read-only copy of the selected particles as an (n, k) array."""
+        return _read_only(self._data[self._selected])
+
+    @property
+    def state(self):
+        """Gets a DataFrame of the selected particles (a copy)."""
+        self._check_parent()
+        if self._state is None:
+            self._state = pd.DataFrame(self.data, columns=self._columns, copy=False)
+        return self._state
+
+    def column(self, name: str) -> np.ndarray:
+        """Gets one column of the selected particles (a read-only copy)."""
+        try:
+            return _read_only(self._data[self._selected, self._index[name]])
+        except KeyError:
+            raise KeyError(f"Column '{name}' not in beam state") from None
+
+    def to_numpy(self, columns=None) -> np.ndarray:
+        """Gets the selected particles as a read-only array, optionally with the given columns."""
+        if columns is None or list(columns) == self._columns:
+            return self.data
+        return _read_only(self._data[np.ix_(self._selected, self._indices(columns))])
+
+    def to_beam(self, dtype=None) -> Beam:
+        """Copies the selected particles into a new Beam."""
+        return Beam(self._data[self._selected], self._mass_number, self._charge_state, self._beam_current,
+                    self._reference_energy, columns=self._columns, dtype=dtype or self.dtype,
+                    ids=self.ids)
+
+    @contextmanager
+    def edit(self):
+        """
+        Gives a writable (n, k) copy of the selected particles, written back to the
+        parent when the block exits; the cached moments of both are dropped.
+        """
+        data = self._data[self._selected]
+        try:
+            yield data
+        finally:
+            self._data[self._selected] = data
+            self._parent.invalidate()
+            self.invalidate()
+
+    def statistics(self, workers: int = None) -> BeamStatistics:
+        """
+        Gets the moment accumulator of the selected particles, recomputed when the parent changed.
+        """
+        self._check_parent()
+        return super().statistics(workers)
+
+    def invalidate(self):
+        """Drops the cached moments and state of the selection."""
+        super().invalidate()
+        self._state = None
+        self._parent_version = self._parent._version
+
+    def _check_parent(self):
+        if self._parent_version != self._parent._version:
+            self.invalidate()
+
+    def astype(self, dtype) -> Beam:
+        """Copies the selected particles into a new Beam stored as `dtype`."""
+        return self.to_beam(dtype)
+
+    def _block(self, start: int, stop: int) -> np.ndarray:
+        return self._data[self._selected[start:stop]]
+
+    def _row_index(self, rows: slice):
+        return self._selected[rows]
+
+    def _after_map(self, matrix: np.ndarray, offset: np.ndarray):
+        # The selected rows of the parent were changed in place; a stale cache must not be mapped
+        self._check_parent()
+        self._parent.invalidate()
+        super()._after_map(matrix, offset)
+
+def _read_only(array: np.ndarray) -> np.ndarray:
+    view = array.view()
+    view.flags.writeable = False
+    return view
+
+def _affine_map(matrix, offset, dim: int, scale=None):
+    """Reduces a map or a stack of element maps to one (dim, dim) matrix and (dim,) offset in beam units."""
+    matrix = np.asarray(matrix, dtype=np.float64)
+    if matrix.ndim == 2:
+        matrix = matrix[np.newaxis]
+        offset = None if offset is None else np.asarray(offset, dtype=np.float64)[np.newaxis]
+    if matrix.ndim != 3 or matrix.shape[1:] != (dim, dim):
+        raise ValueError(f"Transfer matrix must have shape ({dim}, {dim}) or (m, {dim}, {dim})")
+    if offset is not None:
+        offset = np.broadcast_to(np.asarray(offset, dtype=np.float64), (len(matrix), dim))
+
+    total, shift = np.eye(dim), np.zeros(dim)
+    for i, element in enumerate(matrix):
+        total = element @ total
+        shift = element @ shift
+        if offset is not None:
+            shift += offset[i]
+
+    if scale is not None:
+        # R acts on scaled coordinates: v' = S^-1 R S v + S^-1 offset
+        scale = np.asarray(scale, dtype=np.float64)
+        if scale.shape != (dim,):
+            raise ValueError(f"scale must have {dim} entries")
+        total = total * scale[np.newaxis, :] / scale[:, np.newaxis]
+        shift = shift / scale
+    return total, (shift if offset is not None else None)
 
+def _map_rows(rows: np.ndarray, matrix: np.ndarray, offset: np.ndarray) -> np.ndarray:
+    # One GEMM per block in the storage precision
+    mapped = rows @ matrix.T.astype(rows.dtype, copy=False)
+    if offset is not None:
+        mapped += offset.astype(rows.dtype, copy=False)
+    return mapped
@@ -0,0 +1,187 @@
+import numpy as np
+
+from synapticTrack.beam.beam import Beam, BEAM_COLUMNS, MOMENT_BLOCK_SIZE, PARTICLE_DTYPES
+from synapticTrack.beam.twiss import Twiss
+
+class BeamEnsemble:
+    def __init__(self, data, mass_number: int, charge_state: int, beam_current: float,
+                 reference_energy: float, columns=None):
+        """
+        Initializes an ensemble of runs of one beam with equal particle counts.
+
+        The particles of all runs are one (n_runs, n_particles, k) array,
+        used as given, so an np.memmap (see NPYIO.read_ensemble) keeps the
+        ensemble on disk. Centroid, RMS size, covariance and Twiss of all
+        runs are computed together as (n_runs, ...) arrays, accumulated in
+        float64 over blocks of runs and cached.
+
+        Args:
+            data (np.ndarray): (n_runs, n_particles, k) float64 or float32 particle array.
+            mass_number (int): Mass number of the ion species.
+            charge_state (int): Charge state of the ion.
+            beam_current (float): Beam current in uA.
+            reference_energy (float): Reference energy in MeV/u.
+            columns (list of str, optional): Column names of the last axis.
+                                             Defaults to ['x', 'xp', 'y', 'yp', 'dt', 'dW'].
+        """
+        if not isinstance(data, np.ndarray):
+            data = np.asarray(data, dtype=np.float64)
+        if data.ndim != 3:
+            raise ValueError("Ensemble data must have shape (n_runs, n_particles, k)")
+        if data.dtype not in PARTICLE_DTYPES:
+            raise ValueError(f"Unsupported particle dtype {data.dtype}; use float64 or float32")
+        columns = list(columns) if columns is not None else list(BEAM_COLUMNS[:data.shape[2]])
+        if len(columns) != data.shape[2]:
+            raise ValueError(f"Got {len(columns)} column names for {data.shape[2]} columns")
+
+        self._data = data
+        self._columns = columns
+        self._mass_number = mass_number
+        self._charge_state = charge_state
+        self._beam_current = beam_current
+        self._reference_energy = reference_energy
+        self._mean = None
+        self._covariance = None
+
+    @classmethod
+    def from_beams(cls, beams, dtype=None) -> "BeamEnsemble":
+        """
+        Stacks Beams with equal particle counts and columns; the beam parameters are taken from the first.
+        """
+        beams = list(beams)
+        if not beams:
+            raise ValueError("No beams given")
+        columns = beams[0].columns
+        counts = {beam.macroparticles for beam in beams}
+        if len(counts) > 1:
+            raise ValueError(f"Cannot stack beams with different particle counts: {sorted(counts)}")
+        data = np.empty((len(beams), counts.pop(), len(columns)), dtype=dtype or beams[0].dtype)
+        for run, beam in zip(data, beams):
+            run[:] = beam.to_numpy(columns)
+        first = beams[0]
+        return cls(data, first.mass_number, first.charge_state, first.beam_current,
+                   first.reference_energy, columns)
+
+    @property
+    def data(self):
+        """Gets the (n_runs, n_particles, k) particle array."""
+        return self._data
+
+    @property
+    def columns(self):
+        return list(self._columns)
+
+    @property
+    def dtype(self):
+        return self._data.dtype
+
+    @property
+    def runs(self):
+        """Gets the number of runs."""
+        return self._data.shape[0]
+
+    @property
+    def macroparticles(self):
+        """Gets the number of macroparticles per run."""
+        return self._data.shape[1]
+
+    @property
+    def mass_number(self):
+        return self._mass_number
+
+    @property
+    def charge_state(self):
+        return self._charge_state
+
+    @property
+    def beam_current(self):
+        return self._beam_current
+
+    @property
+    def reference_energy(self):
+        """Gets the beam reference energy in MeV/u"""
+        return self._reference_energy
+
+    def __len__(self):
+        return self.runs
+
+    def __iter__(self):
+        for run in range(self.runs):
+            yield self.beam(run)
+
+    def beam(self, run: int) -> Beam:
+        """
+        Gets one run as a Beam; its particle array is a view into the ensemble
+        unless the ensemble is a read-only memory map.
+        """
+        return Beam(self._data[run], self._mass_number, self._charge_state, self._beam_current,
+                    self._reference_energy, columns=self._columns, dtype=self.dtype)
+
+    def mean(self) -> np.ndarray:
+        """Gets the first moments of all runs as an (n_runs, k) array."""
+        self._moments()
+        return self._mean.copy()
+
+    def covariance(self, ddof: int = 0) -> np.ndarray:
+        """
+        Gets the covariance matrices of all runs as an (n_runs, k, k) array.
+
+        Args:
+            ddof (int, optional): Delta degrees of freedom. Defaults to 0, as used by Twiss.
+        """
+        if self.macroparticles <= ddof:
+            raise ValueError("Not enough particles per run")
+        self._moments()
+        return self._covariance * (self.macroparticles / (self.macroparticles - ddof))
+
+    def centroid(self) -> np.ndarray:
+        """Centroid of each run, (n_runs, k)."""
+        return self.mean()
+
+    def rms_size(self) -> np.ndarray:
+        """RMS size (sample standard deviation) of each run, (n_runs, k)."""
+        return np.sqrt(np.diagonal(self.covariance(ddof=1), axis1=1, axis2=2))
+
+    def twiss(self) -> dict:
+        """
+        Twiss parameters of the x-x', y-y' and dt-dW planes of all runs.
+
+        Returns:
+            dict: {"twiss_x": {"emittance": (n_runs,), "alpha": ..., "beta": ..., "gamma": ...},
+                   "twiss_y": ..., "twiss_z": ...}; runs with a non-physical plane are NaN there.
+        """
+        return Twiss.from_covariance_batch(self.covariance(), self._columns)
+
+    def normalized_emittances(self) -> dict:
+        """
+        Normalized emittances ε_n = γ_rel β_rel ε of all runs.
+
+        Returns:
+            dict: {'x': (n_runs,), 'y': ..., 'z': ...}
+        """
+        return {name[-1]: Twiss.normalize_emittance(plane["emittance"], self._reference_energy)
+                for name, plane in self.twiss().items()}
+
+    def invalidate(self):
+        """Drops the cached moments after the particle array was modified in place."""
+        self._mean = None
+        self._covariance = None
+
+    def _moments(self):
+        if self._mean is not None:
+            return
+        n_runs, n, k = self._data.shape
+        if n == 0:
+            raise ValueError("Not enough particles per run")
+        mean = np.empty((n_runs, k))
+        covariance = np.empty((n_runs, k, k))
+        # Runs are reduced together, a block of about MOMENT_BLOCK_SIZE particles at a time
+        step = max(1, MOMENT_BLOCK_SIZE // n)
+        for start in range(0, n_runs, step):
+            block = np.asarray(self._data[start:start + step], dtype=np.float64)
+            block_mean = block.mean(axis=1)
+            centered = block - block_mean[:, np.newaxis, :]
+            mean[start:start + step] = block_mean
+            covariance[start:start + step] = np.matmul(centered.transpose(0, 2, 1), centered) / n
+        self._mean = mean
+        self._covariance = covariance
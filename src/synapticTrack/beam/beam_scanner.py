@@ -1,5 +1,9 @@
+import numpy as np
 import pandas as pd
 
+# Decimals to which Allison positions and angles are rounded when detecting the measurement grid
+GRID_DECIMALS = 4
+
 class BeamWS:
     def __init__(self, data, scan_id=None):
         """
@@ -125,6 +129,37 @@ class BeamAS:
         """Returns number of measurement points."""
         return len(self._data)
 
+    def to_grid(self, current: str = 'x_current', decimals: int = GRID_DECIMALS):
+        """
+        Reshapes the scan onto its regular (position, angle) measurement grid.
+
+        Trailing all-zero rows, which the scanner software writes as padding,
+        are dropped. Positions and angles are rounded to `decimals` to find the
+        grid axes; grid points that were not measured are NaN.
+
+        Args:
+            current (str, optional): Current column. Defaults to 'x_current'.
+            decimals (int, optional): Rounding of positions and angles. Defaults to GRID_DECIMALS.
+
+        Returns:
+            tuple: (x (n_x,), xp (n_xp,), current (n_x, n_xp)) in mm, mrad and A.
+        """
+        values = self._data[['x', 'xp', current]].to_numpy(dtype=np.float64)
+        nonzero = np.flatnonzero(np.any(self._data.to_numpy(dtype=np.float64) != 0, axis=1))
+        values = values[:nonzero[-1] + 1] if len(nonzero) else values[:0]
+        if len(values) == 0:
+            raise ValueError("Allison scan has no measured points")
+
+        x_axis, ix = np.unique(np.round(values[:, 0], decimals), return_inverse=True)
+        xp_axis, ixp = np.unique(np.round(values[:, 1], decimals), return_inverse=True)
+        flat = ix * len(xp_axis) + ixp
+        # A scatter of unrelated points gives a sparse "grid"; require every point once and at least half filled
+        if np.bincount(flat).max() > 1 or 2 * len(values) < len(x_axis) * len(xp_axis):
+            raise ValueError("Allison scan is not on a regular (position, angle) grid")
+        grid = np.full(len(x_axis) * len(xp_axis), np.nan)
+        grid[flat] = values[:, 2]
+        return x_axis, xp_axis, grid.reshape(len(x_axis), len(xp_axis))
+
     def describe(self):
         """Returns dictionary summary of scan."""
         return {
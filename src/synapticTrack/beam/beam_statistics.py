@@ -0,0 +1,147 @@
+import numpy as np
+import pandas as pd
+
+from synapticTrack.beam.twiss import Twiss
+from synapticTrack.utils.stats import Moments
+
+BEAM_COLUMNS = ['x', 'xp', 'y', 'yp', 'dt', 'dW']
+
+class BeamStatistics:
+    def __init__(self, columns=None):
+        """
+        One-pass accumulator of beam centroid, RMS size, the full second-moment
+        matrix and Twiss parameters.
+
+        Particle blocks are folded in with update(); partial accumulators
+        (e.g. from other files or processes) are combined with merge(). The
+        moments are kept in a utils.stats.Moments accumulator, which folds
+        each block in with the pairwise (Chan et al.) formula, so memory stays
+        bounded by one block and no large sums of raw squares are formed.
+
+        Args:
+            columns (list of str, optional): Phase-space columns to track.
+                                             Defaults to ['x', 'xp', 'y', 'yp', 'dt', 'dW'].
+        """
+        self._columns = list(columns) if columns is not None else list(BEAM_COLUMNS)
+        self._moments = Moments()
+
+    @property
+    def columns(self):
+        return self._columns
+
+    @property
+    def count(self):
+        """Gets the number of accumulated particles."""
+        return self._moments.count
+
+    def update(self, block):
+        """
+        Adds a block of particles.
+
+        Args:
+            block (Beam, pd.DataFrame or np.ndarray): Particles; arrays must be
+                (n, len(columns)) in the order of `columns`. float32 blocks are
+                converted per block, so the accumulation is always float64.
+
+        Returns:
+            BeamStatistics: self
+        """
+        if hasattr(block, 'to_numpy') and hasattr(block, 'state'):
+            block = block.to_numpy(self._columns)
+        elif isinstance(block, pd.DataFrame):
+            block = block[self._columns].to_numpy(dtype=np.float64)
+        block = np.asarray(block, dtype=np.float64)
+        if block.ndim != 2 or block.shape[1] != len(self._columns):
+            raise ValueError(f"block must have shape (n, {len(self._columns)})")
+        self._moments.update(block)
+        return self
+
+    def merge(self, other: "BeamStatistics"):
+        """
+        Merges another accumulator over the same columns into this one.
+
+        Returns:
+            BeamStatistics: self
+        """
+        if other.columns != self._columns:
+            raise ValueError("Cannot merge statistics over different columns")
+        self._moments.merge(other._moments)
+        return self
+
+    def transform(self, matrix: np.ndarray, offset: np.ndarray = None) -> "BeamStatistics":
+        """
+        Moments after the linear map v -> matrix @ v + offset, without the particles:
+        the mean maps as the particles and the second moments as R Σ Rᵀ.
+
+        Args:
+            matrix (np.ndarray): (k, k) map in the order of `columns`.
+            offset (np.ndarray, optional): (k,) constant shift. Defaults to none.
+
+        Returns:
+            BeamStatistics: New accumulator of the mapped particles.
+        """
+        matrix = np.asarray(matrix, dtype=np.float64)
+        state = self._moments.to_dict()
+        if self.count:
+            mean = matrix @ np.asarray(state["mean"])
+            if offset is not None:
+                mean += offset
+            state["mean"] = mean
+            state["m2"] = matrix @ np.asarray(state["m2"]) @ matrix.T
+        stats = BeamStatistics(self._columns)
+        stats._moments = Moments.from_dict(state)
+        return stats
+
+    def mean(self) -> np.ndarray:
+        """Gets the first-moment vector."""
+        if not self.count:
+            return np.zeros(len(self._columns))
+        return self._moments.mean()
+
+    def covariance(self, ddof: int = 0) -> np.ndarray:
+        """
+        Gets the second central moment (covariance) matrix.
+
+        Args:
+            ddof (int, optional): Delta degrees of freedom. Defaults to 0, as used by Twiss.
+        """
+        if self.count <= ddof:
+            raise ValueError("Not enough particles accumulated")
+        return self._moments.covariance(ddof)
+
+    @property
+    def centroid(self) -> pd.Series:
+        """Beam centroid, as Beam.centroid."""
+        return pd.Series(self.mean(), index=self._columns)
+
+    @property
+    def rms_size(self) -> pd.Series:
+        """RMS size (sample standard deviation), as Beam.rms_size."""
+        return pd.Series(np.sqrt(np.diag(self.covariance(ddof=1))), index=self._columns)
+
+    def twiss(self) -> dict:
+        """
+        Twiss parameters of the x-x', y-y' and dt-dW planes.
+
+        Returns:
+            dict: {"twiss_x": ..., "twiss_y": ..., "twiss_z": ...}, as Twiss.values().
+        """
+        return Twiss.from_covariance(self.covariance(ddof=0), self._columns)
+
+    def to_dict(self) -> dict:
+        """Serializable accumulator state (count, columns, mean and centered cross-product matrix)."""
+        dim = len(self._columns)
+        state = self._moments.to_dict()
+        return {
+            "columns": list(self._columns),
+            "count": state["count"],
+            "mean": state.get("mean", [0.0] * dim),
+            "m2": state.get("m2", [[0.0] * dim] * dim)
+        }
+
+    @classmethod
+    def from_dict(cls, state: dict) -> "BeamStatistics":
+        """Restores an accumulator saved with to_dict()."""
+        stats = cls(state["columns"])
+        stats._moments = Moments.from_dict(state)
+        return stats
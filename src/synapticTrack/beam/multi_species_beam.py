@@ -0,0 +1,354 @@
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+from scipy.constants import c, physical_constants
+
+from synapticTrack.beam.beam import (Beam, BEAM_COLUMNS, MOMENT_BLOCK_SIZE, as_particle_array,
+                                     get_ion_species_name, _read_only)
+from synapticTrack.beam.beam_statistics import BeamStatistics
+from synapticTrack.beam.twiss import Twiss
+
+amu = physical_constants['atomic mass constant energy equivalent in MeV'][0]
+
+class MultiSpeciesBeam:
+    def __init__(self, state, mass_numbers, charge_states, counts, reference_energy: float,
+                 beam_currents=None, columns=None):
+        """
+        Initializes a beam of several ion species (e.g. the charge states of one ion).
+
+        The particles of all species share one contiguous, particle-major
+        (N, k) float64 array, stored species after species; `offsets`
+        delimit the segments. Per-species Beams are views into that array.
+        The particles are changed through set_column() or edit(), which keep
+        the cached moments of the beam and of its species Beams consistent.
+
+        Args:
+            state (np.ndarray or pd.DataFrame): (N, k) particle coordinates, grouped by species.
+            mass_numbers (sequence of int or int): Mass number of each species, or one for all.
+            charge_states (sequence of int): Charge state of each species.
+            counts (sequence of int): Number of particles of each species, in storage order.
+            reference_energy (float): Reference beam energy in MeV/u.
+            beam_currents (sequence of float or float, optional): Current of each species in uA,
+                                                                  or one for all. Defaults to 0.
+            columns (list of str, optional): Column names of an array state.
+                                             Defaults to ['x', 'xp', 'y', 'yp', 'dt', 'dW'].
+        """
+        charge_states = np.atleast_1d(np.asarray(charge_states, dtype=np.int64))
+        n_species = len(charge_states)
+        counts = np.asarray(counts, dtype=np.int64)
+        if counts.shape != (n_species,):
+            raise ValueError(f"Got {len(counts)} particle counts for {n_species} species")
+
+        # Particle-major storage keeps every species segment contiguous, so species Beams are views
+        data, columns = as_particle_array(state, columns, order='C')
+        if counts.sum() != data.shape[0]:
+            raise ValueError(f"Species counts add up to {counts.sum()}, not {data.shape[0]} particles")
+
+        self._data = data
+        self._columns = columns
+        self._mass_numbers = np.broadcast_to(np.asarray(mass_numbers, dtype=np.int64), (n_species,)).copy()
+        self._charge_states = charge_states
+        self._beam_currents = np.broadcast_to(
+            np.asarray(0.0 if beam_currents is None else beam_currents, dtype=np.float64), (n_species,)).copy()
+        self._offsets = np.concatenate([[0], np.cumsum(counts)])
+        self._reference_energy = reference_energy
+        self._species_table = None
+        self._statistics = None
+        self._version = 0
+
+    @classmethod
+    def from_labels(cls, state, labels, mass_numbers, charge_states, reference_energy: float,
+                    beam_currents=None, columns=None) -> "MultiSpeciesBeam":
+        """
+        Builds a beam from particles in any order and a per-particle species label.
+
+        Args:
+            state (np.ndarray): (N, k) particle coordinates.
+            labels (np.ndarray): (N,) species index of each particle, 0 <= label < number of species.
+            Other arguments as in MultiSpeciesBeam().
+        """
+        labels = np.asarray(labels, dtype=np.int64)
+        n_species = len(np.atleast_1d(charge_states))
+        if len(labels) and (labels.min() < 0 or labels.max() >= n_species):
+            raise ValueError(f"Species labels must lie in [0, {n_species})")
+        counts = np.bincount(labels, minlength=n_species)
+        if np.all(labels[1:] >= labels[:-1]):
+            ordered = state
+        else:
+            ordered = as_particle_array(state, columns)[0][np.argsort(labels, kind='stable')]
+        return cls(ordered, mass_numbers, charge_states, counts, reference_energy, beam_currents, columns)
+
+    @classmethod
+    def from_beams(cls, beams) -> "MultiSpeciesBeam":
+        """
+        Concatenates single-species Beams with a common reference energy and columns.
+        """
+        beams = list(beams)
+        if not beams:
+            raise ValueError("No beams given")
+        columns = beams[0].columns
+        if any(beam.columns != columns for beam in beams):
+            raise ValueError("All beams must have the same columns")
+        energies = {beam.reference_energy for beam in beams}
+        if len(energies) > 1:
+            raise ValueError(f"All beams must share one reference energy, got {sorted(energies)}")
+        return cls(np.concatenate([beam.data for beam in beams]),
+                   [beam.mass_number for beam in beams], [beam.charge_state for beam in beams],
+                   [beam.macroparticles for beam in beams], beams[0].reference_energy,
+                   [beam.beam_current for beam in beams], columns)
+
+    @property
+    def data(self):
+        """Gets a read-only view of the (N, k) particle array of all species."""
+        return _read_only(self._data)
+
+    @property
+    def dtype(self):
+        """Gets the storage type of the particle array."""
+        return self._data.dtype
+
+    def set_column(self, name: str, values):
+        """
+        Overwrites one column of all species, as Beam.set_column(), and drops the cached moments.
+        """
+        if name not in self._columns:
+            raise KeyError(f"Column '{name}' not in beam state")
+        with self.edit() as data:
+            data[:, self._columns.index(name)] = values
+
+    @contextmanager
+    def edit(self):
+        """
+        Gives writable access to the (N, k) particle array; the cached moments, also
+        those of species Beams, are dropped when the block exits.
+        """
+        try:
+            yield self._data
+        finally:
+            self.invalidate()
+
+    @property
+    def columns(self):
+        """Gets the column names of the particle array."""
+        return list(self._columns)
+
+    @property
+    def offsets(self):
+        """Gets the segment boundaries: species i occupies rows offsets[i]:offsets[i + 1]."""
+        return self._offsets.copy()
+
+    @property
+    def counts(self):
+        """Gets the number of particles of each species."""
+        return np.diff(self._offsets)
+
+    @property
+    def macroparticles(self):
+        """Gets the total number of macroparticles."""
+        return self._data.shape[0]
+
+    @property
+    def reference_energy(self):
+        """Gets the beam reference energy in MeV/u"""
+        return self._reference_energy
+
+    @property
+    def mass_numbers(self):
+        return self._mass_numbers.copy()
+
+    @property
+    def charge_states(self):
+        return self._charge_states.copy()
+
+    @property
+    def beam_currents(self):
+        return self._beam_currents.copy()
+
+    @property
+    def beam_current(self):
+        """Gets the total beam current."""
+        return float(self._beam_currents.sum())
+
+    @property
+    def species_names(self):
+        return list(self.species_table['species'])
+
+    def __len__(self):
+        return len(self._charge_states)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.beam(i)
+
+    @property
+    def species_table(self) -> pd.DataFrame:
+        """
+        Per-species table, computed once: species name, mass number, charge
+        state, q/A, particle count and row range, current, and magnetic
+        rigidity Bρ [T·m] at the reference energy.
+        """
+        if self._species_table is None:
+            gamma = 1 + self._reference_energy / amu
+            momentum = self._mass_numbers * amu * np.sqrt(gamma**2 - 1)  # MeV/c
+            self._species_table = pd.DataFrame({
+                'species': [get_ion_species_name(int(a), int(q))
+                            for a, q in zip(self._mass_numbers, self._charge_states)],
+                'mass_number': self._mass_numbers,
+                'charge_state': self._charge_states,
+                'q_over_a': self._charge_states / self._mass_numbers,
+                'count': self.counts,
+                'start': self._offsets[:-1],
+                'stop': self._offsets[1:],
+                'beam_current': self._beam_currents,
+                'brho': momentum * 1e6 / (self._charge_states * c)
+            })
+        return self._species_table
+
+    def species_index(self, species) -> int:
+        """
+        Resolves a species given as index or name (e.g. 'Ar8+').
+        """
+        if isinstance(species, str):
+            names = self.species_names
+            if species not in names:
+                raise KeyError(f"Species '{species}' not in beam")
+            return names.index(species)
+        index = int(species)
+        if not -len(self) <= index < len(self):
+            raise IndexError(f"Species index {index} out of range")
+        return index % len(self)
+
+    def beam(self, species) -> Beam:
+        """
+        Gets one species as a Beam whose particle array is a view into this beam.
+
+        The Beam starts from this beam's cached moments and recomputes them
+        after either beam changed; its set_column(), edit() and apply_map()
+        write into this beam.
+
+        Args:
+            species (int or str): Species index or name.
+        """
+        return _SpeciesBeam(self, self.species_index(species))
+
+    def statistics(self) -> list:
+        """
+        Gets the moment accumulators of each species, computed in one blocked
+        pass over the array and cached; set_column() and edit() drop them.
+
+        Returns:
+            list of BeamStatistics: One per species, in storage order.
+        """
+        if self._statistics is None:
+            stats = []
+            for start, stop in zip(self._offsets[:-1], self._offsets[1:]):
+                accumulator = BeamStatistics(self._columns)
+                for block in range(start, stop, MOMENT_BLOCK_SIZE):
+                    accumulator.update(self._data[block:min(block + MOMENT_BLOCK_SIZE, stop)])
+                stats.append(accumulator)
+            self._statistics = stats
+        return self._statistics
+
+    def combined_statistics(self) -> BeamStatistics:
+        """Moments of all species together, merged from the per-species moments."""
+        combined = BeamStatistics(self._columns)
+        for stats in self.statistics():
+            combined.merge(stats)
+        return combined
+
+    def invalidate(self):
+        """Drops the cached moments. Species Beams see the change on their next use."""
+        self._statistics = None
+        self._version += 1
+
+    def centroids(self) -> pd.DataFrame:
+        """
+        Centroid of each species and of the whole beam.
+
+        Returns:
+            pd.DataFrame: One row per species name plus 'all', one column per coordinate.
+        """
+        return self._table(lambda stats: stats.centroid)
+
+    def rms_sizes(self) -> pd.DataFrame:
+        """
+        RMS size of each species and of the whole beam, as centroids().
+        """
+        return self._table(lambda stats: stats.rms_size, min_count=2)
+
+    def twiss(self) -> dict:
+        """
+        Twiss parameters of each species and of the whole beam.
+
+        Returns:
+            dict: Species name (and 'all') -> {"twiss_x": ..., "twiss_y": ..., "twiss_z": ...};
+                  NaN for a species without particles.
+        """
+        empty = Twiss.from_covariance(np.full((len(self._columns),) * 2, np.nan), self._columns)
+        result = {name: stats.twiss() if stats.count else empty
+                  for name, stats in zip(self.species_names, self.statistics())}
+        result['all'] = self.combined_statistics().twiss()
+        return result
+
+    def _table(self, quantity, min_count: int = 1) -> pd.DataFrame:
+        # Species with too few particles for the quantity get a NaN row
+        missing = pd.Series(np.nan, index=self._columns)
+        rows = [quantity(stats) if stats.count >= min_count else missing for stats in self.statistics()]
+        rows.append(quantity(self.combined_statistics()))
+        table = pd.DataFrame(rows, index=self.species_names + ['all'])
+        return table[[col for col in BEAM_COLUMNS if col in table.columns]]
+
+
+class _SpeciesBeam(Beam):
+    """
+    One species of a MultiSpeciesBeam, as returned by MultiSpeciesBeam.beam().
+
+    The particle array is the species segment of the parent's array. The
+    moments are shared with the parent while neither changes; writes go to
+    the parent array and drop the cached moments of both.
+    """
+
+    def __init__(self, parent: MultiSpeciesBeam, index: int):
+        start, stop = parent._offsets[index], parent._offsets[index + 1]
+        super().__init__(parent._data[start:stop], int(parent._mass_numbers[index]),
+                         int(parent._charge_states[index]), float(parent._beam_currents[index]),
+                         parent._reference_energy, columns=parent._columns)
+        self._parent = parent
+        self._position = index
+        self._parent_version = parent._version
+
+    def statistics(self, workers: int = None) -> BeamStatistics:
+        """
+        Gets the moment accumulator of the species, recomputed when the parent changed.
+        """
+        self._check_parent()
+        if self._statistics is None and self._parent._statistics is not None:
+            self._statistics = self._parent._statistics[self._position]
+        return super().statistics(workers)
+
+    @contextmanager
+    def edit(self):
+        """
+        Gives writable access to the species particles in the parent array; the cached
+        moments of the species and of the parent are dropped when the block exits.
+        """
+        try:
+            yield self._data
+        finally:
+            self._parent.invalidate()
+            self.invalidate()
+
+    def invalidate(self):
+        """Drops the cached moments of the species."""
+        super().invalidate()
+        self._parent_version = self._parent._version
+
+    def _check_parent(self):
+        if self._parent_version != self._parent._version:
+            self.invalidate()
+
+    def _after_map(self, matrix: np.ndarray, offset: np.ndarray):
+        self._check_parent()
+        self._parent.invalidate()
+        super()._after_map(matrix, offset)
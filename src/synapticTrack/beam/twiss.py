@@ -1,36 +1,77 @@
 import numpy as np
-from synapticTrack.utils.stats import (
-    calc_variance, calc_covariance
-)
+from synapticTrack.utils.parallel import reduce_moments
 from scipy.constants import c, physical_constants
 
 amu = physical_constants['atomic mass constant energy equivalent in MeV'][0]
 
+BEAM_COLUMNS = ['x', 'xp', 'y', 'yp', 'dt', 'dW']
+TWISS_PLANES = {"twiss_x": ('x', 'xp'), "twiss_y": ('y', 'yp'), "twiss_z": ('dt', 'dW')}
+
 class Twiss:
     def __init__(self, beam):
         """
         Compute Twiss parameters from a Beam object.
+
+        All planes are derived from the beam's cached covariance matrix, so
+        the particles are scanned at most once.
         """
         self._beam = beam
-        self._twiss_x = self.compute_twiss(beam.x, beam.xp)
-        self._twiss_y = self.compute_twiss(beam.y, beam.yp)
-        self._twiss_z = self.compute_twiss(beam.dt, beam.dW)
+        columns = beam.columns
+        missing = [col for col in BEAM_COLUMNS if col not in columns]
+        if missing:
+            raise ValueError(f"Missing expected columns in beam state: {missing}")
+        index = [columns.index(col) for col in BEAM_COLUMNS]
+        self._sigma = beam.covariance()[np.ix_(index, index)]
+        planes = self.from_covariance(self._sigma)
+        self._twiss_x = planes["twiss_x"]
+        self._twiss_y = planes["twiss_y"]
+        self._twiss_z = planes["twiss_z"]
 
     @staticmethod
-    def compute_twiss(u, up):
+    def from_covariance(sigma, columns=None):
+        """
+        Compute the Twiss parameters of the x-x', y-y' and dt-dW planes from a
+        covariance matrix.
+
+        Args:
+            sigma (np.ndarray): Covariance (ddof=0) matrix.
+            columns (list of str, optional): Column order of sigma.
+                                             Defaults to ['x', 'xp', 'y', 'yp', 'dt', 'dW'].
+
+        Returns:
+            dict: {"twiss_x": ..., "twiss_y": ..., "twiss_z": ...}, as values().
+        """
+        index = {col: i for i, col in enumerate(columns or BEAM_COLUMNS)}
+        result = {}
+        for name, (u, up) in TWISS_PLANES.items():
+            i, j = index[u], index[up]
+            result[name] = Twiss.from_moments(sigma[i, i], sigma[j, j], sigma[i, j])
+        return result
+
+    @staticmethod
+    def compute_twiss(u, up, workers=None):
         """
         Compute emittance and Twiss parameters from 2D phase space projection.
 
+        The second moments are reduced chunk by chunk in a thread pool
+        (see utils.parallel).
+
         Returns:
             dict: {emittance, alpha, beta, gamma}
 
         """
-        #from synapticTrack.utils.stats import calc_variance, calc_covariance
+        sigma = reduce_moments([np.asarray(u), np.asarray(up)], workers=workers).covariance()
+        return Twiss.from_moments(sigma[0, 0], sigma[1, 1], sigma[0, 1])
 
-        sigma_u = calc_variance(u)
-        sigma_up = calc_variance(up)
-        sigma_uup = calc_covariance(u, up)
+    @staticmethod
+    def from_moments(sigma_u, sigma_up, sigma_uup):
+        """
+        Compute emittance and Twiss parameters from the second moments
+        <u^2>, <u'^2> and <u u'> of a 2D phase space projection.
 
+        Returns:
+            dict: {emittance, alpha, beta, gamma}
+        """
         det = sigma_u * sigma_up - sigma_uup**2
         if det <= 0:
             raise ValueError("Non-physical Twiss parameters: determinant ≤ 0")
@@ -43,7 +84,7 @@ class Twiss:
         # Optional self-consistency check
         gamma_check = (1 + alpha**2) / beta
         if abs(gamma - gamma_check) > 1e-8:
-            print(f"Warning: Inconsistent Twiss gamma in {label} plane. "
+            print(f"Warning: Inconsistent Twiss gamma. "
                   f"Expected γ={gamma_check:.3f}, got γ={gamma:.3f}")
 
         return {
@@ -53,6 +94,76 @@ class Twiss:
             "gamma": gamma
         }
 
+    @staticmethod
+    def from_moments_batch(sigma_u, sigma_up, sigma_uup):
+        """
+        Vectorized from_moments() over arrays of second moments of any shape.
+
+        Entries with a non-physical determinant (≤ 0) are NaN in every
+        output instead of raising, so one bad setting does not stop a scan.
+
+        Returns:
+            dict: {emittance, alpha, beta, gamma}, arrays of the broadcast input shape.
+        """
+        sigma_u, sigma_up, sigma_uup = np.broadcast_arrays(
+            *(np.asarray(s, dtype=np.float64) for s in (sigma_u, sigma_up, sigma_uup)))
+        det = sigma_u * sigma_up - sigma_uup**2
+        emit = np.sqrt(np.where(det > 0, det, np.nan))
+        return {
+            "emittance": emit,
+            "alpha": -sigma_uup / emit,
+            "beta": sigma_u / emit,
+            "gamma": sigma_up / emit
+        }
+
+    @staticmethod
+    def from_covariance_batch(sigma, columns=None):
+        """
+        Twiss parameters of all planes from a stack of covariance matrices.
+
+        Args:
+            sigma (np.ndarray): (..., k, k) covariance (ddof=0) matrices, e.g. one per beam.
+            columns (list of str, optional): Column order of the matrices.
+                                             Defaults to ['x', 'xp', 'y', 'yp', 'dt', 'dW'].
+
+        Returns:
+            dict: {"twiss_x": {emittance, alpha, beta, gamma}, "twiss_y": ..., "twiss_z": ...},
+                  each an array of shape (...); non-physical entries are NaN.
+        """
+        sigma = np.asarray(sigma, dtype=np.float64)
+        index = {col: i for i, col in enumerate(columns or BEAM_COLUMNS)}
+        return {name: Twiss.from_moments_batch(sigma[..., index[u], index[u]], sigma[..., index[up], index[up]],
+                                               sigma[..., index[u], index[up]])
+                for name, (u, up) in TWISS_PLANES.items()}
+
+    @staticmethod
+    def compute_twiss_batch(u, up):
+        """
+        Vectorized compute_twiss() over stacked phase-space projections.
+
+        Args:
+            u (np.ndarray): (..., N) positions, e.g. (n_beams, N) or (n_beams, n_planes, N).
+            up (np.ndarray): (..., N) angles of the same shape.
+
+        Returns:
+            dict: {emittance, alpha, beta, gamma}, arrays of shape (...); non-physical entries are NaN.
+        """
+        u = np.asarray(u, dtype=np.float64)
+        up = np.asarray(up, dtype=np.float64)
+        du = u - u.mean(axis=-1, keepdims=True)
+        dup = up - up.mean(axis=-1, keepdims=True)
+        return Twiss.from_moments_batch(np.mean(du * du, axis=-1), np.mean(dup * dup, axis=-1),
+                                        np.mean(du * dup, axis=-1))
+
+    @staticmethod
+    def normalize_emittance(emittance, reference_energy):
+        """
+        Normalized emittance ε_n = γ_rel β_rel ε, broadcast over arrays of
+        emittances and reference energies [MeV/u].
+        """
+        gamma = 1 + np.asarray(reference_energy, dtype=np.float64) / amu
+        return np.sqrt(gamma**2 - 1) * np.asarray(emittance)
+
     @property
     def horizontal(self):
         return self._twiss_x
@@ -65,6 +176,26 @@ class Twiss:
     def longitudinal(self):
         return self._twiss_z
 
+    @property
+    def sigma_matrix(self):
+        """6x6 covariance matrix of (x, xp, y, yp, dt, dW)."""
+        return self._sigma.copy()
+
+    @property
+    def coupling(self):
+        """
+        Cross-plane blocks of the covariance matrix.
+
+        Returns:
+            dict: {"xy": <(x, xp) x (y, yp)>, "xz": <(x, xp) x (dt, dW)>, "yz": <(y, yp) x (dt, dW)>},
+                  each a 2x2 array; all zero for an uncoupled beam.
+        """
+        return {
+            "xy": self._sigma[0:2, 2:4].copy(),
+            "xz": self._sigma[0:2, 4:6].copy(),
+            "yz": self._sigma[2:4, 4:6].copy()
+        }
+
     def values(self):
         """
         Return Twiss parameter dictionary.
@@ -84,21 +215,14 @@ class Twiss:
         Returns:
             float: normalized emittance [mm·mrad]
         """
-        gamma = 1 + self._beam.reference_energy / amu
-        beta = np.sqrt(1 - 1 / gamma**2)
-
-        if plane == 'x':
-            unnorm_emit = self._twiss_x['emittance']
-        elif plane == 'y':
-            unnorm_emit = self._twiss_y['emittance']
-        elif plane == 'z':
-            unnorm_emit = self._twiss_z['emittance']
-        else:
+        if plane not in ('x', 'y', 'z'):
             raise ValueError("plane must be 'x', 'y', or 'z'")
-
-        return (beta * gamma * unnorm_emit)
+        return self.normalized_emittances()[plane]
 
     def normalized_emittances(self):
-        return {k: self.normalized_emittance(k) for k in ['x', 'y', 'z']}
+        emittances = np.array([self._twiss_x['emittance'], self._twiss_y['emittance'],
+                               self._twiss_z['emittance']])
+        normalized = self.normalize_emittance(emittances, self._beam.reference_energy)
+        return {k: float(v) for k, v in zip(['x', 'y', 'z'], normalized)}
 
 
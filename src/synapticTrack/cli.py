@@ -1,40 +1,80 @@
+import os
+import sys
+import glob
+import time
 import typer
-import pandas as pd
-from synapticTrack import pipeline
-from synapticTrack.beam.beam_scanner import BeamWS, BeamAS
+from synapticTrack.io import BeamDataIOManager
 from synapticTrack.analysis.scanner_analysis import analyze_wire_scanner, analyze_allison_scanner_2d
+from synapticTrack.analysis.batch_analysis import (find_scan_files, analyze_scan_files, check_results_format,
+                                                   write_results_table)
 
 app = typer.Typer()
 
 @app.command()
 def run(input_file: str, model_file: str = None):
     """Run full synapticTrack pipeline"""
+    from synapticTrack import pipeline
     pipeline.run_all(input_file, model_file)
 
 @app.command()
-def analyze(scanner: str, file: str, bins: int = 150, plot: bool = True):
+def analyze(scanner: str, file: str, bins: int = 150, plot: bool = True,
+            output: str = None, pattern: str = "*.txt", workers: int = None):
     """
     Analyze beam data from wire or allison scanner.
+
+    FILE may be one scan file, or a directory (searched recursively for
+    --pattern) or a glob for a batch: the scans are analyzed in parallel
+    without plots and written as one table to --output (.csv, .parquet or
+    .jsonl; CSV on stdout by default). Parquet needs the 'parquet' extra.
     """
+    if scanner not in ("wire", "allison"):
+        typer.echo("Invalid scanner type. Choose 'wire' or 'allison'.")
+        raise typer.Exit(code=1)
+    if os.path.isdir(file) or glob.has_magic(file):
+        _analyze_batch(scanner, file, output, pattern, workers)
+        return
+
     typer.echo(f"Analyzing {scanner} scanner data from {file}")
+    scan = BeamDataIOManager.read_scanner(scanner, file)
     if scanner == "wire":
-        df = pd.read_csv(file, sep='\\t|\\s+', engine='python',
-                         names=['x_pos', 'x_current', 'y_pos', 'y_current', 'd_pos', 'd_current'])
-        scan = BeamWS(df, scan_id=file)
         results = analyze_wire_scanner(scan, plot=plot)
-    elif scanner == "allison":
-        df = pd.read_csv(file, skiprows=1, sep='\\s+',
-                         names=['x', 'xp', 'current', 'hv', 'y_current'])
-        df = df[['x', 'xp', 'current']]
-        scan = BeamAS(df, scan_id=file)
-        results = analyze_allison_scanner_2d(scan, bins=bins, plot=plot)
     else:
-        typer.echo("Invalid scanner type. Choose 'wire' or 'allison'.")
-        raise typer.Exit(code=1)
+        results = analyze_allison_scanner_2d(scan, bins=bins, plot=plot)
 
     for k, v in results.items():
         typer.echo(f"{k}: {v:.5f}" if isinstance(v, float) else f"{k}: {v}")
 
+def _analyze_batch(scanner, path, output, pattern, workers):
+    # A batch can run for hours; an unwritable output format must fail before it starts
+    if output is not None:
+        try:
+            check_results_format(output)
+        except (ValueError, ImportError) as e:
+            typer.echo(str(e), err=True)
+            raise typer.Exit(code=1)
+    filenames = find_scan_files(path, pattern)
+    if not filenames:
+        typer.echo(f"No scan files found in {path}", err=True)
+        raise typer.Exit(code=1)
+    typer.echo(f"Analyzing {len(filenames)} {scanner} scans from {path}", err=True)
+
+    start = time.perf_counter()
+    step = max(1, len(filenames) // 20)
+
+    def progress(done, total):
+        if done % step == 0 or done == total:
+            rate = done / (time.perf_counter() - start)
+            typer.echo(f"  {done}/{total} scans, {rate:.1f} scans/s", err=True)
+
+    table = analyze_scan_files(scanner, filenames, workers=workers, progress=progress)
+    elapsed = time.perf_counter() - start
+    failed = int((table["status"] != "ok").sum())
+    if output is None:
+        table.to_csv(sys.stdout, index=False)
+    else:
+        write_results_table(table, output)
+    typer.echo(f"Analyzed {len(table)} scans ({failed} failed) in {elapsed:.1f} s, "
+               f"{len(table) / elapsed:.1f} scans/s", err=True)
+
 if __name__ == "__main__":
     app()
-
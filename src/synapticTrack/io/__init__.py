@@ -3,5 +3,10 @@ from .jutrack_io import JuTrackIO
 from .opal_io import OPALIO
 from .flame_io import FlameIO
 from .scanner_io import ScannerIO
+from .scan_archive import ScanArchive
+from .hdf5_io import HDF5IO
+from .npy_io import NPYIO
+from .sqlite_catalog import BeamCatalog, lattice_fingerprint
+from .stats_cache import StatsCache
 from .beam_data_io_manager import BeamDataIOManager
 
@@ -1,12 +1,19 @@
 import pandas as pd
 import numpy as np
 from os.path import splitext, exists
+from concurrent.futures import ProcessPoolExecutor
+from collections import OrderedDict
+from functools import partial
+import copy
+import os
 import json
 from typing import Union
 from scipy.constants import c, physical_constants
 
-from synapticTrack.beam import Beam, BeamWS, BeamAS, Twiss
-from synapticTrack.io import TrackIO, JuTrackIO, OPALIO, FlameIO, ScannerIO
+from synapticTrack.beam import Beam, BeamWS, BeamAS, Twiss, BeamStatistics, MultiSpeciesBeam, BeamEnsemble
+from synapticTrack.io import TrackIO, JuTrackIO, OPALIO, FlameIO, ScannerIO, HDF5IO, NPYIO, BeamCatalog
+from synapticTrack.io.text_io import iter_column_blocks
+from synapticTrack.io.stats_cache import StatsCache, file_signature
 
 amu = physical_constants['atomic mass constant energy equivalent in MeV'][0]
 
@@ -23,18 +30,61 @@ class BeamDataIOManager:
         'opal': OPALIO.write,
         'flame': FlameIO.write
     }
+    # Per-code conversion of raw text blocks, used for chunked reading
+    code_converters = {
+        'track': TrackIO.convert,
+        'jutrack': JuTrackIO.convert,
+        'opal': TrackIO.convert,
+        'flame': TrackIO.convert
+    }
+    code_header_lines = {
+        'track': 1,
+        'jutrack': 0,
+        'opal': 0,
+        'flame': 0
+    }
+    # Codes whose text writer produces a file iter_chunks() reads back; write() caches their statistics
+    stats_seed_codes = ('track', 'jutrack')
+    format_readers = {
+        ('track', 'scratch'): TrackIO.read_scratch,
+        ('jutrack', 'binary'): JuTrackIO.read_binary,
+        ('opal', 'h5part'): OPALIO.read_h5part
+    }
+    format_writers = {
+        ('track', 'scratch'): TrackIO.write_scratch,
+        ('jutrack', 'binary'): JuTrackIO.write_binary
+    }
+    species_readers = {
+        'track': TrackIO.read_multi_species
+    }
+    species_writers = {
+        'track': TrackIO.write_multi_species
+    }
+    storage_readers = {
+        'hdf5': HDF5IO.read,
+        'npy': NPYIO.read
+    }
+    storage_writers = {
+        'hdf5': HDF5IO.write,
+        'npy': NPYIO.write
+    }
     scanner_readers = {
         'wire': ScannerIO.read_wire_scanner,
         'allison': ScannerIO.read_allison_scanner
     }
+    catalog = None
+    stats_cache = None
+    _metadata_cache = OrderedDict()
+    _metadata_cache_size = 256
     _codes = list(code_readers.keys())
-    _formats = ['hdf5', 'sqlite']
+    _formats = ['scratch', 'binary', 'h5part', 'hdf5', 'npy', 'sqlite']
     _scanners = list(scanner_readers.keys())
 
     @classmethod
     def read(cls, code: str, filename: str,
              mass_number: int = None, charge_state: int = None,
-             beam_current: float = None, reference_energy: float = None) -> Beam:
+             beam_current: float = None, reference_energy: float = None,
+             fmt: str = None, dtype=None) -> Beam:
         """
         Reads beam data from a file. If a metadata .json file exists,
         it overrides the passed parameters.
@@ -46,12 +96,274 @@ class BeamDataIOManager:
             charge_state (int, optional): Charge state
             beam_current (float, optional): Beam current
             reference_energy (float, optional): Reference energy in MeV/u
+            fmt (str, optional): Code-specific file format ('scratch' for TRACK
+                scratch.#NN files, 'binary' for raw JuTrack float64, 'h5part' for
+                the last step of an OPAL H5Part file). Defaults to the code's text format.
+            dtype (optional): np.float32 to store the particles in single precision.
+                Defaults to float64.
 
         Returns:
             Beam: A Beam object with data and metadata
         """
 
-        json_path = splitext(filename)[0] + ".json"
+        mass_number, charge_state, beam_current, reference_energy = cls.resolve_beam_parameters(
+            filename, mass_number, charge_state, beam_current, reference_energy)
+        options = {} if dtype is None else {'dtype': dtype}
+
+        if fmt is not None:
+            if (code, fmt) not in cls.format_readers:
+                raise KeyError(f"No reader registered for code '{code}' and format '{fmt}'")
+            return cls.format_readers[(code, fmt)](filename, mass_number, charge_state, beam_current,
+                                                   reference_energy, **options)
+
+        if code not in cls._codes:
+            raise KeyError(f"No reader registered for code '{code}'")
+
+        return cls.code_readers[code](filename, mass_number, charge_state, beam_current, reference_energy, **options)
+
+    @classmethod
+    def read_multi_species(cls, code: str, filename: str, mass_number, charge_states,
+                           beam_current=0.0, reference_energy: float = None) -> MultiSpeciesBeam:
+        """
+        Reads all species of a multi-charge-state run from one particle file.
+
+        Args:
+            code (str): Simulation code ('track')
+            filename (str): Path to the beam particle file
+            mass_number (int or sequence of int): Mass number, or one per species
+            charge_states (sequence of int): Charge states, in the order the code indexes them
+            beam_current (float or sequence of float, optional): Current, or one per species
+            reference_energy (float): Reference energy in MeV/u
+
+        Returns:
+            MultiSpeciesBeam: One segment per species
+        """
+        if code not in cls.species_readers:
+            raise KeyError(f"No multi-species reader registered for code '{code}'")
+        return cls.species_readers[code](filename, mass_number, charge_states, beam_current, reference_energy)
+
+    @classmethod
+    def read_many(cls, code: str, filenames, workers: int = None, fmt: str = None,
+                  stack: bool = False, errors: str = 'raise',
+                  mass_number: int = None, charge_state: int = None,
+                  beam_current: float = None, reference_energy: float = None, dtype=None):
+        """
+        Reads many particle files concurrently in a process pool.
+
+        Beam parameters are resolved in the calling process (each distinct
+        metadata .json sidecar is read once), then the files are parsed in
+        parallel. Results come back in input order.
+
+        Args:
+            code (str): Simulation code ('track', 'jutrack', 'opal', 'flame')
+            filenames (list of str): Paths to the beam particle files
+            workers (int, optional): Number of worker processes. Defaults to the CPU count;
+                                     1 reads serially in this process.
+            fmt (str, optional): Code-specific file format, as in read().
+            stack (bool, optional): Return one (n_files, n_particles, 6) array instead of Beams.
+            errors (str, optional): 'raise' to raise on the first failed file, or 'return'
+                                    to put the exception in that file's slot. Defaults to 'raise'.
+            mass_number, charge_state, beam_current, reference_energy: Shared beam
+                parameters for files without a metadata sidecar.
+            dtype (optional): Storage type of the beams (and of the stacked array), as in read().
+
+        Returns:
+            list of Beam, or np.ndarray if stack is True
+        """
+        if errors not in ('raise', 'return'):
+            raise ValueError("errors must be 'raise' or 'return'")
+        if stack and errors != 'raise':
+            raise ValueError("stack=True requires errors='raise'")
+        if fmt is not None:
+            if (code, fmt) not in cls.format_readers:
+                raise KeyError(f"No reader registered for code '{code}' and format '{fmt}'")
+            reader = cls.format_readers[(code, fmt)]
+        else:
+            if code not in cls._codes:
+                raise KeyError(f"No reader registered for code '{code}'")
+            reader = cls.code_readers[code]
+        if dtype is not None:
+            reader = partial(reader, dtype=dtype)
+
+        filenames = [str(f) for f in filenames]
+        shared = (mass_number, charge_state, beam_current, reference_energy)
+        resolved = {}
+        tasks = []
+        for filename in filenames:
+            json_path = cls.metadata_path(filename)
+            try:
+                if json_path not in resolved:
+                    resolved[json_path] = cls.resolve_beam_parameters(filename, *shared)
+                tasks.append((reader, filename, resolved[json_path]))
+            except Exception as e:
+                tasks.append((None, filename, e))
+
+        if workers is None:
+            workers = os.cpu_count() or 1
+        workers = max(1, min(workers, len(tasks)))
+        if workers == 1:
+            results = [_read_task(task) for task in tasks]
+        else:
+            chunksize = max(1, len(tasks) // (workers * 4))
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(_read_task, tasks, chunksize=chunksize))
+
+        for filename, result in zip(filenames, results):
+            if isinstance(result, Exception) and errors == 'raise':
+                raise RuntimeError(f"Failed to read '{filename}': {result}") from result
+
+        if stack:
+            columns = ['x', 'xp', 'y', 'yp', 'dt', 'dW']
+            counts = {beam.macroparticles for beam in results}
+            if len(counts) > 1:
+                raise ValueError(f"Cannot stack beams with different particle counts: {sorted(counts)}")
+            return np.stack([beam.to_numpy(columns) for beam in results])
+        return results
+
+    @classmethod
+    def read_ensemble(cls, code: str, filenames, filename: str = None, batch_size: int = 256,
+                      workers: int = None, fmt: str = None,
+                      mass_number: int = None, charge_state: int = None,
+                      beam_current: float = None, reference_energy: float = None,
+                      dtype=None) -> BeamEnsemble:
+        """
+        Reads runs with equal particle counts into one BeamEnsemble.
+
+        Files are read with read_many(). With `filename`, the ensemble is
+        written run by run into a memory-mapped .npy file (see
+        NPYIO.create_ensemble), so only `batch_size` beams are in memory at
+        a time; the beam parameters of the first file apply to all runs.
+
+        Args:
+            code (str): Simulation code ('track', 'jutrack', 'opal', 'flame')
+            filenames (list of str): Paths to the beam particle files, one per run.
+            filename (str, optional): .npy file to build the ensemble in. Defaults to memory.
+            batch_size (int, optional): Files read per batch when writing to disk. Defaults to 256.
+            workers, fmt, mass_number, charge_state, beam_current, reference_energy, dtype:
+                As in read_many().
+
+        Returns:
+            BeamEnsemble: One run per file, in input order.
+        """
+        filenames = [str(f) for f in filenames]
+        if not filenames:
+            raise ValueError("No files given")
+        options = dict(workers=workers, fmt=fmt, mass_number=mass_number, charge_state=charge_state,
+                       beam_current=beam_current, reference_energy=reference_energy, dtype=dtype)
+        if filename is None:
+            return BeamEnsemble.from_beams(cls.read_many(code, filenames, **options))
+
+        ensemble = None
+        for start in range(0, len(filenames), batch_size):
+            beams = cls.read_many(code, filenames[start:start + batch_size], **options)
+            if ensemble is None:
+                first = beams[0]
+                ensemble = NPYIO.create_ensemble(filename, len(filenames), first.macroparticles,
+                                                 first.mass_number, first.charge_state,
+                                                 first.beam_current, first.reference_energy,
+                                                 columns=first.columns, dtype=first.dtype)
+            for run, beam in enumerate(beams, start):
+                if beam.macroparticles != ensemble.macroparticles:
+                    raise ValueError(f"'{filenames[run]}' has {beam.macroparticles} particles, "
+                                     f"expected {ensemble.macroparticles}")
+                ensemble.data[run] = beam.to_numpy(ensemble.columns)
+        ensemble.data.flush()
+        return ensemble
+
+    @classmethod
+    def iter_chunks(cls, code: str, filename: str, chunk_size: int = 1_000_000,
+                    mass_number: int = None, charge_state: int = None,
+                    beam_current: float = None, reference_energy: float = None):
+        """
+        Reads a text particle file block by block, holding at most
+        `chunk_size` particles in memory.
+
+        Args:
+            code (str): Simulation code ('track', 'jutrack', 'opal', 'flame')
+            filename (str): Path to the beam particle file
+            chunk_size (int, optional): Particles per block. Defaults to 1,000,000.
+            mass_number, charge_state, beam_current, reference_energy: As in read().
+
+        Yields:
+            Beam: One Beam per block of particles, in file order.
+        """
+        if code not in cls.code_converters:
+            raise KeyError(f"No chunked reader registered for code '{code}'")
+        params = cls.resolve_beam_parameters(filename, mass_number, charge_state, beam_current, reference_energy)
+        convert = cls.code_converters[code]
+        for block in iter_column_blocks(filename, chunk_size, skiprows=cls.code_header_lines[code]):
+            yield convert(block, *params)
+
+    @classmethod
+    def read_statistics(cls, code: str, filename: str, chunk_size: int = 1_000_000,
+                        mass_number: int = None, charge_state: int = None,
+                        beam_current: float = None, reference_energy: float = None) -> BeamStatistics:
+        """
+        Computes centroid, RMS size, 6x6 second-moment matrix and Twiss of a
+        particle file in one streaming pass with bounded memory.
+
+        With an open stats cache (see open_stats_cache()), the result is
+        served from the cache while the file is unchanged and stored after
+        a fresh computation.
+
+        Returns:
+            BeamStatistics: Accumulated statistics of all particles in the file.
+        """
+        params = cls.resolve_beam_parameters(filename, mass_number, charge_state, beam_current, reference_energy)
+        key = {"code": code, "parameters": list(params)}
+        if cls.stats_cache is not None:
+            payload = cls.stats_cache.get(filename)
+            if payload is not None and payload.get("key") == key:
+                return BeamStatistics.from_dict(payload["statistics"])
+
+        # Taken before the pass: a file rewritten while it is streamed is not cached
+        signature = cls.stats_cache.signature(filename) if cls.stats_cache is not None else None
+        stats = BeamStatistics()
+        for chunk in cls.iter_chunks(code, filename, chunk_size, *params):
+            stats.update(chunk)
+
+        if cls.stats_cache is not None:
+            cls.stats_cache.put(filename, {"key": key, "statistics": stats.to_dict(),
+                                           **cls._summary(stats)}, signature=signature)
+        return stats
+
+    @classmethod
+    def open_stats_cache(cls, filename: str, max_entries: int = 10000, content_hash: bool = False) -> StatsCache:
+        """
+        Opens (or creates) the persistent stats cache used by read_statistics().
+
+        Args:
+            filename (str): Path to the SQLite cache file.
+            max_entries (int, optional): LRU bound on cached files. Defaults to 10000.
+            content_hash (bool, optional): Validate entries by content digest in
+                addition to modification time and size. Defaults to False.
+
+        Returns:
+            StatsCache: The active cache.
+        """
+        cls.close_stats_cache()
+        cls.stats_cache = StatsCache(filename, max_entries=max_entries, content_hash=content_hash)
+        return cls.stats_cache
+
+    @classmethod
+    def close_stats_cache(cls):
+        """Stops caching statistics and closes the active cache."""
+        if cls.stats_cache is not None:
+            cls.stats_cache.close()
+            cls.stats_cache = None
+
+    @classmethod
+    def resolve_beam_parameters(cls, filename: str,
+                                mass_number: int = None, charge_state: int = None,
+                                beam_current: float = None, reference_energy: float = None) -> tuple:
+        """
+        Resolves the beam parameters of a particle file. Values from its
+        metadata .json file, if one exists, override the passed parameters.
+
+        Returns:
+            tuple: (mass_number, charge_state, beam_current, reference_energy)
+        """
+        json_path = cls.metadata_path(filename)
 
         if exists(json_path):
             try:
@@ -83,59 +395,204 @@ class BeamDataIOManager:
             reference_energy = _to_float(metadata.get("reference_energy", reference_energy), "reference_energy")
         if None in (mass_number, charge_state, beam_current, reference_energy):
             raise ValueError("Missing beam parameters and no metadata file found.")
+        return mass_number, charge_state, beam_current, reference_energy
 
-        if code not in cls._codes:
-            raise KeyError(f"No reader registered for code '{code}'")
+    @classmethod
+    def write(cls, code: str, filename: str, beam: Union[Beam, MultiSpeciesBeam], fmt: str = None,
+              lattice=None, label: str = None):
+        # Save beam particle coordinates
+        if isinstance(beam, MultiSpeciesBeam):
+            if fmt is not None or code not in cls.species_writers:
+                raise KeyError(f"No multi-species writer registered for code '{code}'")
+            cls.species_writers[code](filename, beam)
+        elif fmt is not None:
+            if (code, fmt) not in cls.format_writers:
+                raise KeyError(f"No writer registered for code '{code}' and format '{fmt}'")
+            cls.format_writers[(code, fmt)](filename, beam)
+        else:
+            cls.code_writers[code](filename, beam)
+
+        metadata = cls.beam_metadata(beam)
+        # Determine JSON filename
+        json_filename = cls.metadata_path(filename)
+
+        # Write JSON metadata
+        with open(json_filename, "w") as f:
+            json.dump(metadata, f, indent=4)
+
+        if cls.catalog is not None:
+            cls.catalog.add(filename, metadata, code=code, fmt=fmt, lattice=lattice, label=label)
 
-        return cls.code_readers[code](filename, mass_number, charge_state, beam_current, reference_energy)
+        if fmt is None:
+            cls._seed_stats_cache(code, filename, beam)
 
     @classmethod
-    def write(cls, code: str, filename: str, beam: Beam):
-        # Save beam particle coordinates
-        cls.code_writers[code](filename, beam)
+    def _seed_stats_cache(cls, code: str, filename: str, beam):
+        """
+        Caches the statistics of a just-written text file while it is still in the page
+        cache. They are streamed from the file as written, not taken from the beam in
+        memory, so a later cache hit equals a cold read_statistics().
+        """
+        if cls.stats_cache is None or isinstance(beam, MultiSpeciesBeam) or code not in cls.stats_seed_codes:
+            return
+        cls.read_statistics(code, filename)
 
-        # Create metadata dictionary
-        def to_serializable(d):
-            """Convert all values to serializable (e.g., float) format."""
-            return {k: float(v) for k, v in d.items()}
+    @classmethod
+    def open_catalog(cls, filename: str) -> BeamCatalog:
+        """
+        Opens (or creates) the SQLite catalog that every subsequent write()
+        and save() records its beam metadata and summary statistics in.
+
+        Args:
+            filename (str): Path to the SQLite catalog file.
+
+        Returns:
+            BeamCatalog: The active catalog, also queryable for datasets.
+        """
+        cls.close_catalog()
+        cls.catalog = BeamCatalog(filename)
+        return cls.catalog
+
+    @classmethod
+    def close_catalog(cls):
+        """Stops cataloguing writes and closes the active catalog."""
+        if cls.catalog is not None:
+            cls.catalog.close()
+            cls.catalog = None
+
+    @classmethod
+    def beam_metadata(cls, beam: Union[Beam, MultiSpeciesBeam]) -> dict:
+        """
+        Builds the metadata dictionary (beam parameters, centroid, sigma, Twiss) of a beam.
+        For a MultiSpeciesBeam, the statistics are those of all species together.
+        """
+        if isinstance(beam, MultiSpeciesBeam):
+            metadata = {
+                "species": ",".join(beam.species_names),
+                "beam_current": beam.beam_current,
+                "reference_energy": beam.reference_energy,
+                "macroparticles": beam.macroparticles
+            }
+            metadata.update(cls._summary(beam.combined_statistics()))
+            return metadata
 
-        twiss = Twiss(beam)
         metadata = {
             "species": beam.species,
             "charge_state": beam.charge_state,
             "mass_number": beam.mass_number,
             "beam_current": beam.beam_current,
             "reference_energy": beam.reference_energy,
-            "macroparticles": beam.macroparticles,
-            "beam_centroid": to_serializable(beam.centroid),
-            "beam_sigma": to_serializable(beam.rms_size),
-            "twiss_x": to_serializable(twiss.horizontal),
-            "twiss_y": to_serializable(twiss.vertical),
-            "twiss_z": to_serializable(twiss.longitudinal)
+            "macroparticles": beam.macroparticles
         }
-        # Determine JSON filename
-        json_filename = splitext(filename)[0] + ".json"
+        # The beam's cached moments give centroid, sigma and all Twiss planes
+        metadata.update(cls._summary(beam.statistics()))
+        return metadata
 
-        # Write JSON metadata
-        with open(json_filename, "w") as f:
-            json.dump(metadata, f, indent=4)
+    @staticmethod
+    def _summary(stats: BeamStatistics) -> dict:
+        def to_serializable(d):
+            """Convert all values to serializable (e.g., float) format."""
+            return {k: float(v) for k, v in d.items()}
+
+        twiss = stats.twiss()
+        return {
+            "beam_centroid": to_serializable(stats.centroid),
+            "beam_sigma": to_serializable(stats.rms_size),
+            "twiss_x": to_serializable(twiss["twiss_x"]),
+            "twiss_y": to_serializable(twiss["twiss_y"]),
+            "twiss_z": to_serializable(twiss["twiss_z"])
+        }
+
+    @classmethod
+    def save(cls, filename: str, beam: Union[Beam, MultiSpeciesBeam], fmt: str = 'hdf5', group: str = None,
+             lattice=None, label: str = None, **kwargs):
+        """
+        Stores a beam and its metadata in a code-independent storage format.
+
+        Args:
+            filename (str): Path to the storage file.
+            beam (Beam or MultiSpeciesBeam): Beam to store.
+            fmt (str, optional): Storage format. Defaults to 'hdf5'.
+            group (str, optional): Group path of the beam inside the file, e.g. 'run_001/WS3'.
+            lattice (optional): Lattice, lattice file or fingerprint recorded in the catalog.
+            label (str, optional): Label recorded in the catalog, e.g. 'WS3'.
+            **kwargs: Passed to the storage writer (chunk_size, compression, ...).
+        """
+        if fmt not in cls.storage_writers:
+            raise KeyError(f"No writer registered for storage format '{fmt}'")
+        metadata = cls.beam_metadata(beam)
+        cls.storage_writers[fmt](filename, beam, group=group, metadata=metadata, **kwargs)
+
+        if cls.catalog is not None:
+            cls.catalog.add(filename, metadata, fmt=fmt, group=group, lattice=lattice, label=label)
+
+    @classmethod
+    def load(cls, filename: str, fmt: str = 'hdf5', group: str = None,
+             columns=None, start: int = None, stop: int = None, dtype=None) -> Beam:
+        """
+        Loads a beam, or selected columns and a particle slice of it, from a storage file.
+
+        Args:
+            filename (str): Path to the storage file.
+            fmt (str, optional): Storage format. Defaults to 'hdf5'.
+            group (str, optional): Group path of the beam inside the file.
+            columns (list of str, optional): Columns to load, e.g. ['x', 'y'].
+            start (int, optional): First particle index.
+            stop (int, optional): One past the last particle index.
+            dtype (optional): Storage type of the beam. Defaults to the stored type.
+
+        Returns:
+            Beam: A Beam object with the selected data and stored metadata
+        """
+        if fmt not in cls.storage_readers:
+            raise KeyError(f"No reader registered for storage format '{fmt}'")
+        return cls.storage_readers[fmt](filename, group=group, columns=columns, start=start, stop=stop,
+                                        dtype=dtype)
 
     @classmethod
-    def read_beam_metadata(cls, filename: str) -> dict:
+    def metadata_path(cls, filename: str) -> str:
+        """
+        Returns the .json metadata sidecar path of a particle file.
+
+        TRACK scratch files (scratch.#02, scratch.#03, ...) share a stem,
+        so their sidecar keeps the full file name (scratch.#02.json).
+        """
+        root, ext = splitext(str(filename))
+        if ext.startswith('.#'):
+            return str(filename) + ".json"
+        return root + ".json"
+
+    @classmethod
+    def read_beam_metadata(cls, filename: str, verbose: bool = False) -> dict:
         """
         Reads the beam metadata (charge_state, mass_number, etc.) from a corresponding .json file.
 
+        Parsed files are kept in a small in-memory LRU keyed by path,
+        modification time and size, so repeated calls do not re-read an
+        unchanged sidecar.
+
         Args:
             filename (str): Path to the code-specific particle coordinate file.
+            verbose (bool, optional): Pretty-print the metadata. Defaults to False.
 
         Returns:
             dict: Dictionary with metadata keys and values.
         """
-        json_filename = splitext(filename)[0] + ".json"
-        with open(json_filename, "r") as f:
-            metadata = json.load(f)
-        print(json.dumps(metadata, indent=4))
-        return metadata
+        json_filename = cls.metadata_path(filename)
+        signature = file_signature(json_filename)
+        metadata = cls._metadata_cache.get(signature[0])
+        if metadata is not None and metadata[0] == signature:
+            cls._metadata_cache.move_to_end(signature[0])
+            metadata = metadata[1]
+        else:
+            with open(json_filename, "r") as f:
+                metadata = json.load(f)
+            cls._metadata_cache[signature[0]] = (signature, metadata)
+            while len(cls._metadata_cache) > cls._metadata_cache_size:
+                cls._metadata_cache.popitem(last=False)
+        if verbose:
+            print(json.dumps(metadata, indent=4))
+        return copy.deepcopy(metadata)
 
     @classmethod
     def read_scanner(cls, scanner: str, filename: str) -> Union[BeamWS, BeamAS]:
@@ -153,3 +610,12 @@ class BeamDataIOManager:
     def supported_scanners(cls):
         return cls._scanners
 
+def _read_task(task):
+    """Process-pool worker for BeamDataIOManager.read_many: returns a Beam or the exception raised."""
+    reader, filename, params = task
+    if reader is None:
+        return params
+    try:
+        return reader(filename, *params)
+    except Exception as e:
+        return e
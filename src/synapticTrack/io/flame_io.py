@@ -5,14 +5,16 @@ from typing import Union
 from os.path import basename, splitext
 
 from synapticTrack.beam import Beam, BeamWS, BeamAS
+from synapticTrack.io.track_io import TrackIO
 
 amu = physical_constants['atomic mass constant energy equivalent in MeV'][0]
 
 class FlameIO:
     @staticmethod
-    def read(filename: str, mass_number: int, charge_state: int, beam_current: float, reference_energy: float) -> Beam:
+    def read(filename: str, mass_number: int, charge_state: int, beam_current: float, reference_energy: float,
+             dtype=np.float64) -> Beam:
         particles = np.loadtxt(filename)
-        return TrackIO.convert(particles, mass_number, charge_state, beam_current, reference_energy)
+        return TrackIO.convert(particles, mass_number, charge_state, beam_current, reference_energy, dtype)
 
     @staticmethod
     def write(filename: str, beam: Beam):
@@ -0,0 +1,193 @@
+import json
+from typing import Union
+import pandas as pd
+import numpy as np
+import h5py
+
+from synapticTrack.beam import Beam, MultiSpeciesBeam
+
+BEAM_COLUMNS = ['x', 'xp', 'y', 'yp', 'dt', 'dW']
+BEAM_PARAMETERS = ['mass_number', 'charge_state', 'beam_current', 'reference_energy']
+SPECIES_GROUP = 'species'
+SPECIES_DATASETS = ['mass_number', 'charge_state', 'beam_current', 'offsets']
+
+class HDF5IO:
+    """
+    Chunked, compressed HDF5 storage for Beam objects.
+
+    Each beam is an HDF5 group holding one 1-D dataset per phase-space
+    column. The beam metadata is stored as group attributes; nested
+    entries (centroid, sigma, Twiss) are JSON-encoded strings. One file
+    can hold any number of beams, e.g. '/run_001/WS3'. A MultiSpeciesBeam
+    additionally gets a 'species' subgroup with the mass number, charge
+    state, current and particle offsets of each species.
+    """
+    default_group = 'beam'
+
+    @staticmethod
+    def write(filename: str, beam: Union[Beam, MultiSpeciesBeam], group: str = None, metadata: dict = None,
+              chunk_size: int = 65536, compression: str = 'gzip', compression_opts=4,
+              overwrite: bool = True, dtype=None):
+        """
+        Writes a beam into a group of an HDF5 file (created if missing).
+
+        Args:
+            filename (str): Path to the HDF5 file.
+            beam (Beam or MultiSpeciesBeam): Beam to store.
+            group (str, optional): Group path for this beam. Defaults to 'beam'.
+            metadata (dict, optional): Metadata stored as attributes. Defaults to the beam parameters.
+            chunk_size (int, optional): Particles per chunk. Defaults to 65536.
+            compression (str, optional): h5py compression filter. Defaults to 'gzip'.
+            compression_opts (optional): Compression level. Defaults to 4.
+            overwrite (bool, optional): Replace an existing group. Defaults to True.
+            dtype (optional): Stored type of the particle columns, e.g. np.float32.
+                              Defaults to the beam's storage type.
+        """
+        group = group or HDF5IO.default_group
+        multi_species = isinstance(beam, MultiSpeciesBeam)
+        if metadata is None:
+            if multi_species:
+                metadata = {'reference_energy': beam.reference_energy, 'beam_current': beam.beam_current,
+                            'species': ','.join(beam.species_names)}
+            else:
+                metadata = {key: getattr(beam, key) for key in BEAM_PARAMETERS}
+                metadata['species'] = beam.species
+            metadata['macroparticles'] = beam.macroparticles
+
+        chunks = (max(1, min(chunk_size, beam.macroparticles)),)
+        with h5py.File(filename, 'a') as f:
+            if group in f:
+                if not overwrite:
+                    raise ValueError(f"Group '{group}' already exists in '{filename}'")
+                del f[group]
+            g = f.create_group(group)
+            for i, col in enumerate(beam.columns):
+                g.create_dataset(col, data=beam.data[:, i], dtype=dtype, chunks=chunks,
+                                 compression=compression, compression_opts=compression_opts,
+                                 shuffle=compression is not None)
+            if multi_species:
+                s = g.create_group(SPECIES_GROUP)
+                s['mass_number'] = beam.mass_numbers
+                s['charge_state'] = beam.charge_states
+                s['beam_current'] = beam.beam_currents
+                s['offsets'] = beam.offsets
+            for key, value in metadata.items():
+                if isinstance(value, dict):
+                    g.attrs[key] = json.dumps({k: float(v) for k, v in value.items()})
+                elif value is None:
+                    continue
+                else:
+                    g.attrs[key] = value
+
+    @staticmethod
+    def read(filename: str, group: str = None, columns=None, start: int = None,
+             stop: int = None, dtype=None) -> Union[Beam, MultiSpeciesBeam]:
+        """
+        Reads a beam, or part of it, from an HDF5 file.
+
+        Only the requested columns and the chunks covering the particle
+        range [start, stop) are read from disk. Multi-species groups are
+        always read whole (all particles of the selected columns).
+
+        Args:
+            filename (str): Path to the HDF5 file.
+            group (str, optional): Group path of the beam. Defaults to 'beam'.
+            columns (list of str, optional): Columns to load. Defaults to all six.
+            start (int, optional): First particle index.
+            stop (int, optional): One past the last particle index.
+            dtype (optional): Storage type of the returned beam. Defaults to the stored type.
+
+        Returns:
+            Beam or MultiSpeciesBeam: Beam holding the selected columns and particles.
+        """
+        species = HDF5IO.read_species(filename, group)
+        if species is not None and (start is not None or stop is not None):
+            raise ValueError("Particle ranges are not supported for multi-species beams")
+        data = HDF5IO.read_columns(filename, group, columns, start, stop)
+        metadata = HDF5IO.read_metadata(filename, group)
+        particles = np.column_stack(list(data.values()))
+        if species is not None:
+            return MultiSpeciesBeam(particles, species['mass_number'],
+                                    species['charge_state'], np.diff(species['offsets']),
+                                    float(metadata['reference_energy']), species['beam_current'],
+                                    columns=list(data))
+        missing = [key for key in BEAM_PARAMETERS if key not in metadata]
+        if missing:
+            raise ValueError(f"Missing beam parameters {missing} in '{filename}:{group}'")
+        return Beam(particles,
+                    int(metadata['mass_number']), int(metadata['charge_state']),
+                    float(metadata['beam_current']), float(metadata['reference_energy']),
+                    columns=list(data), dtype=dtype or particles.dtype)
+
+    @staticmethod
+    def read_columns(filename: str, group: str = None, columns=None, start: int = None, stop: int = None) -> dict:
+        """
+        Reads selected columns of a stored beam as NumPy arrays.
+
+        Returns:
+            dict: Column name -> np.ndarray of the particles in [start, stop).
+        """
+        group = group or HDF5IO.default_group
+        with h5py.File(filename, 'r') as f:
+            g = f[group]
+            if columns is None:
+                columns = [col for col in BEAM_COLUMNS if col in g] + \
+                          [col for col in g if col not in BEAM_COLUMNS and isinstance(g[col], h5py.Dataset)]
+            missing = [col for col in columns if col not in g]
+            if missing:
+                raise KeyError(f"Columns {missing} not found in '{filename}:{group}'")
+            return {col: g[col][start:stop] for col in columns}
+
+    @staticmethod
+    def read_metadata(filename: str, group: str = None) -> dict:
+        """
+        Reads the metadata attributes of a stored beam without touching particle data.
+
+        Returns:
+            dict: Metadata keys and values, with JSON-encoded entries decoded.
+        """
+        group = group or HDF5IO.default_group
+        with h5py.File(filename, 'r') as f:
+            attrs = dict(f[group].attrs)
+
+        metadata = {}
+        for key, value in attrs.items():
+            if isinstance(value, bytes):
+                value = value.decode()
+            if isinstance(value, str) and value.startswith('{'):
+                value = json.loads(value)
+            elif isinstance(value, np.generic):
+                value = value.item()
+            metadata[key] = value
+        return metadata
+
+    @staticmethod
+    def read_species(filename: str, group: str = None) -> dict:
+        """
+        Reads the species table of a stored multi-species beam.
+
+        Returns:
+            dict: mass_number, charge_state, beam_current and offsets arrays,
+                  or None for a single-species beam.
+        """
+        group = group or HDF5IO.default_group
+        with h5py.File(filename, 'r') as f:
+            g = f[group]
+            if SPECIES_GROUP not in g:
+                return None
+            return {key: g[SPECIES_GROUP][key][()] for key in SPECIES_DATASETS}
+
+    @staticmethod
+    def groups(filename: str) -> list:
+        """
+        Lists the group paths of all beams stored in an HDF5 file.
+        """
+        found = []
+
+        def visit(name, obj):
+            if isinstance(obj, h5py.Group) and ('mass_number' in obj.attrs or SPECIES_GROUP in obj):
+                found.append(name)
+
+        with h5py.File(filename, 'r') as f:
+            f.visititems(visit)
+        return found
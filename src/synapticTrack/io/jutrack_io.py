@@ -5,59 +5,145 @@ from typing import Union
 from os.path import basename, splitext
 
 from synapticTrack.beam import Beam, BeamWS, BeamAS
+from synapticTrack.io.text_io import write_columns
 
 amu = physical_constants['atomic mass constant energy equivalent in MeV'][0]
 
 class JuTrackIO:
     @staticmethod
-    def read(filename: str, mass_number: int, charge_state: int, beam_current: float, reference_energy: float) -> Beam:
+    def read(filename: str, mass_number: int, charge_state: int, beam_current: float, reference_energy: float,
+             dtype=np.float64) -> Beam:
         particles = np.loadtxt(filename)
-        return JuTrackIO.convert(particles, mass_number, charge_state, beam_current, reference_energy)
+        return JuTrackIO.convert(particles, mass_number, charge_state, beam_current, reference_energy, dtype)
 
     @staticmethod
-    def convert(particles: np.ndarray, mass_number: int, charge_state: int, beam_current: float, reference_energy: float) -> Beam:
+    def read_binary(filename: str, mass_number: int, charge_state: int, beam_current: float, reference_energy: float,
+                    dtype=np.float64) -> Beam:
+        """
+        Reads particles written by write_binary() (or by Julia's write() of an N x 6 Matrix{Float64}).
+        """
+        raw = np.fromfile(filename, dtype='<f8')
+        if raw.size % 6:
+            raise ValueError(f"'{filename}' does not hold an N x 6 float64 matrix")
+        particles = raw.reshape(6, -1).T  # column-major N x 6, no copy
+        return JuTrackIO.convert(particles, mass_number, charge_state, beam_current, reference_energy, dtype)
+
+    @staticmethod
+    def convert(particles: np.ndarray, mass_number: int, charge_state: int, beam_current: float, reference_energy: float,
+                dtype=np.float64) -> Beam:
         x, px_p0, y, py_p0, z, delta = particles.T
-        E0 = mass_number * amu
         gamma0 = 1 + reference_energy / amu
         beta0 = np.sqrt(1 - 1 / gamma0**2)
-        p0 = gamma0 * beta0 * E0
-        p_total = p0 * (1 + delta)
-        gamma = np.sqrt(1 + (p_total / E0)**2)
-        dW = (gamma - gamma0) * amu
-        pz_p0 = np.sqrt((1 + delta)**2 - px_p0**2 - py_p0**2)
-        xp = (px_p0 / pz_p0) * 1e3       # mrad
-        yp = (py_p0 / pz_p0) * 1e3       # mrad
-        x_mm = x * 1e3                   # mm
-        y_mm = y * 1e3                   # mm
-        dt = -z / (beta0 * c)
-        df = pd.DataFrame({"x": x_mm, "xp": xp, "y": y_mm, "yp": yp, "dt": dt, "dW": dW})
-        return Beam(df, mass_number, charge_state, beam_current, reference_energy)
+
+        # All conversions below are free of cancellation, so they are safe in float32 as well
+        state = np.empty((particles.shape[0], 6), dtype=dtype)
+        x_mm, xp, y_mm, yp, dt, dW = state.T
+        pz_p0 = dt  # dt is filled last, so its column holds pz/p0 meanwhile
+
+        # dW = (gamma - gamma0) amu, written as delta (2 + delta) (beta0 gamma0)^2 / (gamma + gamma0)
+        # so that particles close to the reference do not lose digits to cancellation
+        np.add(delta, 1, out=pz_p0)
+        np.multiply(pz_p0, gamma0 * beta0, out=xp)       # p / (m c)
+        np.square(xp, out=xp)
+        np.add(xp, 1, out=xp)
+        np.sqrt(xp, out=xp)
+        np.add(xp, gamma0, out=xp)                       # gamma + gamma0
+        np.add(delta, 2, out=dW)
+        np.multiply(dW, delta, out=dW)
+        np.multiply(dW, (gamma0 * beta0)**2 * amu, out=dW)
+        np.divide(dW, xp, out=dW)
+
+        # pz/p0 = sqrt((1 + delta)^2 - px^2 - py^2)
+        np.square(pz_p0, out=pz_p0)
+        np.square(px_p0, out=xp)
+        np.subtract(pz_p0, xp, out=pz_p0)
+        np.square(py_p0, out=xp)
+        np.subtract(pz_p0, xp, out=pz_p0)
+        np.sqrt(pz_p0, out=pz_p0)
+        np.divide(px_p0, pz_p0, out=xp)
+        np.multiply(xp, 1e3, out=xp)                     # mrad
+        np.divide(py_p0, pz_p0, out=yp)
+        np.multiply(yp, 1e3, out=yp)                     # mrad
+
+        np.multiply(x, 1e3, out=x_mm)                    # mm
+        np.multiply(y, 1e3, out=y_mm)                    # mm
+        np.multiply(z, -1 / (beta0 * c), out=dt)
+        return Beam(state, mass_number, charge_state, beam_current, reference_energy, dtype=dtype)
 
     @staticmethod
-    def write(filename: str, beam: Beam):
-        x = beam.state['x'].values * 1e-3
-        y = beam.state['y'].values * 1e-3
-        xp = beam.state['xp'].values * 1e-3
-        yp = beam.state['yp'].values * 1e-3
-        dt = beam.state['dt'].values
-        dW = beam.state['dW'].values
+    def to_jutrack_array(beam: Beam, out: np.ndarray = None, work: np.ndarray = None) -> np.ndarray:
+        """
+        Converts beam coordinates to JuTrack (x, px/p0, y, py/p0, z, delta) in place.
+
+        Args:
+            beam (Beam): synapticTrack beam object
+            out (np.ndarray, optional): Preallocated (N, 6) float64 output. Defaults to a new
+                                        Fortran-ordered array, i.e. one contiguous block per column.
+            work (np.ndarray, optional): Preallocated (N,) float64 scratch buffer.
+
+        Returns:
+            np.ndarray: `out`, filled with JuTrack coordinates.
+        """
+        n = beam.macroparticles
+        if out is None:
+            out = np.empty((n, 6), order='F')
+        if work is None:
+            work = np.empty(n)
+        if out.shape != (n, 6) or work.shape != (n,):
+            raise ValueError(f"out must be ({n}, 6) and work ({n},)")
+        x, px_p0, y, py_p0, z, delta = out.T
+
         E0 = beam.mass_number * amu
         gamma0 = 1 + beam.reference_energy / amu
         beta0 = np.sqrt(1 - 1 / gamma0**2)
         p0 = gamma0 * beta0 * E0
-        kinetic = beam.reference_energy + dW
-        gamma = 1 + kinetic / amu
-        beta = np.sqrt(1 - 1 / gamma**2)
-        p = gamma * beta * E0
-        delta = (p - p0) / p0
-        px_p0 = xp
-        py_p0 = yp
-        pz_p0 = np.sqrt((1 + delta)**2 - px_p0**2 - py_p0**2)
-        px_p0 = xp * pz_p0
-        py_p0 = yp * pz_p0
-        z = -beta0 * c * dt
-        df = pd.DataFrame({"x": x, "px_p0": px_p0, "y": y, "py_p0": py_p0, "z": z, "delta": delta})
-        df.to_csv(filename, sep=' ', header=False, index=False, float_format='%.12e')
+
+        np.multiply(beam.x, 1e-3, out=x)
+        np.multiply(beam.y, 1e-3, out=y)
+
+        # delta = (p - p0) / p0 from the kinetic energy per nucleon, written as
+        # (gamma^2 - gamma0^2) / (beta0 gamma0 (beta gamma + beta0 gamma0)) to avoid cancellation
+        bg0 = p0 / E0
+        np.divide(beam.dW, amu, out=work)  # gamma - gamma0
+        np.add(work, 2 * gamma0, out=delta)
+        np.multiply(delta, work, out=delta)              # gamma^2 - gamma0^2
+        np.add(work, gamma0, out=work)                   # gamma
+        np.square(work, out=work)
+        np.subtract(work, 1, out=work)
+        np.sqrt(work, out=work)                          # beta gamma
+        np.add(work, bg0, out=work)
+        np.multiply(work, bg0, out=work)
+        np.divide(delta, work, out=delta)
+
+        # pz/p0 = sqrt((1 + delta)^2 - xp^2 - yp^2), then px/p0 = xp * pz/p0
+        np.multiply(beam.xp, 1e-3, out=px_p0)
+        np.multiply(beam.yp, 1e-3, out=py_p0)
+        pz_p0 = z  # z is filled last
+        np.add(delta, 1, out=pz_p0)
+        np.square(pz_p0, out=pz_p0)
+        np.square(px_p0, out=work)
+        np.subtract(pz_p0, work, out=pz_p0)
+        np.square(py_p0, out=work)
+        np.subtract(pz_p0, work, out=pz_p0)
+        np.sqrt(pz_p0, out=pz_p0)
+        np.multiply(px_p0, pz_p0, out=px_p0)
+        np.multiply(py_p0, pz_p0, out=py_p0)
+
+        np.multiply(beam.dt, -beta0 * c, out=z)
+        return out
+
+    @staticmethod
+    def write(filename: str, beam: Beam):
+        write_columns(filename, JuTrackIO.to_jutrack_array(beam), '%.12e')
+
+    @staticmethod
+    def write_binary(filename: str, beam: Beam):
+        """
+        Writes JuTrack coordinates as raw little-endian float64 in column-major
+        order, readable in Julia with read!(io, Matrix{Float64}(undef, N, 6)).
+        """
+        particles = JuTrackIO.to_jutrack_array(beam)
+        particles.T.astype('<f8', copy=False).tofile(filename)
 
     def convert_to_jutrack_coordinates(beam) -> pd.DataFrame:
         """
@@ -70,15 +156,15 @@ class JuTrackIO:
             pd.DataFrame: Converted coordinates in JuTrack format.
         """
         # Convert position units: mm -> m
-        x = beam.state['x'].values * 1e-3
-        y = beam.state['y'].values * 1e-3
+        x = beam.x * 1e-3
+        y = beam.y * 1e-3
 
         # Convert angles from mrad to rad
-        xp = beam.state['xp'].values * 1e-3
-        yp = beam.state['yp'].values * 1e-3
+        xp = beam.xp * 1e-3
+        yp = beam.yp * 1e-3
 
-        dt = beam.state['dt'].values
-        dW = beam.state['dW'].values
+        dt = beam.dt
+        dW = beam.dW
 
         # Reference mass and energy
         E0 = beam.mass_number * amu                    # total rest mass energy in MeV
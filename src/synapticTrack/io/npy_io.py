@@ -0,0 +1,180 @@
+import json
+from os.path import splitext
+
+import numpy as np
+
+from typing import Union
+
+from synapticTrack.beam import Beam, BeamEnsemble, MultiSpeciesBeam
+
+BEAM_COLUMNS = ['x', 'xp', 'y', 'yp', 'dt', 'dW']
+BEAM_PARAMETERS = ['mass_number', 'charge_state', 'beam_current', 'reference_energy']
+# Sidecar entry holding the species table of a MultiSpeciesBeam
+SPECIES_KEY = 'species_table'
+
+class NPYIO:
+    """
+    NumPy .npy storage for Beam objects.
+
+    The particle array is saved as one (N, k) .npy file, in the beam's
+    storage type or the one requested (e.g. float32 for ML datasets). The
+    beam parameters and column names go to the .json sidecar next to it,
+    the same file BeamDataIOManager reads beam parameters from. Reads
+    memory-map the array, so a particle range costs only its own pages.
+    A MultiSpeciesBeam keeps its species segments in the sidecar.
+    """
+
+    @staticmethod
+    def write(filename: str, beam: Union[Beam, MultiSpeciesBeam], group: str = None, metadata: dict = None,
+              dtype=None):
+        """
+        Writes a beam as a .npy file and its metadata as a .json sidecar.
+
+        Args:
+            filename (str): Path to the .npy file.
+            beam (Beam or MultiSpeciesBeam): Beam to store.
+            group (str, optional): Not supported; a .npy file holds one beam.
+            metadata (dict, optional): Metadata for the sidecar. Defaults to the beam parameters.
+            dtype (optional): Stored type, e.g. np.float32. Defaults to the beam's storage type.
+        """
+        if group is not None:
+            raise ValueError("NPY storage holds one beam per file; groups are not supported")
+        multi_species = isinstance(beam, MultiSpeciesBeam)
+        if metadata is None:
+            if multi_species:
+                metadata = {'reference_energy': beam.reference_energy, 'beam_current': beam.beam_current,
+                            'species': ','.join(beam.species_names)}
+            else:
+                metadata = {key: getattr(beam, key) for key in BEAM_PARAMETERS}
+                metadata['species'] = beam.species
+            metadata['macroparticles'] = beam.macroparticles
+        metadata = dict(metadata, columns=beam.columns)
+        if multi_species:
+            metadata[SPECIES_KEY] = {'mass_number': beam.mass_numbers.tolist(),
+                                     'charge_state': beam.charge_states.tolist(),
+                                     'beam_current': beam.beam_currents.tolist(),
+                                     'offsets': beam.offsets.tolist()}
+
+        with open(filename, 'wb') as f:
+            np.save(f, beam.data.astype(dtype or beam.dtype, copy=False))
+        with open(NPYIO.metadata_path(filename), 'w') as f:
+            json.dump(metadata, f, indent=4)
+
+    @staticmethod
+    def read(filename: str, group: str = None, columns=None, start: int = None, stop: int = None,
+             dtype=None) -> Union[Beam, MultiSpeciesBeam]:
+        """
+        Reads a beam, or selected columns and a particle range of it, from a .npy file.
+
+        Args:
+            filename (str): Path to the .npy file.
+            group (str, optional): Not supported; a .npy file holds one beam.
+            columns (list of str, optional): Columns to load. Defaults to all.
+            start (int, optional): First particle index.
+            stop (int, optional): One past the last particle index.
+            dtype (optional): Storage type of the returned beam. Defaults to the stored type.
+                              Multi-species beams are always float64.
+
+        Returns:
+            Beam or MultiSpeciesBeam: Beam holding the selected columns and particles. Multi-species
+                                      beams are always read whole (all particles of the selected columns).
+        """
+        if group is not None:
+            raise ValueError("NPY storage holds one beam per file; groups are not supported")
+        with open(NPYIO.metadata_path(filename)) as f:
+            metadata = json.load(f)
+        species = metadata.get(SPECIES_KEY)
+        if species is not None and (start is not None or stop is not None):
+            raise ValueError("Particle ranges are not supported for multi-species beams")
+        required = ['reference_energy'] if species is not None else BEAM_PARAMETERS
+        missing = [key for key in required if key not in metadata]
+        if missing:
+            raise ValueError(f"Missing beam parameters {missing} in the sidecar of '{filename}'")
+
+        particles = np.load(filename, mmap_mode='r')
+        stored = list(metadata.get('columns', BEAM_COLUMNS[:particles.shape[1]]))
+        if columns is None:
+            selected = particles[start:stop]
+            columns = stored
+        else:
+            unknown = [col for col in columns if col not in stored]
+            if unknown:
+                raise KeyError(f"Columns {unknown} not found in '{filename}'")
+            selected = particles[start:stop, [stored.index(col) for col in columns]]
+        if species is not None:
+            return MultiSpeciesBeam(np.array(selected, dtype=np.float64), species['mass_number'], species['charge_state'],
+                                    np.diff(species['offsets']), float(metadata['reference_energy']),
+                                    species['beam_current'], columns=list(columns))
+        dtype = dtype or particles.dtype
+        return Beam(np.array(selected, dtype=dtype), int(metadata['mass_number']),
+                    int(metadata['charge_state']), float(metadata['beam_current']),
+                    float(metadata['reference_energy']), columns=list(columns), dtype=dtype)
+
+    @staticmethod
+    def create_ensemble(filename: str, runs: int, macroparticles: int, mass_number: int, charge_state: int,
+                        beam_current: float, reference_energy: float, columns=None,
+                        dtype=np.float64) -> BeamEnsemble:
+        """
+        Creates an empty on-disk ensemble: a (runs, macroparticles, k) .npy file,
+        memory-mapped for writing, and its .json sidecar.
+
+        Returns:
+            BeamEnsemble: Ensemble over the writable memory map; fill its data run by run.
+        """
+        columns = list(columns) if columns is not None else list(BEAM_COLUMNS)
+        data = np.lib.format.open_memmap(filename, mode='w+', dtype=dtype,
+                                         shape=(runs, macroparticles, len(columns)))
+        ensemble = BeamEnsemble(data, mass_number, charge_state, beam_current, reference_energy, columns)
+        NPYIO._write_ensemble_metadata(filename, ensemble)
+        return ensemble
+
+    @staticmethod
+    def write_ensemble(filename: str, ensemble: BeamEnsemble, dtype=None):
+        """
+        Writes an ensemble as one (n_runs, n_particles, k) .npy file and a .json sidecar.
+
+        Args:
+            filename (str): Path to the .npy file.
+            ensemble (BeamEnsemble): Ensemble to store.
+            dtype (optional): Stored type. Defaults to the ensemble's storage type.
+        """
+        with open(filename, 'wb') as f:
+            np.save(f, ensemble.data.astype(dtype or ensemble.dtype, copy=False))
+        NPYIO._write_ensemble_metadata(filename, ensemble)
+
+    @staticmethod
+    def read_ensemble(filename: str, mmap_mode: str = 'r') -> BeamEnsemble:
+        """
+        Opens an ensemble written by write_ensemble() or create_ensemble().
+
+        Args:
+            filename (str): Path to the .npy file.
+            mmap_mode (str, optional): np.load memory-map mode; 'r+' for in-place changes,
+                                       None to load into memory. Defaults to 'r'.
+
+        Returns:
+            BeamEnsemble: Ensemble over the (memory-mapped) array.
+        """
+        with open(NPYIO.metadata_path(filename)) as f:
+            metadata = json.load(f)
+        missing = [key for key in BEAM_PARAMETERS if key not in metadata]
+        if missing:
+            raise ValueError(f"Missing beam parameters {missing} in the sidecar of '{filename}'")
+        data = np.load(filename, mmap_mode=mmap_mode)
+        if data.ndim != 3:
+            raise ValueError(f"'{filename}' does not hold an ensemble array")
+        return BeamEnsemble(data, int(metadata['mass_number']), int(metadata['charge_state']),
+                            float(metadata['beam_current']), float(metadata['reference_energy']),
+                            columns=metadata.get('columns'))
+
+    @staticmethod
+    def _write_ensemble_metadata(filename: str, ensemble: BeamEnsemble):
+        metadata = {key: getattr(ensemble, key) for key in BEAM_PARAMETERS}
+        metadata.update(runs=ensemble.runs, macroparticles=ensemble.macroparticles, columns=ensemble.columns)
+        with open(NPYIO.metadata_path(filename), 'w') as f:
+            json.dump(metadata, f, indent=4)
+
+    @staticmethod
+    def metadata_path(filename: str) -> str:
+        """Returns the .json sidecar path of a .npy file."""
+        return splitext(str(filename))[0] + ".json"
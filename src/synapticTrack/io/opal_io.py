@@ -1,19 +1,187 @@
 import pandas as pd
 import numpy as np
+import h5py
 from scipy.constants import c, physical_constants
 from typing import Union
 from os.path import basename, splitext
 
 from synapticTrack.beam import Beam, BeamWS, BeamAS
+from synapticTrack.io.track_io import TrackIO
 
 amu = physical_constants['atomic mass constant energy equivalent in MeV'][0]
 
+BEAM_COLUMNS = ['x', 'xp', 'y', 'yp', 'dt', 'dW']
+
+# H5Part datasets needed to build each Beam column
+H5PART_DATASETS = {
+    'x': ('x',),
+    'xp': ('px', 'pz'),
+    'y': ('y',),
+    'yp': ('py', 'pz'),
+    'dt': ('z',),
+    'dW': ('px', 'py', 'pz')
+}
+
 class OPALIO:
     @staticmethod
-    def read(filename: str, mass_number: int, charge_state: int, beam_current: float, reference_energy: float) -> Beam:
+    def read(filename: str, mass_number: int, charge_state: int, beam_current: float, reference_energy: float,
+             dtype=np.float64) -> Beam:
+        if h5py.is_hdf5(filename):
+            return OPALIO.read_h5part(filename, mass_number, charge_state, beam_current, reference_energy,
+                                      dtype=dtype)
         particles = np.loadtxt(filename)
-        return TrackIO.convert(particles, mass_number, charge_state, beam_current, reference_energy)
+        return TrackIO.convert(particles, mass_number, charge_state, beam_current, reference_energy, dtype)
 
     @staticmethod
     def write(filename: str, beam: Beam):
         beam.state.to_csv(filename, sep=' ', header=True, index=False)
+
+    @staticmethod
+    def steps(filename: str) -> list:
+        """
+        Lists the step numbers stored in an OPAL H5Part file, in ascending order.
+        """
+        with h5py.File(filename, 'r') as f:
+            return OPALIO._steps(f)
+
+    @staticmethod
+    def step_attributes(filename: str, step: int = -1) -> dict:
+        """
+        Reads the attributes of one step (SPOS, TIME, ENERGY, RefPartR, ...) without
+        touching particle data.
+
+        Args:
+            filename (str): Path to the H5Part file.
+            step (int, optional): Step number; negative values count from the last step.
+
+        Returns:
+            dict: Attribute names and values.
+        """
+        with h5py.File(filename, 'r') as f:
+            g = f[OPALIO._step_group(f, step)]
+            return {key: value.item() if isinstance(value, np.generic) else value
+                    for key, value in g.attrs.items()}
+
+    @staticmethod
+    def read_h5part(filename: str, mass_number: int, charge_state: int, beam_current: float,
+                    reference_energy: float = None, step: int = -1, columns=None,
+                    start: int = None, stop: int = None, dtype=np.float64) -> Beam:
+        """
+        Reads one step of an OPAL H5Part file.
+
+        Only the datasets needed for the requested columns are read, and
+        only for the particles in [start, stop).
+
+        Args:
+            filename (str): Path to the H5Part file.
+            mass_number (int): Mass number of the ion species.
+            charge_state (int): Charge state of the ion.
+            beam_current (float): Beam current.
+            reference_energy (float, optional): Reference energy in MeV/u for dW and dt. Defaults to
+                                                the energy of the step's reference particle (RefPartP),
+                                                or of the mean pz of [start, stop) without it.
+            step (int, optional): Step number; negative values count from the last step.
+                                  Defaults to the last step.
+            columns (list of str, optional): Beam columns to build. Defaults to all six.
+            start (int, optional): First particle index.
+            stop (int, optional): One past the last particle index.
+            dtype (optional): Storage type of the beam, np.float64 or np.float32; the
+                              conversion is done in float64.
+
+        Returns:
+            Beam: Beam with x, y in mm, xp, yp in mrad, dt in ns and dW in MeV/u.
+        """
+        with h5py.File(filename, 'r') as f:
+            return OPALIO._read_step(f, OPALIO._step_group(f, step), mass_number, charge_state,
+                                     beam_current, reference_energy, columns, start, stop, dtype)
+
+    @staticmethod
+    def iter_steps(filename: str, mass_number: int, charge_state: int, beam_current: float,
+                   reference_energy: float = None, steps=None, columns=None, dtype=np.float64):
+        """
+        Reads steps of an OPAL H5Part file one at a time.
+
+        The file stays open while iterating and each step is read only when
+        it is reached, so memory is bounded by one step.
+
+        Args:
+            steps (iterable of int, optional): Step numbers to read. Defaults to all steps.
+            Other arguments as in read_h5part().
+
+        Yields:
+            tuple: (step number, Beam)
+        """
+        with h5py.File(filename, 'r') as f:
+            if steps is None:
+                steps = OPALIO._steps(f)
+            for step in steps:
+                name = OPALIO._step_group(f, step)
+                yield int(name.split('#')[1]), OPALIO._read_step(
+                    f, name, mass_number, charge_state, beam_current, reference_energy, columns, dtype=dtype)
+
+    @staticmethod
+    def _steps(f: h5py.File) -> list:
+        return sorted(int(name.split('#')[1]) for name in f if name.startswith('Step#'))
+
+    @staticmethod
+    def _step_group(f: h5py.File, step: int) -> str:
+        if step < 0:
+            steps = OPALIO._steps(f)
+            if not steps:
+                raise ValueError(f"No steps found in '{f.filename}'")
+            step = steps[step]
+        name = f'Step#{step}'
+        if name not in f:
+            raise KeyError(f"Step {step} not found in '{f.filename}'")
+        return name
+
+    @staticmethod
+    def _read_step(f: h5py.File, name: str, mass_number: int, charge_state: int, beam_current: float,
+                   reference_energy: float = None, columns=None, start: int = None, stop: int = None,
+                   dtype=np.float64) -> Beam:
+        g = f[name]
+        columns = list(columns) if columns is not None else list(BEAM_COLUMNS)
+        unknown = [col for col in columns if col not in H5PART_DATASETS]
+        if unknown:
+            raise KeyError(f"Unknown columns {unknown}")
+        needed = {key for col in columns for key in H5PART_DATASETS[col]}
+        raw = {key: g[key][start:stop].astype(np.float64, copy=False) for key in sorted(needed)}
+
+        def mean(key):
+            # Without reference attributes, the centroid of the requested slice stands in for the reference
+            values = raw[key] if key in raw else g[key][start:stop]
+            return float(np.mean(values, dtype=np.float64))
+
+        # Reference particle: energy (from RefPartP unless given) and longitudinal position of the step
+        if reference_energy is None:
+            p0 = float(np.linalg.norm(g.attrs['RefPartP'])) if 'RefPartP' in g.attrs else mean('pz')
+            reference_energy = (np.sqrt(1 + p0**2) - 1) * amu
+        gamma0 = 1 + reference_energy / amu
+
+        data = {}
+        for col in columns:
+            if col == 'x' or col == 'y':
+                data[col] = raw[col] * 1e3                                    # m to mm
+            elif col == 'xp' or col == 'yp':
+                data[col] = raw['p' + col[0]] / raw['pz'] * 1e3              # mrad
+            elif col == 'dt':
+                z0 = float(g.attrs['RefPartR'][2]) if 'RefPartR' in g.attrs else mean('z')
+                beta0 = np.sqrt(1 - 1 / gamma0**2)
+                data[col] = (raw['z'] - z0) * (-1e9 / (beta0 * c))           # ns, later arrival is positive
+            else:
+                # dW = (gamma - gamma0) amu, written as (p^2 - p0^2) / (gamma + gamma0): this avoids
+                # subtracting two gammas close to 1, which would lose the digits of the kinetic
+                # energy to the rest mass. It is not cancellation-free: p^2 - p0^2 still cancels
+                # for particles close to the reference, as any form based on |p| and p0 does
+                p2 = np.square(raw['px'])
+                p2 += np.square(raw['py'])
+                p2 += np.square(raw['pz'])
+                gamma = np.sqrt(1 + p2)
+                p2 -= gamma0**2 - 1
+                gamma += gamma0
+                np.divide(p2, gamma, out=p2)
+                p2 *= amu
+                data[col] = p2
+
+        return Beam(np.column_stack(list(data.values())), mass_number, charge_state, beam_current,
+                    reference_energy, columns=columns, dtype=dtype)
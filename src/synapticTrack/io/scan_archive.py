@@ -0,0 +1,243 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from os.path import basename, splitext
+from pathlib import Path
+
+import h5py
+import numpy as np
+import pandas as pd
+
+from synapticTrack.beam import BeamWS, BeamAS
+from synapticTrack.io.scanner_io import WIRE_SCANNER_COLUMNS, ALLISON_SCANNER_COLUMNS
+from synapticTrack.io.text_io import read_columns
+
+# Scanner type -> (full column list, scan class, accepted column counts)
+SCANNER_LAYOUTS = {
+    'wire': (WIRE_SCANNER_COLUMNS, BeamWS, (4, 6)),
+    'allison': (ALLISON_SCANNER_COLUMNS, BeamAS, (3, 5))
+}
+
+def classify_scan(data: np.ndarray) -> str:
+    """
+    Guesses the scanner type of a parsed scan file from its column count:
+    4 or 6 columns are wire scans, 3 or 5 columns are Allison scans.
+    """
+    for scanner, (_, _, counts) in SCANNER_LAYOUTS.items():
+        if data.shape[1] in counts:
+            return scanner
+    raise ValueError(f"Cannot infer the scanner type of a {data.shape[1]}-column file")
+
+class ScanArchive:
+    """
+    Columnar HDF5 archive of scanner measurements.
+
+    All scans of one scanner type are concatenated into one table: a
+    group per type ('wire', 'allison') with one resizable 1-D dataset per
+    column. Per-scan 'offsets' (start of each scan, plus the total length),
+    'scan_id', 'path' and 'columns' (number of measured columns) datasets
+    index the table. Scans are returned as BeamWS/BeamAS objects whose
+    data are views into the loaded table, without copying.
+    """
+
+    def __init__(self, filename: str, chunk_size: int = 65536):
+        self._filename = str(filename)
+        self._chunk_size = chunk_size
+        self._tables = {}
+
+    @property
+    def filename(self):
+        return self._filename
+
+    def scanners(self) -> list:
+        """Lists the scanner types present in the archive."""
+        if not os.path.exists(self._filename):
+            return []
+        with h5py.File(self._filename, 'r') as f:
+            return [name for name in SCANNER_LAYOUTS if name in f]
+
+    def paths(self) -> set:
+        """Absolute paths of all ingested files."""
+        found = set()
+        if not os.path.exists(self._filename):
+            return found
+        with h5py.File(self._filename, 'r') as f:
+            for name in SCANNER_LAYOUTS:
+                if name in f:
+                    found.update(path.decode() for path in f[name]['path'][()])
+        return found
+
+    def ingest(self, root: str, pattern: str = '*.txt', scanner: str = None, workers: int = None) -> dict:
+        """
+        Parses all scan files under a directory tree in parallel and appends
+        them to the archive. Files already in the archive are skipped, so
+        re-running on a growing tree only ingests new files.
+
+        Args:
+            root (str): Directory to walk.
+            pattern (str, optional): Glob for scan files, matched recursively. Defaults to '*.txt'.
+            scanner (str, optional): 'wire' or 'allison' for all files. Defaults to classify_scan().
+            workers (int, optional): Number of worker processes. Defaults to the CPU count;
+                                     1 parses serially in this process.
+
+        Returns:
+            dict: Scanner type -> number of scans added.
+        """
+        if scanner is not None and scanner not in SCANNER_LAYOUTS:
+            raise KeyError(f"Unknown scanner '{scanner}'")
+        known = self.paths()
+        filenames = sorted(str(path.resolve()) for path in _rglob(root, pattern))
+        tasks = [(filename, scanner) for filename in filenames if filename not in known]
+        if not tasks:
+            return {}
+
+        if workers is None:
+            workers = os.cpu_count() or 1
+        workers = max(1, min(workers, len(tasks)))
+        if workers == 1:
+            results = [_parse_task(task) for task in tasks]
+        else:
+            chunksize = max(1, len(tasks) // (workers * 4))
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(_parse_task, tasks, chunksize=chunksize))
+
+        by_scanner = {}
+        for (filename, _), (kind, data) in zip(tasks, results):
+            if isinstance(data, Exception):
+                raise RuntimeError(f"Failed to ingest '{filename}': {data}") from data
+            by_scanner.setdefault(kind, []).append((filename, data))
+
+        with h5py.File(self._filename, 'a') as f:
+            for kind, scans in by_scanner.items():
+                self._append(f, kind, scans)
+        self._tables.clear()
+        return {kind: len(scans) for kind, scans in by_scanner.items()}
+
+    def _append(self, f: h5py.File, scanner: str, scans: list):
+        columns, _, _ = SCANNER_LAYOUTS[scanner]
+        if scanner not in f:
+            g = f.create_group(scanner)
+            for col in columns:
+                g.create_dataset(col, shape=(0,), maxshape=(None,), dtype='f8',
+                                 chunks=(self._chunk_size,), compression='gzip', shuffle=True)
+            g.create_dataset('offsets', data=np.zeros(1, dtype='i8'), maxshape=(None,), chunks=True)
+            for name in ('scan_id', 'path'):
+                g.create_dataset(name, shape=(0,), maxshape=(None,), dtype=h5py.string_dtype(), chunks=True)
+            g.create_dataset('columns', shape=(0,), maxshape=(None,), dtype='i1', chunks=True)
+        g = f[scanner]
+
+        start = int(g['offsets'][-1])
+        counts = np.array([len(data) for _, data in scans], dtype='i8')
+        total = start + int(counts.sum())
+        block = np.full((total - start, len(columns)), np.nan)
+        row = 0
+        for (_, data), n in zip(scans, counts):
+            block[row:row + n, :data.shape[1]] = data
+            row += n
+        for i, col in enumerate(columns):
+            g[col].resize((total,))
+            g[col][start:total] = block[:, i]
+
+        _extend(g['offsets'], start + np.cumsum(counts))
+        _extend(g['scan_id'], [splitext(basename(filename))[0] for filename, _ in scans])
+        _extend(g['path'], [filename for filename, _ in scans])
+        _extend(g['columns'], [data.shape[1] for _, data in scans])
+
+    def index(self, scanner: str) -> pd.DataFrame:
+        """
+        Per-scan index of one scanner type.
+
+        Returns:
+            pd.DataFrame: scan_id, path, start, stop and columns of each scan, in ingestion order.
+        """
+        table = self._load(scanner)
+        return table['index'].copy()
+
+    def table(self, scanner: str) -> pd.DataFrame:
+        """
+        All points of one scanner type as one DataFrame, backed by the loaded table.
+        Columns a scan did not measure are NaN.
+        """
+        table = self._load(scanner)
+        columns, _, _ = SCANNER_LAYOUTS[scanner]
+        return pd.DataFrame(table['data'], columns=columns, copy=False)
+
+    def scan(self, scanner: str, scan_id: str):
+        """
+        Gets one scan as a zero-copy view into the archive table.
+
+        Args:
+            scanner (str): 'wire' or 'allison'.
+            scan_id (str): File stem, as used by ScannerIO.
+
+        Returns:
+            BeamWS or BeamAS: The scan.
+        """
+        index = self._load(scanner)['index']
+        matches = np.flatnonzero(index['scan_id'].to_numpy() == scan_id)
+        if len(matches) == 0:
+            raise KeyError(f"Scan '{scan_id}' not found in '{self._filename}:{scanner}'")
+        if len(matches) > 1:
+            raise ValueError(f"Scan id '{scan_id}' is ambiguous: {list(index['path'].iloc[matches])}")
+        return self._view(scanner, int(matches[0]))
+
+    def iter_scans(self, scanner: str):
+        """
+        Yields all scans of one scanner type as zero-copy views, in ingestion order.
+        """
+        for position in range(len(self._load(scanner)['index'])):
+            yield self._view(scanner, position)
+
+    def _view(self, scanner: str, position: int):
+        table = self._load(scanner)
+        columns, scan_class, _ = SCANNER_LAYOUTS[scanner]
+        entry = table['index'].iloc[position]
+        n_columns = int(entry['columns'])
+        data = table['data'][int(entry['start']):int(entry['stop']), :n_columns]
+        return scan_class(pd.DataFrame(data, columns=columns[:n_columns], copy=False),
+                          scan_id=entry['scan_id'])
+
+    def _load(self, scanner: str) -> dict:
+        if scanner in self._tables:
+            return self._tables[scanner]
+        if scanner not in SCANNER_LAYOUTS:
+            raise KeyError(f"Unknown scanner '{scanner}'")
+        if scanner not in self.scanners():
+            raise KeyError(f"No '{scanner}' scans in '{self._filename}'")
+        columns, _, _ = SCANNER_LAYOUTS[scanner]
+        with h5py.File(self._filename, 'r') as f:
+            g = f[scanner]
+            offsets = g['offsets'][()]
+            # Column-major, so every column and every row range of it is a contiguous-stride view
+            data = np.empty((int(offsets[-1]), len(columns)), order='F')
+            if data.shape[0]:
+                for i, col in enumerate(columns):
+                    g[col].read_direct(data[:, i])
+            index = pd.DataFrame({
+                'scan_id': [s.decode() for s in g['scan_id'][()]],
+                'path': [s.decode() for s in g['path'][()]],
+                'start': offsets[:-1],
+                'stop': offsets[1:],
+                'columns': g['columns'][()].astype(int)
+            })
+        self._tables[scanner] = {'data': data, 'index': index}
+        return self._tables[scanner]
+
+def _rglob(root, pattern):
+    return (path for path in Path(root).rglob(pattern) if path.is_file())
+
+def _extend(dataset, values):
+    values = list(values)
+    n = len(dataset)
+    dataset.resize((n + len(values),))
+    dataset[n:] = values
+
+def _parse_task(task):
+    filename, scanner = task
+    try:
+        data = read_columns(filename, skiprows=1)
+        kind = scanner or classify_scan(data)
+        if data.shape[1] not in SCANNER_LAYOUTS[kind][2]:
+            raise ValueError(f"{data.shape[1]} columns do not match a {kind} scan")
+        return kind, data
+    except Exception as e:
+        return None, e
@@ -5,18 +5,24 @@ from typing import Union
 from os.path import basename, splitext
 
 from synapticTrack.beam import Beam, BeamWS, BeamAS
+from synapticTrack.io.text_io import read_columns
 
 amu = physical_constants['atomic mass constant energy equivalent in MeV'][0]
 
+WIRE_SCANNER_COLUMNS = ["x_pos", "x_current", "y_pos", "y_current", "d_pos", "d_current"]
+ALLISON_SCANNER_COLUMNS = ["x", "xp", "x_current", "hv", "y_current"]
+
 class ScannerIO:
     @staticmethod
     def read_wire_scanner(filename: str) -> BeamWS:
-        cols = ["x_pos", "x_current", "y_pos", "y_current", "d_pos", "d_current"]
-        df = pd.read_csv(filename, sep=r'\s+', skiprows=1, names=cols, engine='python')
+        cols = WIRE_SCANNER_COLUMNS
+        data = read_columns(filename, skiprows=1)
+        df = pd.DataFrame(data, columns=cols[:data.shape[1]], copy=False)
         return BeamWS(df, scan_id=splitext(basename(filename))[0])
 
     @staticmethod
     def read_allison_scanner(filename: str) -> BeamAS:
-        cols = ["x", "xp", "x_current", "hv", "y_current"]
-        df = pd.read_csv(filename, sep=r'\s+', skiprows=1, names=cols, engine='python')
+        cols = ALLISON_SCANNER_COLUMNS
+        data = read_columns(filename, skiprows=1)
+        df = pd.DataFrame(data, columns=cols[:data.shape[1]], copy=False)
         return BeamAS(df, scan_id=splitext(basename(filename))[0])
@@ -0,0 +1,248 @@
+import os
+import json
+import time
+import hashlib
+import sqlite3
+
+BEAM_COLUMNS = ['x', 'xp', 'y', 'yp', 'dt', 'dW']
+TWISS_KEYS = ['emittance', 'alpha', 'beta', 'gamma']
+
+# Catalog columns besides the primary key: (name, SQL type)
+CATALOG_COLUMNS = (
+    [('path', 'TEXT NOT NULL'), ('group_name', "TEXT NOT NULL DEFAULT ''"),
+     ('code', 'TEXT'), ('fmt', 'TEXT'), ('label', 'TEXT'),
+     ('lattice', 'TEXT'), ('timestamp', 'REAL NOT NULL'),
+     ('species', 'TEXT'), ('mass_number', 'INTEGER'), ('charge_state', 'INTEGER'),
+     ('beam_current', 'REAL'), ('reference_energy', 'REAL'), ('macroparticles', 'INTEGER')]
+    + [(f'centroid_{col}', 'REAL') for col in BEAM_COLUMNS]
+    + [(f'sigma_{col}', 'REAL') for col in BEAM_COLUMNS]
+    + [(f'twiss_{plane}_{key}', 'REAL') for plane in 'xyz' for key in TWISS_KEYS]
+)
+CATALOG_INDEXES = ['path', 'lattice', 'timestamp', 'label', 'sigma_x', 'sigma_y']
+
+def lattice_fingerprint(lattice) -> str:
+    """
+    Returns a short SHA-1 fingerprint identifying a lattice.
+
+    Args:
+        lattice: A Lattice (list of elements), a path to a lattice file
+                 (sclinac.dat or lattice JSON), or a string used as-is.
+
+    Returns:
+        str: Hex fingerprint, or None if lattice is None.
+    """
+    if lattice is None:
+        return None
+    if isinstance(lattice, list):
+        payload = json.dumps([elem.to_dict() for elem in lattice], sort_keys=True).encode()
+    elif isinstance(lattice, (str, os.PathLike)) and os.path.isfile(lattice):
+        with open(lattice, 'rb') as f:
+            payload = f.read()
+    else:
+        return str(lattice)
+    return hashlib.sha1(payload).hexdigest()[:16]
+
+class CatalogEntry:
+    """One catalog row. Particle data is only read when open() is called."""
+
+    def __init__(self, row: sqlite3.Row):
+        self._row = row
+
+    def __getattr__(self, name):
+        try:
+            return self._row[name]
+        except IndexError:
+            raise AttributeError(name) from None
+
+    def __getitem__(self, name):
+        return self._row[name]
+
+    def __repr__(self):
+        return f"CatalogEntry(path={self.path!r}, group={self.group_name!r}, label={self.label!r})"
+
+    def keys(self):
+        return self._row.keys()
+
+    def as_dict(self) -> dict:
+        return {key: self._row[key] for key in self._row.keys()}
+
+    def open(self, **kwargs):
+        """
+        Loads the catalogued beam through BeamDataIOManager.
+
+        Returns:
+            Beam: The beam stored at this entry's path.
+        """
+        from synapticTrack.io.beam_data_io_manager import BeamDataIOManager
+
+        if self.fmt in BeamDataIOManager.storage_readers:
+            return BeamDataIOManager.load(self.path, fmt=self.fmt, group=self.group_name or None, **kwargs)
+        return BeamDataIOManager.read(self.code, self.path,
+                                      mass_number=self.mass_number, charge_state=self.charge_state,
+                                      beam_current=self.beam_current, reference_energy=self.reference_energy,
+                                      fmt=self.fmt)
+
+class BeamCatalog:
+    """
+    SQLite catalog of written beams.
+
+    Each row holds the beam parameters and summary statistics (centroid,
+    sigma, Twiss) of one beam file, keyed by file path, lattice fingerprint
+    and timestamp, so datasets can be selected without loading particles.
+    """
+    table = 'beams'
+
+    def __init__(self, filename: str):
+        self._filename = str(filename)
+        self._conn = sqlite3.connect(self._filename)
+        self._conn.row_factory = sqlite3.Row
+        self._create()
+
+    def _create(self):
+        columns = ', '.join(f'{name} {sql_type}' for name, sql_type in CATALOG_COLUMNS)
+        with self._conn:
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} "
+                f"(id INTEGER PRIMARY KEY, {columns}, UNIQUE(path, group_name))")
+            for name in CATALOG_INDEXES:
+                self._conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS idx_{self.table}_{name} ON {self.table} ({name})")
+
+    @property
+    def filename(self):
+        return self._filename
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    def add(self, filename: str, metadata: dict, code: str = None, fmt: str = None,
+            group: str = None, label: str = None, lattice=None, timestamp: float = None) -> int:
+        """
+        Inserts (or replaces) the catalog row of a beam file.
+
+        Args:
+            filename (str): Path of the beam file.
+            metadata (dict): Metadata as built by BeamDataIOManager.beam_metadata().
+            code (str, optional): Simulation code the file was written for.
+            fmt (str, optional): File or storage format.
+            group (str, optional): Group path inside a storage file.
+            label (str, optional): Free label, e.g. the scanner or location name.
+            lattice (optional): Lattice, lattice file or fingerprint string.
+            timestamp (float, optional): UNIX time. Defaults to now.
+
+        Returns:
+            int: Row id.
+        """
+        row = {
+            'path': os.path.abspath(filename),
+            'group_name': group or '',
+            'code': code,
+            'fmt': fmt,
+            'label': label,
+            'lattice': lattice_fingerprint(lattice),
+            'timestamp': time.time() if timestamp is None else timestamp,
+        }
+        for key in ['species', 'mass_number', 'charge_state', 'beam_current',
+                    'reference_energy', 'macroparticles']:
+            row[key] = metadata.get(key)
+        for col, value in metadata.get('beam_centroid', {}).items():
+            row[f'centroid_{col}'] = value
+        for col, value in metadata.get('beam_sigma', {}).items():
+            row[f'sigma_{col}'] = value
+        for plane in 'xyz':
+            for key, value in metadata.get(f'twiss_{plane}', {}).items():
+                row[f'twiss_{plane}_{key}'] = value
+
+        valid = set(self.columns())
+        names = [name for name in row if name in valid]
+        placeholders = ', '.join('?' for _ in names)
+        with self._conn:
+            cursor = self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} ({', '.join(names)}) VALUES ({placeholders})",
+                [row[name] for name in names])
+        return cursor.lastrowid
+
+    @staticmethod
+    def columns():
+        return [name for name, _ in CATALOG_COLUMNS]
+
+    def query(self, where: str = None, params=(), order_by: str = None, limit: int = None):
+        """
+        Runs a raw SQL filter over the catalog.
+
+        Args:
+            where (str, optional): SQL WHERE clause, e.g. "sigma_x < ? AND label = ?".
+            params (sequence, optional): Parameters bound to the clause.
+            order_by (str, optional): SQL ORDER BY clause.
+            limit (int, optional): Maximum number of rows.
+
+        Yields:
+            CatalogEntry: Matching rows, fetched as they are iterated.
+        """
+        sql = f"SELECT * FROM {self.table}"
+        if where:
+            sql += f" WHERE {where}"
+        if order_by:
+            sql += f" ORDER BY {order_by}"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        for row in self._conn.execute(sql, tuple(params)):
+            yield CatalogEntry(row)
+
+    def find(self, lattice=None, since: float = None, until: float = None,
+             order_by: str = 'timestamp', limit: int = None, **conditions):
+        """
+        Selects catalog rows by lattice, time window and column conditions.
+
+        Conditions are given per column: a value for equality, or a
+        (low, high) tuple for the range low <= value < high where either
+        bound may be None.
+        For example find(label='WS3', sigma_x=(None, 2.0)).
+
+        Yields:
+            CatalogEntry: Matching rows, fetched as they are iterated.
+        """
+        clauses, params = [], []
+        if lattice is not None:
+            clauses.append("lattice = ?")
+            params.append(lattice_fingerprint(lattice))
+        if since is not None:
+            clauses.append("timestamp >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("timestamp <= ?")
+            params.append(until)
+
+        valid = set(self.columns())
+        for name, value in conditions.items():
+            if name not in valid:
+                raise KeyError(f"Unknown catalog column '{name}'")
+            if isinstance(value, tuple):
+                low, high = value
+                if low is not None:
+                    clauses.append(f"{name} >= ?")
+                    params.append(low)
+                if high is not None:
+                    clauses.append(f"{name} < ?")
+                    params.append(high)
+            else:
+                clauses.append(f"{name} = ?")
+                params.append(value)
+
+        where = ' AND '.join(clauses) if clauses else None
+        return self.query(where, params, order_by=order_by, limit=limit)
+
+    def remove(self, filename: str, group: str = None):
+        """Deletes the catalog row of a beam file."""
+        with self._conn:
+            self._conn.execute(f"DELETE FROM {self.table} WHERE path = ? AND group_name = ?",
+                               (os.path.abspath(filename), group or ''))
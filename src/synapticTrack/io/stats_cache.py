@@ -0,0 +1,130 @@
+import os
+import json
+import time
+import hashlib
+import sqlite3
+
+def file_signature(filename: str, content_hash: bool = False) -> tuple:
+    """
+    Returns the cache key of a file's current contents.
+
+    Args:
+        filename (str): Path to the file.
+        content_hash (bool, optional): Also hash the file contents (BLAKE2b). Slower,
+            but catches rewrites that keep both size and modification time.
+
+    Returns:
+        tuple: (absolute path, mtime in ns, size in bytes, content digest or '')
+    """
+    st = os.stat(filename)
+    digest = ''
+    if content_hash:
+        h = hashlib.blake2b(digest_size=16)
+        with open(filename, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                h.update(block)
+        digest = h.hexdigest()
+    return os.path.abspath(filename), st.st_mtime_ns, st.st_size, digest
+
+class StatsCache:
+    """
+    Persistent LRU cache of derived beam statistics.
+
+    Entries are keyed by file path and validated against the file's
+    modification time and size (plus a content digest when content_hash is
+    set), so statistics of a file rewritten by TRACK are never served. The
+    least recently used entries are evicted beyond max_entries.
+    """
+    table = 'stats'
+
+    def __init__(self, filename: str, max_entries: int = 10000, content_hash: bool = False):
+        self._filename = str(filename)
+        self._max_entries = max_entries
+        self._content_hash = content_hash
+        self._conn = sqlite3.connect(self._filename)
+        with self._conn:
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} ("
+                "path TEXT PRIMARY KEY, mtime_ns INTEGER NOT NULL, size INTEGER NOT NULL, "
+                "digest TEXT NOT NULL, last_access REAL NOT NULL, payload TEXT NOT NULL)")
+            self._conn.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_{self.table}_last_access ON {self.table} (last_access)")
+
+    @property
+    def filename(self):
+        return self._filename
+
+    @property
+    def max_entries(self):
+        return self._max_entries
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    def signature(self, filename: str) -> tuple:
+        """Returns the signature entries of `filename` are validated against, see file_signature()."""
+        return file_signature(filename, self._content_hash)
+
+    def get(self, filename: str):
+        """
+        Returns the cached payload of a file, or None if missing or stale.
+        """
+        if not os.path.exists(filename):
+            return None
+        path, mtime_ns, size, digest = self.signature(filename)
+        row = self._conn.execute(
+            f"SELECT mtime_ns, size, digest, payload FROM {self.table} WHERE path = ?", (path,)).fetchone()
+        if row is None:
+            return None
+        if (row[0], row[1], row[2]) != (mtime_ns, size, digest):
+            self.invalidate(filename)
+            return None
+        with self._conn:
+            self._conn.execute(f"UPDATE {self.table} SET last_access = ? WHERE path = ?", (time.time(), path))
+        return json.loads(row[3])
+
+    def put(self, filename: str, payload: dict, signature: tuple = None) -> bool:
+        """
+        Stores the payload of a file under its signature and evicts the least
+        recently used entries beyond max_entries.
+
+        Args:
+            filename (str): Path to the file.
+            payload (dict): JSON-serializable payload.
+            signature (tuple, optional): Signature taken (see signature()) before the
+                payload was computed from the file. If the file has changed since,
+                the payload may describe the old contents and is not stored.
+
+        Returns:
+            bool: Whether the payload was stored.
+        """
+        current = self.signature(filename)
+        if signature is not None and tuple(signature) != current:
+            return False
+        path, mtime_ns, size, digest = current
+        with self._conn:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} VALUES (?, ?, ?, ?, ?, ?)",
+                (path, mtime_ns, size, digest, time.time(), json.dumps(payload)))
+            self._conn.execute(
+                f"DELETE FROM {self.table} WHERE path IN (SELECT path FROM {self.table} "
+                "ORDER BY last_access DESC LIMIT -1 OFFSET ?)", (self._max_entries,))
+        return True
+
+    def invalidate(self, filename: str):
+        """Drops the cached entry of a file."""
+        with self._conn:
+            self._conn.execute(f"DELETE FROM {self.table} WHERE path = ?", (os.path.abspath(filename),))
+
+    def clear(self):
+        with self._conn:
+            self._conn.execute(f"DELETE FROM {self.table}")
@@ -0,0 +1,82 @@
+from itertools import islice
+import numpy as np
+
+def read_columns(filename: str, skiprows: int = 1, usecols=None, dtype=np.float64) -> np.ndarray:
+    """
+    Reads a whitespace-delimited numeric text file into a 2-D array.
+
+    Shared fast path for TRACK coordinate dumps and scanner files. Uses the
+    C tokenizer of np.loadtxt, which splits on any run of spaces or tabs and
+    accepts Fortran-style exponents.
+
+    Args:
+        filename (str): Path to the text file.
+        skiprows (int, optional): Number of header lines to skip. Defaults to 1.
+        usecols (sequence of int, optional): Column indices to keep. Defaults to all.
+        dtype (optional): np.float64 or np.float32. Defaults to np.float64.
+
+    Returns:
+        np.ndarray: Array of shape (rows, columns).
+    """
+    # latin-1 maps every byte, so non-ASCII header lines never fail to decode
+    return np.loadtxt(filename, dtype=dtype, skiprows=skiprows, usecols=usecols,
+                      encoding='latin-1', ndmin=2)
+
+def iter_column_blocks(filename: str, chunk_size: int, skiprows: int = 1, usecols=None):
+    """
+    Reads a whitespace-delimited numeric text file in blocks of rows.
+
+    Only one block of lines is held in memory at a time; each block is
+    parsed with the same tokenizer as read_columns().
+
+    Args:
+        filename (str): Path to the text file.
+        chunk_size (int): Maximum number of rows per block.
+        skiprows (int, optional): Number of header lines to skip. Defaults to 1.
+        usecols (sequence of int, optional): Column indices to keep. Defaults to all.
+
+    Yields:
+        np.ndarray: Blocks of shape (rows, columns).
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+    with open(filename, 'r', encoding='latin-1') as f:
+        for _ in islice(f, skiprows):
+            pass
+        while True:
+            lines = list(islice(f, chunk_size))
+            if not lines:
+                break
+            block = np.loadtxt(lines, dtype=np.float64, usecols=usecols, ndmin=2)
+            if block.size:
+                yield block
+
+def write_columns(filename: str, data: np.ndarray, fmt, header: str = None, chunk_size: int = 100_000):
+    """
+    Writes a 2-D numeric array as space-delimited text.
+
+    Rows are formatted a block at a time with a single %-format call per
+    block, which produces the same text as np.savetxt or DataFrame.to_csv
+    with the same float format at a fraction of the cost.
+
+    Args:
+        filename (str): Output file path.
+        data (np.ndarray): Array of shape (rows, columns).
+        fmt (str or list of str): %-format per column, or one for all columns.
+        header (str, optional): Header line written first (without newline).
+        chunk_size (int, optional): Rows formatted per block. Defaults to 100,000.
+    """
+    data = np.asarray(data)
+    if data.ndim != 2:
+        raise ValueError("data must be a 2-D array")
+    if isinstance(fmt, str):
+        fmt = [fmt] * data.shape[1]
+    if len(fmt) != data.shape[1]:
+        raise ValueError(f"Expected {data.shape[1]} formats, got {len(fmt)}")
+    row = ' '.join(fmt) + '\n'
+    with open(filename, 'w') as f:
+        if header is not None:
+            f.write(header + '\n')
+        for start in range(0, data.shape[0], chunk_size):
+            block = data[start:start + chunk_size]
+            f.write((row * block.shape[0]) % tuple(block.ravel()))
@@ -2,43 +2,343 @@ import pandas as pd
 import numpy as np
 from scipy.constants import c, physical_constants
 from typing import Union
-from os.path import basename, splitext
+from os.path import basename, splitext, getsize
+import struct
 
-from synapticTrack.beam import Beam, BeamWS, BeamAS
+from synapticTrack.beam import Beam, BeamWS, BeamAS, MultiSpeciesBeam
+from synapticTrack.io.text_io import read_columns, write_columns
 
 amu = physical_constants['atomic mass constant energy equivalent in MeV'][0]
 
+# Default TRACK bunch frequency (freqb in track.dat) used to convert phase <-> dt
+TRACK_FREQUENCY = 40.625e6  # Hz
+
+# One Fortran unformatted particle record of scratch.#NN, as written by
+#   write(u) x, xp, y, yp, phase, beta, flag, qa
+# with x[cm], x'[rad], y[cm], y'[rad], phase[rad], beta as real(8), flag as integer(4)
+# and q/A as real(8), framed by gfortran's 4-byte little-endian record-length markers.
+# This layout is an assumption: it follows the particle variables of coord.out and
+# TRACK's documented phase-space units, not TRACK's source, and has not been checked
+# against a scratch file written by TRACK itself. tests/data/input_beam/make_scratch.f90
+# writes a file in this layout with gfortran, independently of write_scratch().
+SCRATCH_RECORD = np.dtype([
+    ('head', '<i4'),
+    ('x', '<f8'), ('xp', '<f8'), ('y', '<f8'), ('yp', '<f8'),
+    ('phase', '<f8'), ('beta', '<f8'),
+    ('flag', '<i4'), ('qa', '<f8'),
+    ('tail', '<i4')
+])
+SCRATCH_RECORD_LENGTH = SCRATCH_RECORD.itemsize - 8
+
+# Particle records decoded per block by read_scratch(), so conversion temporaries stay small
+SCRATCH_BLOCK_SIZE = 65536
+
+COORD_HEADER = (" Nseed      iq         dt[nsec]         dW[MeV/u]           x[cm]"
+                "           x'[mrad]            y[cm]           y'[mrad]")
+
 class TrackIO:
     @staticmethod
-    def read(filename: str, mass_number: int, charge_state: int, beam_current: float, reference_energy: float) -> Beam:
-        columns = ["Nseed", "iq", "dt", "dW", "x", "xp", "y", "yp"]
-        df = pd.read_csv(filename, sep=r'\s+', skiprows=1, names=columns, engine='python')
-        df['x'] *= 10  # cm to mm
-        df['y'] *= 10
-        df.drop('Nseed', axis=1, inplace=True)
-        df.drop('iq', axis=1, inplace=True)
-        return Beam(df, mass_number, charge_state, beam_current, reference_energy)
-
-    @staticmethod
-    def convert(particles: np.ndarray, mass_number: int, charge_state: int, beam_current: float, reference_energy: float) -> Beam:
-        Nseed, iq, dt, dW, x, xp, y, yp = particles.T
-        df = pd.DataFrame({
-            "x": x * 10,
-            "xp": xp,
-            "y": y * 10,
-            "yp": yp,
-            "dt": dt,
-            "dW": dW
-        })
-        return Beam(df, mass_number, charge_state, beam_current, reference_energy)
+    def read(filename: str, mass_number: int, charge_state: int, beam_current: float, reference_energy: float,
+             dtype=np.float64) -> Beam:
+        # Columns: Nseed, iq, dt, dW, x, xp, y, yp; read as Nseed, x, xp, y, yp, dt, dW in one pass
+        columns = read_columns(filename, skiprows=1, usecols=(0, 4, 5, 6, 7, 2, 3), dtype=dtype)
+        particles = columns[:, 1:]
+        particles[:, 0] *= 10  # cm to mm
+        particles[:, 2] *= 10
+        return Beam(particles, mass_number, charge_state, beam_current, reference_energy, dtype=dtype,
+                    ids=TrackIO._particle_ids(columns[:, 0]))
+
+    @staticmethod
+    def _particle_ids(first: np.ndarray):
+        """
+        Particle numbers from the first column of a coord.out, if it holds one distinct
+        number per particle (as written by TrackIO.write); None otherwise.
+
+        TRACK itself writes the random seed (usually all 0) there, and its
+        particles are then identified by their row index. Numbers beyond the
+        integers the column's float type holds exactly are not trusted.
+        """
+        exact = 2.0 ** (np.finfo(first.dtype).nmant + 1)
+        if len(first) and np.max(np.abs(first)) >= exact:
+            return None
+        if len(np.unique(first)) != len(first):
+            return None
+        return first.astype(np.int64)
+
+    @staticmethod
+    def read_multi_species(filename: str, mass_number, charge_states, beam_current, reference_energy: float) -> MultiSpeciesBeam:
+        """
+        Reads a TRACK coord.out of a multi-charge-state run in one pass.
+
+        The iq column is the 1-based index of each particle's charge state in
+        the charge-state list of the run (track.dat); particles are grouped
+        by it into one contiguous segment per species.
+
+        Args:
+            filename (str): Path to the coord.out file.
+            mass_number (int or sequence of int): Mass number, or one per charge state.
+            charge_states (sequence of int): Charge states in track.dat order.
+            beam_current (float or sequence of float): Current, or one per charge state.
+            reference_energy (float): Reference energy in MeV/u.
+
+        Returns:
+            MultiSpeciesBeam: Beam with one species per charge state.
+        """
+        # Columns: Nseed, iq, dt, dW, x, xp, y, yp; read as iq, x, xp, y, yp, dt, dW
+        particles = read_columns(filename, skiprows=1, usecols=(1, 4, 5, 6, 7, 2, 3))
+        labels = particles[:, 0].astype(np.int64) - 1
+        state = particles[:, 1:]
+        state[:, 0] *= 10  # cm to mm
+        state[:, 2] *= 10
+        return MultiSpeciesBeam.from_labels(state, labels, mass_number, charge_states,
+                                            reference_energy, beam_current)
+
+    @staticmethod
+    def read_lost_ids(filename: str, macroparticles: int = None) -> np.ndarray:
+        """
+        Reads the particle numbers of a TRACK lost.out file.
+
+        The file is read as a one-line header followed by one row per lost
+        particle whose first column is the particle number. The result can
+        be passed as Beam.where(exclude_ids=...) to mask the lost particles.
+
+        The numbers are matched against Beam.ids. A coord.out written by
+        TRACK carries no particle numbers (its first column is the seed), so
+        its Beam.ids are the row indices: this assumes that lost.out numbers
+        particles by their 0-based row in the coord.out of the same run.
+        Pass `macroparticles` to check that every number is a valid row.
+
+        Args:
+            filename (str): Path to the lost.out file.
+            macroparticles (int, optional): Number of particles of the matching beam;
+                                            numbers outside [0, macroparticles) raise ValueError.
+
+        Returns:
+            np.ndarray: Particle numbers of the lost particles.
+        """
+        ids = read_columns(filename, skiprows=1, usecols=(0,))[:, 0]
+        if np.any(ids != np.round(ids)):
+            raise ValueError(f"Particle numbers in '{filename}' are not integers")
+        ids = ids.astype(np.int64)
+        if macroparticles is not None:
+            outside = ids[(ids < 0) | (ids >= macroparticles)]
+            if len(outside):
+                raise ValueError(f"'{filename}' numbers particles outside [0, {macroparticles}), "
+                                 f"e.g. {outside[0]}; it does not match the beam")
+            if len(np.unique(ids)) != len(ids):
+                raise ValueError(f"'{filename}' lists a particle more than once")
+        return ids
+
+    @staticmethod
+    def convert(particles: np.ndarray, mass_number: int, charge_state: int, beam_current: float, reference_energy: float,
+                dtype=np.float64) -> Beam:
+        state = particles[:, [4, 5, 6, 7, 2, 3]]  # x, xp, y, yp, dt, dW
+        state[:, 0] *= 10  # cm to mm
+        state[:, 2] *= 10
+        return Beam(state, mass_number, charge_state, beam_current, reference_energy, dtype=dtype)
 
     @staticmethod
     def write(filename: str, beam: Beam):
-        df = beam.state.copy()
-        df['x'] /= 10
-        df['y'] /= 10
-        df.insert(0, 'iq', beam.charge_state)
-        df.insert(0, 'Nseed', np.arange(len(df)))
-        df[['Nseed', 'iq', 'dt', 'dW', 'x', 'xp', 'y', 'yp']].to_csv(
-            filename, sep=' ', header=False, index=False, float_format='%.6e')
+        # Same layout as TRACK's coord.out, header line included so read() gets every particle back;
+        # a single-species beam is charge state 1 of its run
+        TrackIO._write_coord(filename, beam.to_numpy(), beam.columns, beam.ids, 1)
+
+    @staticmethod
+    def write_multi_species(filename: str, beam: MultiSpeciesBeam):
+        """
+        Writes a multi-charge-state beam as a TRACK coord.out.
+
+        The iq column is the 1-based index of each particle's species in
+        storage order, as read_multi_species() expects; read the file back
+        with beam.charge_states as the charge-state list.
+
+        Args:
+            filename (str): Output coord.out path.
+            beam (MultiSpeciesBeam): Beam to write.
+        """
+        iq = np.repeat(np.arange(1, len(beam) + 1), beam.counts)
+        TrackIO._write_coord(filename, beam.data, beam.columns, np.arange(beam.macroparticles), iq)
+
+    @staticmethod
+    def _write_coord(filename: str, state: np.ndarray, columns, ids, iq):
+        index = {col: i for i, col in enumerate(columns)}
+        n = len(state)
+        particles = np.empty((n, 8), order='F')
+        particles[:, 0] = ids
+        particles[:, 1] = iq
+        particles[:, 2] = state[:, index['dt']]
+        particles[:, 3] = state[:, index['dW']]
+        np.divide(state[:, index['x']], 10, out=particles[:, 4])  # mm to cm
+        particles[:, 5] = state[:, index['xp']]
+        np.divide(state[:, index['y']], 10, out=particles[:, 6])
+        particles[:, 7] = state[:, index['yp']]
+        write_columns(filename, particles, ['%d', '%d'] + ['%.6e'] * 6, header=COORD_HEADER)
+
+    @staticmethod
+    def scratch_layout(filename: str):
+        """
+        Locates the particle block of a TRACK scratch.#NN file.
+
+        Walks the Fortran record markers of the header until the first
+        particle record and checks that the rest of the file is a whole
+        number of particle records.
+
+        Args:
+            filename (str): Path to the scratch file.
+
+        Returns:
+            tuple: (header bytes, offset of the particle block, number of particle records)
+        """
+        size = getsize(filename)
+        with open(filename, 'rb') as f:
+            offset = 0
+            while offset + 4 <= size:
+                f.seek(offset)
+                length = struct.unpack('<i', f.read(4))[0]
+                if length == SCRATCH_RECORD_LENGTH:
+                    break
+                if length < 0 or offset + length + 8 > size:
+                    raise ValueError(f"Corrupt Fortran record at byte {offset} in '{filename}'")
+                offset += length + 8
+            f.seek(0)
+            header = f.read(offset)
+
+        count, remainder = divmod(size - offset, SCRATCH_RECORD.itemsize)
+        if count == 0 or remainder:
+            raise ValueError(f"'{filename}' is not a TRACK scratch file")
+        return header, offset, count
+
+    @staticmethod
+    def map_scratch(filename: str) -> np.memmap:
+        """
+        Memory-maps the particle records of a TRACK scratch.#NN file without decoding them.
+
+        Fields are views into the file in TRACK's units (see SCRATCH_RECORD),
+        e.g. map_scratch(f)['x'][1:]; nothing is read until a field is used.
+        The first record is the reference particle.
+
+        Args:
+            filename (str): Path to the scratch file.
+
+        Returns:
+            np.memmap: Read-only structured array of SCRATCH_RECORD, one per particle record.
+        """
+        _, offset, count = TrackIO.scratch_layout(filename)
+        records = np.memmap(filename, dtype=SCRATCH_RECORD, mode='r', offset=offset, shape=(count,))
+        if np.any(records['head'] != SCRATCH_RECORD_LENGTH) or np.any(records['tail'] != SCRATCH_RECORD_LENGTH):
+            raise ValueError(f"Inconsistent particle record markers in '{filename}'")
+        return records
+
+    @staticmethod
+    def read_scratch(filename: str, mass_number: int, charge_state: int, beam_current: float,
+                     reference_energy: float, frequency: float = TRACK_FREQUENCY, dtype=np.float64) -> Beam:
+        """
+        Reads a TRACK binary scratch.#NN file without text parsing.
+
+        The particle records stay memory-mapped views (see map_scratch())
+        until the Beam is built: each block of records is converted to beam
+        units straight into the Beam's preallocated array, the only copy of
+        the particles. The first record is TRACK's reference particle: it
+        sets the reference for dW and is not part of the returned beam.
+
+        Args:
+            filename (str): Path to the scratch file.
+            mass_number (int): Mass number of the ion species.
+            charge_state (int): Charge state of the ion.
+            beam_current (float): Beam current.
+            reference_energy (float): Reference energy in MeV/u.
+            frequency (float, optional): Bunch frequency in Hz used to convert phase to dt.
+            dtype (optional): Storage type of the beam, np.float64 or np.float32.
+
+        Returns:
+            Beam: Beam with x, y in mm, xp, yp in mrad, dt in ns and dW in MeV/u.
+        """
+        records = TrackIO.map_scratch(filename)
+        gamma0 = 1 / np.sqrt(1 - float(records['beta'][0])**2)
+        particles = records[1:]
+        state = np.empty((len(particles), 6), dtype=dtype)
+        for start in range(0, len(particles), SCRATCH_BLOCK_SIZE):
+            block = particles[start:start + SCRATCH_BLOCK_SIZE]
+            out = state[start:start + len(block)]
+            np.multiply(block['x'], 10, out=out[:, 0])     # cm to mm
+            np.multiply(block['xp'], 1e3, out=out[:, 1])   # rad to mrad
+            np.multiply(block['y'], 10, out=out[:, 2])
+            np.multiply(block['yp'], 1e3, out=out[:, 3])
+            np.multiply(block['phase'], 1e9 / (2 * np.pi * frequency), out=out[:, 4])  # rad to ns
+
+            # Kinetic energy per nucleon from beta, relative to the reference particle.
+            # gamma - gamma0 cancels most digits, so it is always formed in float64.
+            dW = np.square(block['beta'])
+            np.subtract(1, dW, out=dW)
+            np.sqrt(dW, out=dW)
+            np.divide(1, dW, out=dW)
+            np.subtract(dW, gamma0, out=dW)
+            np.multiply(dW, amu, out=out[:, 5], casting='same_kind')
+
+        return Beam(state, mass_number, charge_state, beam_current, reference_energy, dtype=dtype)
+
+    @staticmethod
+    def write_scratch(filename: str, beam: Beam, template: str = None, frequency: float = TRACK_FREQUENCY):
+        """
+        Writes a beam as a TRACK binary scratch.#NN file, in the record layout of SCRATCH_RECORD.
+
+        The header records are copied from `template` (e.g. the scratch.#02
+        of the run) with the particle count updated. Without a template, a
+        minimal header with charge, mass and energy of the beam is written.
+
+        Args:
+            filename (str): Output scratch file path.
+            beam (Beam): Beam to write.
+            template (str, optional): Existing scratch file providing the header records.
+            frequency (float, optional): Bunch frequency in Hz used to convert dt to phase.
+        """
+        if template is not None:
+            header = bytearray(TrackIO.scratch_layout(template)[0])
+            # The first 4-byte record of the header holds the particle count
+            offset = 0
+            while offset < len(header):
+                length = struct.unpack_from('<i', header, offset)[0]
+                if length == 4:
+                    struct.pack_into('<i', header, offset + 4, beam.macroparticles)
+                    break
+                offset += length + 8
+        else:
+            header = TrackIO._scratch_header(beam)
+
+        gamma0 = 1 + beam.reference_energy / amu
+        records = np.zeros(beam.macroparticles + 1, dtype=SCRATCH_RECORD)
+        records['head'] = SCRATCH_RECORD_LENGTH
+        records['tail'] = SCRATCH_RECORD_LENGTH
+        records['qa'] = beam.charge_state / beam.mass_number
+        records['beta'][0] = np.sqrt(1 - 1 / gamma0**2)
+
+        particles = records[1:]
+        particles['x'] = beam.x / 10
+        particles['xp'] = beam.xp * 1e-3
+        particles['y'] = beam.y / 10
+        particles['yp'] = beam.yp * 1e-3
+        particles['phase'] = beam.dt * (2 * np.pi * frequency * 1e-9)
+        gamma = gamma0 + beam.dW / amu
+        particles['beta'] = np.sqrt(1 - 1 / gamma**2)
+
+        with open(filename, 'wb') as f:
+            f.write(header)
+            records.tofile(f)
+
+    @staticmethod
+    def _scratch_header(beam: Beam) -> bytes:
+        def record(payload):
+            return struct.pack('<i', len(payload)) + payload + struct.pack('<i', len(payload))
 
+        q = float(beam.charge_state)
+        a = float(beam.mass_number)
+        run = np.zeros(24)
+        run[:4] = [q, a, beam.reference_energy * 1e3, 1.0]  # Q, A, W [keV/u]
+        header = record(run.tobytes())
+        header += record(np.zeros(2).tobytes())
+        header += record(np.ones(6).tobytes())
+        header += record(struct.pack('<i', beam.macroparticles))
+        for value in (q, a, 0.0, 0.0, 0.0, q):
+            header += record(struct.pack('<d', value))
+        header += record(struct.pack('<i', 1))  # number of charge states
+        return header
@@ -1,2 +1,3 @@
 from .math_functions import *
 from .stats import *
+from .parallel import set_num_threads, get_num_threads
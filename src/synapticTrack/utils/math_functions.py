@@ -2,3 +2,11 @@ import numpy as np
 
 def gaussian(x, a, x0, sigma, offset):
     return a * np.exp(-(x - x0)**2 / (2 * sigma**2)) + offset
+
+def compute_mahalanobis_squared(x, xp, twiss_param):
+    emit = twiss_param['emittance']
+    alpha = twiss_param['alpha']
+    beta = twiss_param['beta']
+    gamma = twiss_param['gamma']
+
+    return (gamma * x**2 + 2 * alpha * x * xp + beta * xp**2) / emit
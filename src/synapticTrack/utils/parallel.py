@@ -0,0 +1,137 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from synapticTrack.utils.stats import Moments
+
+# Particles per chunk of a threaded reduction: a few MB of coordinates, so each chunk stays in cache
+REDUCTION_CHUNK_SIZE = 1 << 16
+
+_num_threads = None
+_executors = {}
+_executors_lock = threading.Lock()
+
+def set_num_threads(n: int = None):
+    """
+    Sets the number of threads used by chunked reductions.
+
+    Args:
+        n (int, optional): Worker threads; 1 reduces serially. Defaults to the
+                           SYNAPTICTRACK_NUM_THREADS environment variable, else the CPU count.
+    """
+    global _num_threads
+    if n is not None and n < 1:
+        raise ValueError("Number of threads must be at least 1")
+    _num_threads = n
+
+def get_num_threads() -> int:
+    """Gets the number of threads used by chunked reductions."""
+    if _num_threads is not None:
+        return _num_threads
+    return int(os.environ.get('SYNAPTICTRACK_NUM_THREADS', os.cpu_count() or 1))
+
+def chunk_bounds(n: int, chunk_size: int = None) -> list:
+    """Splits range(n) into (start, stop) chunks of at most `chunk_size`."""
+    chunk_size = chunk_size or REDUCTION_CHUNK_SIZE
+    return [(start, min(start + chunk_size, n)) for start in range(0, n, chunk_size)]
+
+def map_chunks(func, n: int, workers: int = None, chunk_size: int = None) -> list:
+    """
+    Applies func(start, stop) to the chunks of range(n), in a thread pool.
+
+    NumPy releases the GIL inside reductions and ufunc loops, so chunks of
+    one array are reduced on several cores. With one worker or one chunk,
+    func runs in the calling thread.
+
+    Args:
+        func (callable): func(start, stop) -> partial result.
+        n (int): Number of items.
+        workers (int, optional): Worker threads. Defaults to get_num_threads().
+        chunk_size (int, optional): Items per chunk. Defaults to REDUCTION_CHUNK_SIZE.
+
+    Returns:
+        list: Partial results in chunk order.
+    """
+    bounds = chunk_bounds(n, chunk_size)
+    workers = min(workers or get_num_threads(), len(bounds))
+    if workers <= 1:
+        return [func(start, stop) for start, stop in bounds]
+    return list(_pool(workers).map(lambda bound: func(*bound), bounds))
+
+def reduce_moments(values, weights=None, order: int = 2, workers: int = None, chunk_size: int = None) -> Moments:
+    """
+    Accumulates Moments of (n, k) values, or of a list of k 1-D columns, chunk by chunk in threads.
+
+    Columns given as a list are stacked per chunk, so no (n, k) copy is made.
+    """
+    columns = values if isinstance(values, (list, tuple)) else None
+    n = len(columns[0]) if columns is not None else len(values)
+    weights = None if weights is None else np.asarray(weights)
+
+    def partial(start, stop):
+        block = np.column_stack([col[start:stop] for col in columns]) if columns is not None else values[start:stop]
+        return Moments(order).update(block, None if weights is None else weights[start:stop])
+
+    moments = Moments(order)
+    for part in map_chunks(partial, n, workers, chunk_size):
+        moments.merge(part)
+    return moments
+
+def histogram(x, bins: int = 10, range=None, weights=None, density: bool = False,
+              workers: int = None, chunk_size: int = None):
+    """
+    Threaded np.histogram with fixed bins: chunk histograms are summed.
+
+    Returns:
+        tuple: (hist, bin_edges), as np.histogram.
+    """
+    x = np.asarray(x)
+    weights = None if weights is None else np.asarray(weights)
+    if range is None:
+        range = (np.min(x), np.max(x)) if len(x) else (0.0, 1.0)
+    edges = np.histogram_bin_edges(x[:0], bins=bins, range=range)
+
+    # Integer bins with a range keep np.histogram on its uniform-bin fast path
+    def partial(start, stop):
+        return np.histogram(x[start:stop], bins=bins, range=range,
+                            weights=None if weights is None else weights[start:stop])[0]
+
+    hist = sum(map_chunks(partial, len(x), workers, chunk_size), np.zeros(len(edges) - 1))
+    if density:
+        hist = hist / (hist.sum() * np.diff(edges))
+    return hist, edges
+
+def histogram2d(x, y, bins: int = 10, range=None, weights=None, density: bool = False,
+                workers: int = None, chunk_size: int = None):
+    """
+    Threaded np.histogram2d with fixed bins: chunk histograms are summed.
+
+    Returns:
+        tuple: (hist, xedges, yedges), as np.histogram2d.
+    """
+    x, y = np.asarray(x), np.asarray(y)
+    weights = None if weights is None else np.asarray(weights)
+    if range is None:
+        range = [(np.min(x), np.max(x)), (np.min(y), np.max(y))] if len(x) else [(0.0, 1.0)] * 2
+    xbins, ybins = (bins, bins) if np.ndim(bins) == 0 else bins
+    xedges = np.histogram_bin_edges(x[:0], bins=xbins, range=range[0])
+    yedges = np.histogram_bin_edges(y[:0], bins=ybins, range=range[1])
+
+    # As in histogram(): integer bins with a range, not edges, keep the uniform-bin fast path
+    def partial(start, stop):
+        return np.histogram2d(x[start:stop], y[start:stop], bins=(xbins, ybins), range=range,
+                              weights=None if weights is None else weights[start:stop])[0]
+
+    hist = sum(map_chunks(partial, len(x), workers, chunk_size), np.zeros((len(xedges) - 1, len(yedges) - 1)))
+    if density:
+        hist = hist / (hist.sum() * np.outer(np.diff(xedges), np.diff(yedges)))
+    return hist, xedges, yedges
+
+def _pool(workers: int) -> ThreadPoolExecutor:
+    # One long-lived pool per worker count, so repeated reductions do not respawn threads
+    with _executors_lock:
+        if workers not in _executors:
+            _executors[workers] = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='synapticTrack')
+        return _executors[workers]
@@ -1,48 +1,255 @@
 import numpy as np
+from scipy.special import comb
 
-def calc_mean_weighted(x, weights=None):
-    x = np.asarray(x)
+class Moments:
+    def __init__(self, order: int = 2):
+        """
+        One-pass, mergeable accumulator of weighted moments of several columns.
+
+        Tracks the weighted mean, the centered cross-product matrix (for the
+        covariance) and per-column central sums up to `order`. Each block of
+        samples is reduced around its own mean and folded in with the
+        pairwise update of Chan et al., extended to higher orders by Pébay,
+        so accumulators from chunks, threads or processes merge exactly and
+        no large sums of raw powers are formed.
+
+        Args:
+            order (int, optional): Highest central moment to track. Defaults to 2.
+        """
+        if order < 2:
+            raise ValueError("order must be at least 2")
+        self._order = order
+        self._count = 0
+        self._weight = 0.0
+        self._mean = None
+        self._m2 = None
+        self._central = {}
+
+    @property
+    def order(self):
+        return self._order
+
+    @property
+    def count(self):
+        """Gets the number of accumulated samples."""
+        return self._count
+
+    @property
+    def weight(self):
+        """Gets the sum of the weights (the count when unweighted)."""
+        return self._weight
+
+    @property
+    def dim(self):
+        """Gets the number of columns, or None before the first update."""
+        return None if self._mean is None else len(self._mean)
+
+    def update(self, values, weights=None) -> "Moments":
+        """
+        Adds a block of samples.
+
+        Args:
+            values (np.ndarray): (n,) samples of one column or (n, k) samples of k columns.
+            weights (np.ndarray, optional): (n,) sample weights, e.g. measured currents.
+
+        Returns:
+            Moments: self
+        """
+        values = np.asarray(values, dtype=np.float64)
+        if values.ndim == 1:
+            values = values[:, np.newaxis]
+        if values.ndim != 2:
+            raise ValueError("values must have shape (n,) or (n, k)")
+        if self._mean is not None and values.shape[1] != len(self._mean):
+            raise ValueError(f"values must have {len(self._mean)} columns")
+        n = values.shape[0]
+        if n == 0:
+            return self
+
+        if weights is None:
+            weight = float(n)
+            mean = values.mean(axis=0)
+            centered = values - mean
+            m2 = centered.T @ centered
+            central = {p: np.sum(centered**p, axis=0) for p in range(3, self._order + 1)}
+        else:
+            weights = np.asarray(weights, dtype=np.float64)
+            if weights.shape != (n,):
+                raise ValueError(f"weights must have shape ({n},)")
+            weight = float(weights.sum())
+            if weight == 0:
+                raise ValueError("Sum of weights must be nonzero")
+            mean = weights @ values / weight
+            centered = values - mean
+            m2 = (centered * weights[:, np.newaxis]).T @ centered
+            central = {p: weights @ centered**p for p in range(3, self._order + 1)}
+        self._combine(n, weight, mean, m2, central)
+        return self
+
+    def merge(self, other: "Moments") -> "Moments":
+        """
+        Merges another accumulator of the same columns and order into this one.
+
+        Returns:
+            Moments: self
+        """
+        if other.order != self._order:
+            raise ValueError("Cannot merge moments of different orders")
+        if other.count:
+            if self._mean is not None and other.dim != self.dim:
+                raise ValueError("Cannot merge moments over different columns")
+            self._combine(other._count, other._weight, other._mean, other._m2, other._central)
+        return self
+
+    def _combine(self, n, weight, mean, m2, central):
+        if self._count == 0:
+            self._count, self._weight = n, weight
+            self._mean, self._m2 = mean.copy(), m2.copy()
+            self._central = {p: value.copy() for p, value in central.items()}
+            return
+
+        weight_a, weight_b = self._weight, weight
+        total = weight_a + weight_b
+        delta = mean - self._mean
+        # Pébay's pairwise formula for the central sums, highest order first so lower orders are still unmerged
+        for p in range(self._order, 2, -1):
+            merged = self._central[p] + central[p]
+            for k in range(1, p - 1):
+                lower_a = self._m2.diagonal() if p - k == 2 else self._central[p - k]
+                lower_b = m2.diagonal() if p - k == 2 else central[p - k]
+                merged = merged + comb(p, k) * delta**k * (
+                    (-weight_b / total)**k * lower_a + (weight_a / total)**k * lower_b)
+            merged = merged + (weight_a * weight_b * delta / total)**p * (
+                1 / weight_b**(p - 1) - (-1 / weight_a)**(p - 1))
+            self._central[p] = merged
+        self._m2 = self._m2 + m2 + np.outer(delta, delta) * (weight_a * weight_b / total)
+        self._mean = self._mean + delta * (weight_b / total)
+        self._count += n
+        self._weight = total
+
+    def _check(self, ddof=0):
+        if self._count == 0 or self._weight - ddof <= 0:
+            raise ValueError("Not enough samples accumulated")
+
+    def mean(self) -> np.ndarray:
+        """Gets the weighted mean of each column."""
+        self._check()
+        return self._mean.copy()
+
+    def covariance(self, ddof: int = 0) -> np.ndarray:
+        """
+        Gets the weighted covariance matrix.
+
+        Args:
+            ddof (int, optional): Delta degrees of freedom; the centered sums are divided
+                                  by weight - ddof. Defaults to 0.
+        """
+        self._check(ddof)
+        return self._m2 / (self._weight - ddof)
+
+    def variance(self, ddof: int = 0) -> np.ndarray:
+        """Gets the weighted variance of each column."""
+        return self.covariance(ddof).diagonal().copy()
+
+    def correlation(self) -> np.ndarray:
+        """Gets the correlation matrix."""
+        self._check()
+        std = np.sqrt(self._m2.diagonal())
+        return self._m2 / np.outer(std, std)
+
+    def rms(self) -> np.ndarray:
+        """Gets the root mean square about zero of each column."""
+        return np.sqrt(self.variance() + self.mean()**2)
+
+    def central_moment(self, order: int) -> np.ndarray:
+        """
+        Gets the weighted central moment E[(x - mean)^order] of each column.
+
+        Args:
+            order (int): 1 up to the order of the accumulator.
+        """
+        if not 1 <= order <= self._order:
+            raise ValueError(f"order must lie in [1, {self._order}]")
+        self._check()
+        if order == 1:
+            return np.zeros_like(self._mean)
+        if order == 2:
+            return self.variance()
+        return self._central[order] / self._weight
+
+    def to_dict(self) -> dict:
+        """Serializable accumulator state."""
+        state = {
+            "order": self._order,
+            "count": int(self._count),
+            "weight": float(self._weight)
+        }
+        if self._count:
+            state["mean"] = self._mean.tolist()
+            state["m2"] = self._m2.tolist()
+            state["central"] = {str(p): value.tolist() for p, value in self._central.items()}
+        return state
+
+    @classmethod
+    def from_dict(cls, state: dict) -> "Moments":
+        """Restores an accumulator saved with to_dict()."""
+        moments = cls(int(state.get("order", 2)))
+        moments._count = int(state["count"])
+        moments._weight = float(state.get("weight", moments._count))
+        if moments._count:
+            moments._mean = np.asarray(state["mean"], dtype=np.float64)
+            moments._m2 = np.asarray(state["m2"], dtype=np.float64)
+            moments._central = {int(p): np.asarray(value, dtype=np.float64)
+                                for p, value in state.get("central", {}).items()}
+        return moments
+
+def _degenerate(x, weights) -> bool:
+    # No samples or weights summing to zero: Moments raises there, while the calc_* helpers
+    # keep their original plain-formula results (NaN or inf, with NumPy's RuntimeWarning)
+    return np.size(x) == 0 or (weights is not None and np.sum(weights) == 0)
+
+def _plain_mean(values, weights=None):
+    values = np.asarray(values)
     if weights is None:
-        return np.mean(x)
+        return np.mean(values)
     weights = np.asarray(weights)
-    return np.sum(weights * x) / np.sum(weights)
+    return np.sum(weights * values) / np.sum(weights)
+
+def calc_mean_weighted(x, weights=None):
+    if _degenerate(x, weights):
+        return _plain_mean(x, weights)
+    return Moments().update(x, weights).mean()[0]
 
 def calc_variance(x, weights=None):
-    x = np.asarray(x)
-    mean = calc_mean_weighted(x, weights)
-    if weights is None:
-        return np.mean((x - mean) ** 2)
-    return np.sum(weights * (x - mean) ** 2) / np.sum(weights)
+    if _degenerate(x, weights):
+        x = np.asarray(x)
+        return _plain_mean((x - _plain_mean(x, weights))**2, weights)
+    return Moments().update(x, weights).variance()[0]
 
 def calc_covariance(x, y, weights=None):
-    x = np.asarray(x)
-    y = np.asarray(y)
-    mean_x = calc_mean_weighted(x, weights)
-    mean_y = calc_mean_weighted(y, weights)
-    if weights is None:
-        return np.mean((x - mean_x) * (y - mean_y))
-    return np.sum(weights * (x - mean_x) * (y - mean_y)) / np.sum(weights)
+    if _degenerate(x, weights):
+        x, y = np.asarray(x), np.asarray(y)
+        return _plain_mean((x - _plain_mean(x, weights)) * (y - _plain_mean(y, weights)), weights)
+    return Moments().update(np.column_stack([x, y]), weights).covariance()[0, 1]
 
 def calc_correlation(x, y, weights=None):
-    cov = calc_covariance(x, y, weights)
-    std_x = np.sqrt(calc_variance(x, weights))
-    std_y = np.sqrt(calc_variance(y, weights))
-    return cov / (std_x * std_y)
+    if _degenerate(x, weights):
+        return calc_covariance(x, y, weights) / np.sqrt(calc_variance(x, weights) * calc_variance(y, weights))
+    return Moments().update(np.column_stack([x, y]), weights).correlation()[0, 1]
 
 def calc_rms(x, weights=None):
-    x = np.asarray(x)
-    if weights is None:
-        return np.sqrt(np.mean(x ** 2))
-    weights = np.asarray(weights)
-    return np.sqrt(np.sum(weights * x ** 2) / np.sum(weights))
+    if _degenerate(x, weights):
+        return np.sqrt(_plain_mean(np.square(x), weights))
+    return Moments().update(x, weights).rms()[0]
 
 def calc_moment(x, order=3, weights=None):
     """
     Compute central moment of given order.
-    """
-    x = np.asarray(x)
-    mean = calc_mean_weighted(x, weights)
-    if weights is None:
-        return np.mean((x - mean) ** order)
-    return np.sum(weights * (x - mean) ** order) / np.sum(weights)
 
+    Orders of at least 1 come from a Moments accumulator; order 0 (which is 1),
+    negative and fractional orders keep the plain formula E[(x - mean)^order].
+    """
+    if _degenerate(x, weights) or order < 1 or order != int(order):
+        x = np.asarray(x)
+        return _plain_mean((x - _plain_mean(x, weights))**order, weights)
+    return Moments(max(int(order), 2)).update(x, weights).central_moment(int(order))[0]
@@ -3,6 +3,8 @@ import matplotlib.pyplot as plt
 import matplotlib.gridspec as gridspec
 
 from synapticTrack.beam import Twiss
+from synapticTrack.utils.math_functions import compute_mahalanobis_squared
+from synapticTrack.utils.parallel import histogram, histogram2d, map_chunks
 
 def phasespace_plot(x, xp, x_center=None, y_center=None, xyrange=None, title=None, xlabel=None, ylabel=None, nbins=200, projection=1, ellipse=False, density=True, cmap='viridis', figname=None):
     """
@@ -52,9 +54,9 @@ def phasespace_plot(x, xp, x_center=None, y_center=None, xyrange=None, title=Non
 
     # Main plot
     if density:
-        h, xedges, yedges, im = ax_main.hist2d(x, xp, bins=nbins, cmap=cmap,
-                                              range=[[xmin, xmax], [ymin, ymax]],
-                                              density=True)  # Added density=True
+        # Histograms are binned in threads (see utils.parallel), then drawn
+        h, xedges, yedges = histogram2d(x, xp, bins=nbins, range=[[xmin, xmax], [ymin, ymax]], density=True)
+        im = ax_main.pcolormesh(xedges, yedges, h.T, cmap=cmap)
         fig.colorbar(im, cax=cax, label='Density') #Associate the colorbar to the hist2d
     else:
         ax_main.scatter(x, xp, s=3)
@@ -70,13 +72,13 @@ def phasespace_plot(x, xp, x_center=None, y_center=None, xyrange=None, title=Non
     ax_main.grid(True)
 
     # Top projection
-    ax_histx.hist(x, bins=nbins, histtype='step', color='orange')
+    ax_histx.stairs(*histogram(x, bins=nbins), color='orange')
     ax_histx.grid(True)
     ax_histx.set_yticks([])
     ax_histx.tick_params(labelbottom=False)    
 
     # Right projection
-    ax_histy.hist(xp, bins=nbins, range=(ymin, ymax), orientation='horizontal', histtype='step', color='orange')
+    ax_histy.stairs(*histogram(xp, bins=nbins, range=(ymin, ymax)), orientation='horizontal', color='orange')
     ax_histy.grid(True)
     ax_histy.set_xticks([])
     ax_histy.tick_params(labelleft=False)
@@ -96,18 +98,10 @@ def phasespace_plot(x, xp, x_center=None, y_center=None, xyrange=None, title=Non
     if figname:
         plt.savefig(figname, dpi=fig.dpi)
 
-def compute_mahalanobis_squared(x, xp, twiss_param):
-    emit = twiss_param['emittance']
-    alpha = twiss_param['alpha']
-    beta = twiss_param['beta']
-    gamma = twiss_param['gamma']
-
-    return (gamma * x**2 + 2 * alpha * x * xp + beta * xp**2) / emit
-
 def get_threshold(d_squared, percentile=0.9):
-    sorted_vals = np.sort(d_squared)
-    index = int(percentile * len(sorted_vals))
-    return sorted_vals[index]
+    # Partial selection of the one order statistic needed, O(N) instead of a full sort
+    index = min(int(percentile * len(d_squared)), len(d_squared) - 1)
+    return np.partition(d_squared, index)[index]
 
 def plot_percentile_ellipse(x, xp, ax=None, percentile=0.9, npts=200, color='oragne'):
     twiss_param = Twiss.compute_twiss(x, xp)
@@ -117,8 +111,10 @@ def plot_percentile_ellipse(x, xp, ax=None, percentile=0.9, npts=200, color='ora
     beta = twiss_param["beta"]
     gamma = twiss_param['gamma']
 
-    # Compute Mahalanobis distance for all particles
-    d2 = compute_mahalanobis_squared(x, xp, twiss_param)
+    # Compute Mahalanobis distance for all particles, chunk by chunk in threads
+    x, xp = np.asarray(x), np.asarray(xp)
+    d2 = np.concatenate(map_chunks(lambda start, stop: compute_mahalanobis_squared(
+        x[start:stop], xp[start:stop], twiss_param), len(x)))
     threshold = get_threshold(d2, percentile)
 
     # Scale emittance to match desired contour
@@ -0,0 +1,35 @@
+! Writes scratch_gfortran.#02 from the first particles of coord.out with
+! gfortran's unformatted sequential I/O, independently of TrackIO.write_scratch.
+! Rebuild with: gfortran make_scratch.f90 -o make_scratch && ./make_scratch
+program make_scratch
+  implicit none
+  integer, parameter :: n = 200
+  real(8), parameter :: amu = 931.49410372d0, w0 = 0.010d0, freq = 40.625d6
+  real(8), parameter :: pi = 3.141592653589793d0
+  integer :: i, seed, iq, flag
+  real(8) :: dt, dw, x, xp, y, yp, gamma, beta, qa
+  real(8) :: run(24)
+
+  open(11, file='coord.out', status='old')
+  read(11, *)
+  open(10, file='scratch_gfortran.#02', form='unformatted', access='sequential', status='replace')
+
+  ! Header: run parameters (Q, A, W [keV/u]), particle count, number of charge states
+  run = 0d0
+  run(1:4) = (/ 8d0, 40d0, w0 * 1d3, 1d0 /)
+  write(10) run
+  write(10) n
+  write(10) 1
+
+  ! Reference particle first, then n particles: x[cm], x'[rad], y[cm], y'[rad], phase[rad], beta, flag, q/A
+  qa = 8d0 / 40d0
+  flag = 0
+  do i = 0, n
+     read(11, *) seed, iq, dt, dw, x, xp, y, yp
+     gamma = 1d0 + (w0 + dw) / amu
+     beta = sqrt(1d0 - 1d0 / gamma**2)
+     write(10) x, xp * 1d-3, y, yp * 1d-3, dt * 2d0 * pi * freq * 1d-9, beta, flag, qa
+  end do
+  close(10)
+  close(11)
+end program make_scratch
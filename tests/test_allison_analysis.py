@@ -0,0 +1,88 @@
+# tests/test_allison_analysis.py
+import warnings
+import numpy as np
+import pandas as pd
+import pytest
+from pathlib import Path
+from synapticTrack.analysis import (analyze_allison_scanner_grid, emittance_threshold_curve,
+                                    estimate_noise_floor, subtract_background)
+from synapticTrack.beam import BeamAS
+from synapticTrack.io import BeamDataIOManager
+from synapticTrack.utils import Moments
+
+ALLISON_DIR = Path(__file__).parent / "data" / "scanner" / "3_exp_Allison"
+
+@pytest.fixture
+def gridded_scan():
+    """A tilted Gaussian on a 41 x 31 grid with offsets, noise, shuffled rows and zero padding."""
+    rng = np.random.default_rng(3)
+    x_axis = np.linspace(-20, 20, 41)
+    xp_axis = np.linspace(-15, 15, 31)
+    x, xp = np.meshgrid(x_axis, xp_axis, indexing='ij')
+    current = 1e-7 * np.exp(-(x**2 / 25 - x * xp / 20 + xp**2 / 9) / 2)
+    offsets = np.linspace(-2e-10, 2e-10, len(x_axis))
+    current = current + offsets[:, None] + rng.normal(0, 1e-11, x.shape)
+    data = pd.DataFrame({"x": x.ravel(), "xp": xp.ravel(), "x_current": current.ravel()})
+    data = data.sample(frac=1, random_state=1)
+    padding = pd.DataFrame(0.0, index=range(200), columns=data.columns)
+    return BeamAS(pd.concat([data, padding], ignore_index=True)), x_axis, xp_axis, current
+
+def test_to_grid_recovers_grid(gridded_scan):
+    beamas, x_axis, xp_axis, current = gridded_scan
+    x, xp, grid = beamas.to_grid()
+    np.testing.assert_allclose(x, x_axis)
+    np.testing.assert_allclose(xp, xp_axis)
+    np.testing.assert_allclose(grid, current)
+
+def test_to_grid_rejects_scatter():
+    rng = np.random.default_rng(0)
+    beamas = BeamAS(pd.DataFrame({"x": rng.normal(size=100), "xp": rng.normal(size=100),
+                                  "x_current": rng.random(100)}))
+    with pytest.raises(ValueError):
+        beamas.to_grid()
+
+def test_noise_floor_and_background(gridded_scan):
+    beamas, x_axis, _, current = gridded_scan
+    _, _, grid = beamas.to_grid()
+    background, noise = estimate_noise_floor(grid)
+    np.testing.assert_allclose(background, np.linspace(-2e-10, 2e-10, len(x_axis)), atol=3e-11)
+    assert noise == pytest.approx(1e-11, rel=0.3)
+    signal, _, _ = subtract_background(grid, n_sigma=3)
+    assert np.all(signal >= 0)
+    assert signal.max() == pytest.approx(current.max(), rel=0.01)
+
+def test_threshold_curve_matches_direct_moments(gridded_scan):
+    beamas, *_ = gridded_scan
+    x, xp, grid = beamas.to_grid()
+    signal, _, _ = subtract_background(grid)
+    u, up = np.meshgrid(x, xp, indexing='ij')
+    thresholds = np.array([0.0, 1e-9, 1e-8, 5e-8, 1.0])
+    curve = emittance_threshold_curve(x, xp, signal, thresholds)
+
+    for t, row in zip(thresholds[:-1], curve.itertuples()):
+        keep = signal >= max(t, np.finfo(float).tiny)
+        moments = Moments().update(np.column_stack([u[keep], up[keep]]), signal[keep])
+        sigma = moments.covariance()
+        assert row.pixels == keep.sum()
+        assert row.x_center == pytest.approx(moments.mean()[0], abs=1e-9)
+        assert row.emittance_rms == pytest.approx(np.sqrt(np.linalg.det(sigma)), rel=1e-9)
+    assert curve["pixels"].iloc[-1] == 0 and np.isnan(curve["emittance_rms"].iloc[-1])
+
+    full = emittance_threshold_curve(x, xp, signal)
+    assert full["threshold"].is_monotonic_decreasing
+    assert full["current_fraction"].iloc[-1] == pytest.approx(1.0)
+    assert full["emittance_rms"].iloc[-1] == pytest.approx(curve["emittance_rms"].iloc[0])
+
+@pytest.mark.parametrize("allison_scanner_filename", ["101614_X.txt", "102829_Y.txt"])
+def test_allison_grid_analysis(allison_scanner_filename):
+    beamas = BeamDataIOManager.read_scanner(scanner="allison", filename=ALLISON_DIR / allison_scanner_filename)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        results = analyze_allison_scanner_grid(beamas, plot=False)
+
+    assert results["grid_shape"] == (61, 61)
+    curve = results["emittance_threshold"]
+    assert results["emittance_rms"] == pytest.approx(curve["emittance_rms"].iloc[-1])
+    # Raising the threshold cuts the halo first: the emittance falls with the included current
+    emittances = curve["emittance_rms"].dropna().to_numpy()
+    assert emittances[-1] > emittances[len(emittances) // 2] > emittances[len(emittances) // 10]
@@ -0,0 +1,78 @@
+# tests/test_batch_analysis.py
+import shutil
+import warnings
+import pandas as pd
+import pytest
+from pathlib import Path
+from typer.testing import CliRunner
+from synapticTrack.analysis import (analyze_scan_files, analyze_wire_scanner, find_scan_files,
+                                    write_results_table)
+from synapticTrack.cli import app
+from synapticTrack.io import BeamDataIOManager
+
+SCANNER_DIR = Path(__file__).parent / "data" / "scanner"
+
+@pytest.fixture
+def scan_dir(tmp_path):
+    """Wire scans in nested directories, plus one unreadable file."""
+    for i, path in enumerate(sorted((SCANNER_DIR / "2_exp_LEBT_WS").glob("*.txt"))):
+        target = tmp_path / f"day{i % 2}" / path.name
+        target.parent.mkdir(exist_ok=True)
+        shutil.copy(path, target)
+    (tmp_path / "day0" / "broken.txt").write_text("# header\nnot a scan\n")
+    return tmp_path
+
+def test_find_scan_files(scan_dir):
+    files = find_scan_files(str(scan_dir))
+    assert len(files) == 5 and files == sorted(files)
+    assert find_scan_files(str(scan_dir / "day1" / "*.txt")) == [f for f in files if "day1" in f]
+    assert find_scan_files("single.txt") == ["single.txt"]
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_analyze_scan_files(scan_dir, workers):
+    files = find_scan_files(str(scan_dir))
+    calls = []
+    table = analyze_scan_files("wire", files, workers=workers, progress=lambda done, total: calls.append((done, total)))
+
+    assert list(table["file"]) == files
+    assert calls[-1] == (5, 5)
+    broken = table.set_index("scan_id").loc["broken"]
+    assert broken["status"] == "error" and broken["error"]
+    assert (table["status"] == "ok").sum() == 4
+
+    row = table.set_index("scan_id").loc["LEBT-WS002-100523"]
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        expected = analyze_wire_scanner(BeamDataIOManager.read_scanner("wire", row["file"]), plot=False)
+    assert row["gaussian_fit_x_center"] == pytest.approx(expected["gaussian_fit_x_center"])
+
+@pytest.mark.parametrize("suffix", [".csv", ".jsonl"])
+def test_write_results_table(tmp_path, suffix):
+    table = pd.DataFrame({"scan_id": ["a", "b"], "status": ["ok", "error"], "x_center": [1.0, None]})
+    filename = tmp_path / f"results{suffix}"
+    write_results_table(table, filename)
+    loaded = pd.read_csv(filename) if suffix == ".csv" else pd.read_json(filename, lines=True)
+    assert list(loaded["scan_id"]) == ["a", "b"]
+    with pytest.raises(ValueError):
+        write_results_table(table, tmp_path / "results.xlsx")
+
+def test_cli_batch_analyze(scan_dir, tmp_path):
+    output = tmp_path / "results.csv"
+    result = CliRunner().invoke(app, ["analyze", "wire", str(scan_dir), "--output", str(output), "--workers", "1"])
+    assert result.exit_code == 0
+    assert "Analyzed 5 scans (1 failed)" in result.output
+    table = pd.read_csv(output)
+    assert len(table) == 5 and set(table["status"]) == {"ok", "error"}
+
+@pytest.mark.parametrize("output", ["results.xlsx", "results.parquet"])
+def test_cli_rejects_output_before_analyzing(scan_dir, tmp_path, output, monkeypatch):
+    import synapticTrack.cli as cli
+    from synapticTrack.analysis import batch_analysis
+    if output.endswith(".parquet"):
+        # Simulate an environment without a Parquet engine
+        monkeypatch.setattr(batch_analysis, "PARQUET_ENGINES", ("no_such_parquet_engine",))
+    called = []
+    monkeypatch.setattr(cli, "analyze_scan_files", lambda *args, **kwargs: called.append(args))
+    result = CliRunner().invoke(app, ["analyze", "wire", str(scan_dir), "--output", str(tmp_path / output)])
+    assert result.exit_code == 1
+    assert not called
@@ -1,7 +1,8 @@
 #tests/test_beam.py
 import pytest
-from synapticTrack.beam import Twiss
-from synapticTrack.io import BeamDataIOManager
+import numpy as np
+from synapticTrack.beam import Beam, Twiss
+from synapticTrack.io import BeamDataIOManager, TrackIO
 from pathlib import Path
 
 TEST_DIR = Path(__file__).parent
@@ -57,3 +58,180 @@ def test_all_normalized_emittances(example_beam):
         assert isinstance(norm_emits[plane], float)
         assert norm_emits[plane] > 0
 
+
+@pytest.mark.parametrize("order", ['C', 'F'])
+def test_array_backed_beam_views(order):
+    rng = np.random.default_rng(0)
+    particles = np.array(rng.normal(size=(1000, 6)), order=order)
+    beam = Beam(particles, mass_number=40, charge_state=8, beam_current=0.0, reference_energy=0.010)
+    assert beam.data.base is particles and not beam.data.flags.writeable
+    assert beam.columns == ['x', 'xp', 'y', 'yp', 'dt', 'dW']
+    assert np.shares_memory(beam.xp, particles)
+    assert np.shares_memory(beam.state['dW'].to_numpy(), particles)
+    np.testing.assert_array_equal(beam.dt, particles[:, 4])
+    np.testing.assert_allclose(beam.rms_size.to_numpy(), particles.std(axis=0, ddof=1))
+
+def test_beam_from_dataframe(example_beam):
+    df = example_beam.state[['dW', 'x', 'xp', 'y', 'yp', 'dt']]
+    beam = Beam(df, mass_number=40, charge_state=8, beam_current=0.0, reference_energy=0.010, order='F')
+    assert beam.data.flags.f_contiguous
+    np.testing.assert_array_equal(beam.x, example_beam.x)
+    np.testing.assert_allclose(beam.centroid, example_beam.centroid)
+    with pytest.raises(ValueError):
+        Beam(np.ones((10, 2)), 40, 8, 0.0, 0.010).centroid
+
+def test_cached_moments_drive_twiss(example_beam):
+    stats = example_beam.statistics()
+    assert example_beam.statistics() is stats
+    np.testing.assert_allclose(example_beam.centroid, example_beam.state.mean())
+    np.testing.assert_allclose(example_beam.rms_size, example_beam.state.std())
+
+    twiss = Twiss(example_beam)
+    for u, up, plane in [('x', 'xp', twiss.horizontal), ('dt', 'dW', twiss.longitudinal)]:
+        expected = Twiss.compute_twiss(example_beam.column(u), example_beam.column(up))
+        for key in ['emittance', 'alpha', 'beta', 'gamma']:
+            assert plane[key] == pytest.approx(expected[key], rel=1e-10)
+    np.testing.assert_allclose(twiss.coupling['xy'], np.cov(example_beam.state[['x', 'xp', 'y', 'yp']].T, ddof=0)[0:2, 2:4])
+
+def test_cache_refreshes_after_mutation(example_beam):
+    before = example_beam.centroid['x']
+    twiss_before = Twiss(example_beam).horizontal['beta']
+    with pytest.raises(ValueError):
+        example_beam.x[:] += 1.0
+    with pytest.raises(ValueError):
+        example_beam.data[0, 0] = 0.0
+    assert example_beam.centroid['x'] == before
+
+    example_beam.set_column('x', example_beam.x + 1.0)
+    assert example_beam.centroid['x'] == pytest.approx(before + 1.0)
+    with example_beam.edit() as data:
+        data[:, 0] *= 2.0
+    assert example_beam.centroid['x'] == pytest.approx(2 * (before + 1.0))
+    assert example_beam.rms_size['x'] == pytest.approx(example_beam.state['x'].std())
+    assert Twiss(example_beam).horizontal['beta'] != pytest.approx(twiss_before)
+
+def test_state_cannot_bypass_cache(example_beam):
+    particles = example_beam.to_numpy().copy()
+    before = example_beam.centroid['x']
+    with pytest.raises((ValueError, TypeError)):
+        example_beam.state.iloc[0, 0] = 1e3
+    with pytest.raises((ValueError, TypeError)):
+        example_beam.state.loc[:, 'x'] = 1e3
+    np.testing.assert_array_equal(example_beam.to_numpy(), particles)
+    assert example_beam.centroid['x'] == before
+
+def test_float32_beam_accumulates_in_float64(example_beam):
+    beam32 = example_beam.astype(np.float32)
+    assert beam32.dtype == np.float32 and example_beam.dtype == np.float64
+    np.testing.assert_allclose(Twiss(beam32).horizontal['emittance'],
+                               Twiss(example_beam).horizontal['emittance'], rtol=1e-5)
+
+def test_selection_shares_parent_array(example_beam):
+    mask = example_beam.x > 0
+    selection = example_beam.select(mask)
+    assert selection.parent is example_beam
+    assert selection.macroparticles == mask.sum()
+    assert np.shares_memory(selection._data, example_beam.data)
+    np.testing.assert_allclose(selection.centroid.to_numpy(), example_beam.data[mask].mean(axis=0))
+    np.testing.assert_allclose(selection.covariance(), np.cov(example_beam.data[mask], rowvar=False, ddof=0))
+
+def test_chained_cuts_compose(example_beam):
+    selection = example_beam.where(x=(0, None)).where(aperture=5.0, dW=(None, 0.0))
+    mask = (example_beam.x >= 0) & (example_beam.x**2 + example_beam.y**2 < 25) & (example_beam.dW < 0)
+    assert selection.parent is example_beam
+    np.testing.assert_array_equal(selection.indices, np.flatnonzero(mask))
+    np.testing.assert_allclose(selection.rms_size.to_numpy(), example_beam.data[mask].std(axis=0, ddof=1))
+
+def test_exclude_lost_ids(example_beam, tmp_path):
+    lost = tmp_path / "lost.out"
+    lost.write_text(" Nseed  iq  x  y\n3 1 0.1 0.2\n10 1 0.3 0.4\n")
+    ids = TrackIO.read_lost_ids(lost)
+    survivors = example_beam.where(exclude_ids=ids)
+    assert survivors.macroparticles == example_beam.macroparticles - 2
+    assert not np.isin([3, 10], survivors.ids).any()
+    beam = survivors.to_beam()
+    np.testing.assert_array_equal(beam.ids, survivors.ids)
+    np.testing.assert_array_equal(beam.data, np.delete(example_beam.data, [3, 10], axis=0))
+
+def test_core_halo_split(example_beam):
+    core = example_beam.where(core=('x', 4.0))
+    halo = example_beam.where(halo=('x', 4.0))
+    assert core.macroparticles + halo.macroparticles == example_beam.macroparticles
+    assert not np.isin(core.indices, halo.indices).any()
+    assert Twiss(core).horizontal['emittance'] < Twiss(example_beam).horizontal['emittance']
+
+def drift_matrix(length):
+    """Drift of `length` mm: x += L x', y += L y' (x' in mrad gives 1e-3 mm per mm)."""
+    matrix = np.eye(6)
+    matrix[0, 1] = matrix[2, 3] = length * 1e-3
+    return matrix
+
+def test_apply_map_in_place_updates_moments(example_beam):
+    before = example_beam.data.copy()
+    sigma = example_beam.covariance()
+    R = drift_matrix(100.0)
+    example_beam.apply_map(R)
+    np.testing.assert_allclose(example_beam.data, before @ R.T)
+    np.testing.assert_allclose(example_beam.covariance(), R @ sigma @ R.T, rtol=1e-10, atol=1e-14)
+    np.testing.assert_allclose(example_beam.covariance(), np.cov(example_beam.data, rowvar=False, ddof=0),
+                               rtol=1e-8, atol=1e-12)
+
+def test_apply_map_stack_scale_and_out(example_beam):
+    out = np.empty_like(example_beam.data)
+    before = example_beam.data.copy()
+    # Two 50 mm drifts written in metres and radians
+    R = drift_matrix(50.0)
+    R[0, 1] = R[2, 3] = 0.05
+    mapped = example_beam.apply_map(np.stack([R, R]), scale=[1e-3] * 4 + [1, 1], out=out)
+    np.testing.assert_array_equal(example_beam.data, before)
+    assert np.shares_memory(mapped.data, out)
+    np.testing.assert_allclose(mapped.data, before @ drift_matrix(100.0).T)
+
+def test_apply_map_on_selection_writes_parent(example_beam):
+    selection = example_beam.where(x=(0, None))
+    example_beam.statistics()
+    offset = np.array([1.0, 0, 0, 0, 0, 0])
+    selection.apply_map(np.eye(6), offset)
+    assert example_beam._statistics is None
+    assert (example_beam.x[selection.indices] >= 1.0).all()
+
+def test_selection_follows_parent_changes(example_beam):
+    selection = example_beam.where(x=(0, None))
+    sibling = example_beam.where(x=(None, 0))
+    before = selection.centroid['x']
+    sibling.centroid
+
+    example_beam.apply_map(np.eye(6), offset=[5.0, 0, 0, 0, 0, 0])
+    assert selection.centroid['x'] == pytest.approx(before + 5.0)
+    assert selection.centroid['x'] == pytest.approx(example_beam.x[selection.indices].mean())
+
+    # Mapping one selection changes the parent rows, so its sibling's cache is refreshed too
+    selection.apply_map(np.eye(6), offset=[1.0, 0, 0, 0, 0, 0])
+    np.testing.assert_allclose(sibling.mean(), example_beam.data[sibling.indices].mean(axis=0))
+    assert selection.centroid['x'] == pytest.approx(example_beam.x[selection.indices].mean())
+
+def test_selection_writes_go_through_parent(example_beam):
+    selection = example_beam.where(x=(0, None))
+    with pytest.raises(ValueError):
+        selection.x[:] += 100.0
+    selection.set_column('x', selection.x + 100.0)
+    assert (example_beam.x[selection.indices] >= 100.0).all()
+    assert selection.centroid['x'] == pytest.approx(example_beam.x[selection.indices].mean())
+    assert example_beam.centroid['x'] == pytest.approx(example_beam.state['x'].mean())
+
+def test_batched_twiss_matches_per_plane(example_beam):
+    twiss = Twiss(example_beam).values()
+    u = np.stack([example_beam.x, example_beam.y, example_beam.dt])
+    up = np.stack([example_beam.xp, example_beam.yp, example_beam.dW])
+    batch = Twiss.compute_twiss_batch(u, up)
+    for plane, name in enumerate(["twiss_x", "twiss_y", "twiss_z"]):
+        for key, value in twiss[name].items():
+            assert batch[key][plane] == pytest.approx(value)
+
+def test_batched_twiss_masks_non_physical(example_beam):
+    sigma = np.stack([example_beam.covariance(), np.zeros((6, 6))])
+    batch = Twiss.from_covariance_batch(sigma)
+    assert batch["twiss_x"]["emittance"][0] == pytest.approx(Twiss(example_beam).horizontal['emittance'])
+    assert np.isnan(batch["twiss_x"]["emittance"][1]) and np.isnan(batch["twiss_z"]["beta"][1])
+    normalized = Twiss.normalize_emittance(batch["twiss_y"]["emittance"], 0.010)
+    assert normalized[0] == pytest.approx(Twiss(example_beam).normalized_emittance('y'))
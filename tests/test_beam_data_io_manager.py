@@ -1,5 +1,10 @@
 import json
+from pathlib import Path
+
+import h5py
+import numpy as np
 import pytest
+from synapticTrack.io import TrackIO
 from synapticTrack.io.beam_data_io_manager import BeamDataIOManager
 
 def _simple_reader(filename, mass_number, charge_state, beam_current, reference_energy):
@@ -10,32 +15,92 @@ def test_read_without_json(tmp_path, monkeypatch):
     data_file = tmp_path / "beam.dat"
     data_file.write_text("dummy data")
     # register a simple reader for test code
-    BeamDataIOManager.code_readers = {"track": _simple_reader}
+    monkeypatch.setattr(BeamDataIOManager, "code_readers", {"track": _simple_reader})
     res = BeamDataIOManager.read("track", str(data_file),
                                  mass_number=1, charge_state=2,
                                  beam_current=0.5, reference_energy=3.0)
     assert res == (str(data_file), 1, 2, 0.5, 3.0)
 
-def test_read_with_json_overrides(tmp_path):
+def test_read_with_json_overrides(tmp_path, monkeypatch):
     data_file = tmp_path / "beam.dat"
     data_file.write_text("dummy data")
     json_file = tmp_path / "beam.json"
     metadata = {"mass_number": "7", "beam_current": 1.23}
     json_file.write_text(json.dumps(metadata))
-    BeamDataIOManager.code_readers = {"track": _simple_reader}
+    monkeypatch.setattr(BeamDataIOManager, "code_readers", {"track": _simple_reader})
     res = BeamDataIOManager.read("track", str(data_file),
                                  mass_number=1, charge_state=2,
                                  beam_current=0.5, reference_energy=3.0)
     # mass_number overridden -> int(7), beam_current overridden -> float(1.23)
     assert res == (str(data_file), 7, 2, 1.23, 3.0)
 
-def test_read_with_bad_types_in_json_raises(tmp_path):
+def test_read_with_bad_types_in_json_raises(tmp_path, monkeypatch):
     data_file = tmp_path / "beam.dat"
     data_file.write_text("dummy data")
     json_file = tmp_path / "beam.json"
     # invalid mass_number that cannot be converted to int
     metadata = {"mass_number": "not-an-int"}
     json_file.write_text(json.dumps(metadata))
-    BeamDataIOManager.code_readers = {"track": _simple_reader}
+    monkeypatch.setattr(BeamDataIOManager, "code_readers", {"track": _simple_reader})
     with pytest.raises(ValueError):
         BeamDataIOManager.read("track", str(data_file))
+
+def _failing_reader(filename, mass_number, charge_state, beam_current, reference_energy):
+    if "bad" in str(filename):
+        raise ValueError("corrupt file")
+    return _simple_reader(filename, mass_number, charge_state, beam_current, reference_energy)
+
+def test_read_many_keeps_order_and_sidecars(tmp_path, monkeypatch):
+    files = []
+    for i in range(5):
+        data_file = tmp_path / f"beam{i}.dat"
+        data_file.write_text("dummy data")
+        files.append(str(data_file))
+    (tmp_path / "beam3.json").write_text(json.dumps({"mass_number": 7}))
+    monkeypatch.setattr(BeamDataIOManager, "code_readers", {"track": _simple_reader})
+    res = BeamDataIOManager.read_many("track", files, workers=1,
+                                      mass_number=1, charge_state=2,
+                                      beam_current=0.5, reference_energy=3.0)
+    assert [r[0] for r in res] == files
+    assert [r[1] for r in res] == [1, 1, 1, 7, 1]
+
+def test_read_many_errors_per_file(tmp_path, monkeypatch):
+    files = [str(tmp_path / name) for name in ["a.dat", "bad.dat", "c.dat"]]
+    monkeypatch.setattr(BeamDataIOManager, "code_readers", {"track": _failing_reader})
+    params = dict(mass_number=1, charge_state=2, beam_current=0.5, reference_energy=3.0)
+    res = BeamDataIOManager.read_many("track", files, workers=1, errors='return', **params)
+    assert isinstance(res[1], ValueError)
+    assert res[0][0] == files[0] and res[2][0] == files[2]
+    with pytest.raises(RuntimeError, match="bad.dat"):
+        BeamDataIOManager.read_many("track", files, workers=1, **params)
+
+@pytest.mark.parametrize("code, fmt", [('track', None), ('track', 'scratch'), ('jutrack', None),
+                                       ('jutrack', 'binary'), ('opal', None), ('opal', 'h5part'),
+                                       ('flame', None)])
+def test_read_float32_for_every_code(tmp_path, code, fmt):
+    params = dict(mass_number=40, charge_state=8, beam_current=0.0, reference_energy=0.010)
+    coord = Path(__file__).parent / "data" / "input_beam" / "coord.out"
+    track_beam = BeamDataIOManager.read('track', str(coord), **params)
+    filename = tmp_path / "beam.dat"
+    if code == 'track':
+        BeamDataIOManager.write('track', str(filename), track_beam, fmt=fmt)
+    elif code == 'jutrack':
+        BeamDataIOManager.write('jutrack', str(filename), track_beam, fmt=fmt)
+    elif fmt == 'h5part':
+        filename = tmp_path / "beam.h5"
+        with h5py.File(filename, 'w') as f:
+            g = f.create_group('Step#0')
+            g.attrs['RefPartP'] = np.array([0.0, 0.0, 0.02])
+            rng = np.random.default_rng(0)
+            for name in ['x', 'y', 'z', 'px', 'py']:
+                g[name] = rng.normal(scale=1e-3, size=100)
+            g['pz'] = 0.02 * (1 + rng.normal(scale=1e-3, size=100))
+    else:
+        # OPAL and FLAME text dumps share the coord.out columns, without the header
+        TrackIO.write(str(filename), track_beam)
+        np.savetxt(filename, np.loadtxt(filename, skiprows=1))
+
+    beam64 = BeamDataIOManager.read(code, str(filename), **params, fmt=fmt)
+    beam32 = BeamDataIOManager.read(code, str(filename), **params, fmt=fmt, dtype=np.float32)
+    assert beam32.dtype == np.float32
+    np.testing.assert_allclose(beam32.to_numpy(), beam64.to_numpy(), rtol=1e-6, atol=1e-12)
@@ -0,0 +1,54 @@
+# tests/test_beam_ensemble.py
+import numpy as np
+import pytest
+from pathlib import Path
+from synapticTrack.beam import Beam, BeamEnsemble, Twiss
+from synapticTrack.io import BeamDataIOManager, NPYIO, TrackIO
+
+DATA_DIR = Path(__file__).parent / "data" / "input_beam"
+BEAM_PARAMS = dict(mass_number=40, charge_state=8, beam_current=0.0, reference_energy=0.010)
+
+@pytest.fixture
+def ensemble():
+    rng = np.random.default_rng(seed=7)
+    scales = np.array([1.0, 2.0, 0.5, 1.5, 0.1, 0.01])
+    data = rng.normal(size=(5, 2000, 6)) * scales * np.linspace(1, 2, 5)[:, None, None]
+    return BeamEnsemble(data, 40, 8, 0.0, 0.010)
+
+def test_batched_moments_match_per_run(ensemble):
+    cov = ensemble.covariance()
+    assert cov.shape == (5, 6, 6)
+    for run, beam in enumerate(ensemble):
+        np.testing.assert_allclose(ensemble.centroid()[run], beam.mean())
+        np.testing.assert_allclose(cov[run], beam.covariance())
+        np.testing.assert_allclose(ensemble.rms_size()[run], beam.rms_size.to_numpy())
+
+def test_batched_twiss_matches_twiss_objects(ensemble):
+    twiss = ensemble.twiss()
+    for run, beam in enumerate(ensemble):
+        reference = Twiss(beam).values()
+        for plane in ("twiss_x", "twiss_y", "twiss_z"):
+            for key, value in reference[plane].items():
+                assert twiss[plane][key][run] == pytest.approx(value)
+
+def test_float32_ensemble_accumulates_in_float64(ensemble):
+    ensemble32 = BeamEnsemble(ensemble.data.astype(np.float32), 40, 8, 0.0, 0.010)
+    np.testing.assert_allclose(ensemble32.covariance(), ensemble.covariance(), rtol=1e-5, atol=1e-9)
+
+def test_memory_mapped_round_trip(ensemble, tmp_path):
+    filename = tmp_path / "ensemble.npy"
+    NPYIO.write_ensemble(filename, ensemble)
+    loaded = NPYIO.read_ensemble(filename)
+    assert isinstance(loaded.data, np.memmap)
+    assert loaded.columns == ensemble.columns and loaded.mass_number == 40
+    np.testing.assert_allclose(loaded.covariance(), ensemble.covariance())
+
+def test_read_ensemble_from_files(tmp_path):
+    files = [str(DATA_DIR / "coord.out")] * 3
+    in_memory = BeamDataIOManager.read_ensemble('track', files, workers=1, **BEAM_PARAMS)
+    on_disk = BeamDataIOManager.read_ensemble('track', files, filename=tmp_path / "runs.npy",
+                                              batch_size=2, workers=1, **BEAM_PARAMS)
+    assert in_memory.data.shape == on_disk.data.shape == (3, 10001, 6)
+    np.testing.assert_array_equal(on_disk.data, in_memory.data)
+    beam = TrackIO.read(str(DATA_DIR / "coord.out"), **BEAM_PARAMS)
+    np.testing.assert_allclose(on_disk.covariance()[2], beam.covariance())
@@ -0,0 +1,46 @@
+# tests/test_beam_statistics.py
+import numpy as np
+import pandas as pd
+import pytest
+from pathlib import Path
+from synapticTrack.beam import Beam, Twiss, BeamStatistics
+from synapticTrack.io import BeamDataIOManager
+
+DATA_DIR = Path(__file__).parent / "data" / "input_beam"
+BEAM_PARAMS = dict(mass_number=40, charge_state=8, beam_current=0.0, reference_energy=0.010)
+
+@pytest.fixture
+def track_beam():
+    return BeamDataIOManager.read('track', str(DATA_DIR / "coord.out"), **BEAM_PARAMS)
+
+def test_iter_chunks_covers_file(track_beam):
+    chunks = list(BeamDataIOManager.iter_chunks('track', str(DATA_DIR / "coord.out"), 3000, **BEAM_PARAMS))
+    assert [chunk.macroparticles for chunk in chunks] == [3000, 3000, 3000, 1001]
+    stacked = pd.concat([chunk.state for chunk in chunks], ignore_index=True)
+    np.testing.assert_allclose(stacked['x'], track_beam.x)
+    np.testing.assert_allclose(stacked['dW'], track_beam.dW)
+
+def test_streaming_statistics_match_full_beam(track_beam):
+    stats = BeamDataIOManager.read_statistics('track', str(DATA_DIR / "coord.out"), 777, **BEAM_PARAMS)
+    assert stats.count == track_beam.macroparticles
+    cols = ['x', 'xp', 'y', 'yp', 'dt', 'dW']
+    np.testing.assert_allclose(stats.centroid[cols], track_beam.centroid[cols], rtol=1e-10, atol=1e-15)
+    np.testing.assert_allclose(stats.rms_size[cols], track_beam.rms_size[cols], rtol=1e-10)
+    np.testing.assert_allclose(stats.covariance(ddof=1), track_beam.state[cols].cov().values, rtol=1e-8, atol=1e-18)
+
+    twiss = Twiss(track_beam).values()
+    for plane, params in stats.twiss().items():
+        for key, value in params.items():
+            assert value == pytest.approx(twiss[plane][key], rel=1e-8)
+
+def test_merge_equals_single_pass(example_beam_data):
+    full = BeamStatistics().update(example_beam_data)
+    left = BeamStatistics().update(example_beam_data[:1234])
+    right = BeamStatistics().update(example_beam_data[1234:])
+    merged = left.merge(right)
+    np.testing.assert_allclose(merged.mean(), full.mean(), atol=1e-14)
+    np.testing.assert_allclose(merged.covariance(), full.covariance(), rtol=1e-12)
+
+def test_update_rejects_wrong_shape():
+    with pytest.raises(ValueError):
+        BeamStatistics().update(np.zeros((10, 4)))
@@ -0,0 +1,66 @@
+# tests/test_hdf5_io.py
+import numpy as np
+import pytest
+from pathlib import Path
+from synapticTrack.io import BeamDataIOManager, HDF5IO
+
+DATA_DIR = Path(__file__).parent / "data" / "input_beam"
+
+@pytest.fixture
+def track_beam():
+    return BeamDataIOManager.read('track', str(DATA_DIR / "coord.out"),
+                                  mass_number=40, charge_state=8,
+                                  beam_current=0.0, reference_energy=0.010)
+
+def test_hdf5_round_trip(track_beam, tmp_path):
+    filename = tmp_path / "beams.h5"
+    BeamDataIOManager.save(str(filename), track_beam, group="run_001/WS3", chunk_size=1000)
+    beam = BeamDataIOManager.load(str(filename), group="run_001/WS3")
+    assert beam.mass_number == 40
+    assert beam.charge_state == 8
+    assert beam.species == track_beam.species
+    for col in ['x', 'xp', 'y', 'yp', 'dt', 'dW']:
+        np.testing.assert_array_equal(beam.state[col].values, track_beam.state[col].values)
+
+def test_hdf5_metadata_attributes(track_beam, tmp_path):
+    filename = tmp_path / "beams.h5"
+    BeamDataIOManager.save(str(filename), track_beam, group="run_001/WS3")
+    metadata = HDF5IO.read_metadata(str(filename), "run_001/WS3")
+    assert metadata["macroparticles"] == track_beam.macroparticles
+    assert metadata["beam_centroid"]["x"] == pytest.approx(track_beam.centroid["x"])
+    assert set(metadata["twiss_x"]) == {"emittance", "alpha", "beta", "gamma"}
+
+def test_hdf5_column_and_slice_selection(track_beam, tmp_path):
+    filename = tmp_path / "beams.h5"
+    BeamDataIOManager.save(str(filename), track_beam, group="ws3")
+    beam = BeamDataIOManager.load(str(filename), group="ws3", columns=['x', 'y'], start=100, stop=600)
+    assert list(beam.state.columns) == ['x', 'y']
+    assert beam.macroparticles == 500
+    np.testing.assert_array_equal(beam.x, track_beam.x[100:600])
+    with pytest.raises(KeyError):
+        HDF5IO.read_columns(str(filename), "ws3", columns=['z'])
+
+def test_hdf5_many_beams_in_one_file(track_beam, tmp_path):
+    filename = tmp_path / "scans.h5"
+    for name in ["run_001/WS1", "run_001/WS2", "run_002/WS1"]:
+        HDF5IO.write(str(filename), track_beam, group=name)
+    assert sorted(HDF5IO.groups(str(filename))) == ["run_001/WS1", "run_001/WS2", "run_002/WS1"]
+    with pytest.raises(ValueError):
+        HDF5IO.write(str(filename), track_beam, group="run_001/WS1", overwrite=False)
+
+@pytest.mark.parametrize("fmt", ['hdf5', 'npy'])
+def test_float32_storage(track_beam, tmp_path, fmt):
+    filename = tmp_path / f"beam.{fmt}"
+    BeamDataIOManager.save(str(filename), track_beam, fmt=fmt, dtype=np.float32)
+    beam = BeamDataIOManager.load(str(filename), fmt=fmt)
+    assert beam.dtype == np.float32
+    np.testing.assert_allclose(beam.data, track_beam.data, rtol=1e-6)
+    assert BeamDataIOManager.load(str(filename), fmt=fmt, dtype=np.float64).dtype == np.float64
+
+def test_npy_column_and_slice_selection(track_beam, tmp_path):
+    filename = tmp_path / "beam.npy"
+    BeamDataIOManager.save(str(filename), track_beam, fmt='npy')
+    beam = BeamDataIOManager.load(str(filename), fmt='npy', columns=['dW', 'x'], start=10, stop=20)
+    assert beam.columns == ['dW', 'x']
+    np.testing.assert_array_equal(beam.x, track_beam.x[10:20])
+    assert beam.charge_state == 8
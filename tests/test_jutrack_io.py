@@ -0,0 +1,45 @@
+# tests/test_jutrack_io.py
+import numpy as np
+import pytest
+from pathlib import Path
+from synapticTrack.io import BeamDataIOManager, JuTrackIO, TrackIO
+
+DATA_DIR = Path(__file__).parent / "data" / "input_beam"
+BEAM_PARAMS = dict(mass_number=40, charge_state=8, beam_current=0.0, reference_energy=0.010)
+COLUMNS = ['x', 'xp', 'y', 'yp', 'dt', 'dW']
+
+@pytest.fixture
+def track_beam():
+    return BeamDataIOManager.read('track', str(DATA_DIR / "coord.out"), **BEAM_PARAMS)
+
+def test_jutrack_array_matches_reference_conversion(track_beam):
+    reference = JuTrackIO.convert_to_jutrack_coordinates(track_beam).values
+    out = np.empty((track_beam.macroparticles, 6))
+    work = np.empty(track_beam.macroparticles)
+    result = JuTrackIO.to_jutrack_array(track_beam, out=out, work=work)
+    assert result is out
+    np.testing.assert_allclose(result[:, :5], reference[:, :5], rtol=1e-10, atol=1e-15)
+    np.testing.assert_allclose(result[:, 5], reference[:, 5], rtol=1e-3, atol=1e-12)
+
+@pytest.mark.parametrize("fmt", [None, 'binary'])
+def test_jutrack_round_trip(track_beam, tmp_path, fmt):
+    filename = tmp_path / ("jubeam.bin" if fmt else "jubeam.dat")
+    BeamDataIOManager.write('jutrack', str(filename), track_beam, fmt=fmt)
+    beam = BeamDataIOManager.read('jutrack', str(filename), fmt=fmt)
+    for col in COLUMNS:
+        np.testing.assert_allclose(beam.state[col], track_beam.state[col], rtol=1e-6, atol=1e-12)
+
+def test_binary_layout_is_column_major(track_beam, tmp_path):
+    filename = tmp_path / "jubeam.bin"
+    JuTrackIO.write_binary(str(filename), track_beam)
+    raw = np.fromfile(filename, dtype='<f8')
+    assert raw.size == 6 * track_beam.macroparticles
+    np.testing.assert_allclose(raw[:track_beam.macroparticles], track_beam.x * 1e-3)
+
+def test_track_write_round_trip(track_beam, tmp_path):
+    filename = tmp_path / "coord.out"
+    TrackIO.write(str(filename), track_beam)
+    beam = TrackIO.read(str(filename), **BEAM_PARAMS)
+    assert beam.macroparticles == track_beam.macroparticles
+    for col in COLUMNS:
+        np.testing.assert_allclose(beam.state[col], track_beam.state[col], rtol=1e-5, atol=1e-12)
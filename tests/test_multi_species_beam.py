@@ -0,0 +1,104 @@
+# tests/test_multi_species_beam.py
+import numpy as np
+import pytest
+from pathlib import Path
+from synapticTrack.beam import Beam, MultiSpeciesBeam
+from synapticTrack.io import BeamDataIOManager, TrackIO
+
+DATA_DIR = Path(__file__).parent / "data" / "input_beam"
+
+@pytest.fixture
+def multi_beam(example_beam_data):
+    labels = np.arange(len(example_beam_data)) % 3
+    return MultiSpeciesBeam.from_labels(example_beam_data, labels, 40, [8, 9, 10],
+                                        reference_energy=0.010, beam_currents=[1.0, 2.0, 3.0])
+
+def test_segments_and_species_table(multi_beam, example_beam_data):
+    assert len(multi_beam) == 3
+    assert list(multi_beam.counts) == [3334, 3333, 3333]
+    table = multi_beam.species_table
+    assert list(table['species']) == ['Ar8+', 'Ar9+', 'Ar10+']
+    # Bρ scales as A/Q at fixed energy per nucleon
+    assert table['brho'][0] / table['brho'][2] == pytest.approx(10 / 8)
+
+    beam = multi_beam.beam('Ar9+')
+    assert beam.charge_state == 9 and beam.beam_current == 2.0
+    assert np.shares_memory(beam.data, multi_beam.data)
+    np.testing.assert_array_equal(beam.data, example_beam_data[1::3])
+
+def test_statistics_per_species_and_combined(multi_beam, example_beam_data):
+    centroids = multi_beam.centroids()
+    assert list(centroids.index) == ['Ar8+', 'Ar9+', 'Ar10+', 'all']
+    np.testing.assert_allclose(centroids.loc['Ar10+'], example_beam_data[2::3].mean(axis=0))
+    np.testing.assert_allclose(centroids.loc['all'], example_beam_data.mean(axis=0))
+    np.testing.assert_allclose(multi_beam.rms_sizes().loc['all'], example_beam_data.std(axis=0, ddof=1))
+    assert multi_beam.beam(0).statistics() is multi_beam.statistics()[0]
+
+def test_from_beams_and_hdf5_round_trip(multi_beam, tmp_path):
+    rebuilt = MultiSpeciesBeam.from_beams(list(multi_beam))
+    np.testing.assert_array_equal(rebuilt.data, multi_beam.data)
+
+    filename = tmp_path / "beams.h5"
+    BeamDataIOManager.save(str(filename), multi_beam, group='lebt')
+    loaded = BeamDataIOManager.load(str(filename), group='lebt')
+    assert isinstance(loaded, MultiSpeciesBeam)
+    assert list(loaded.charge_states) == [8, 9, 10]
+    np.testing.assert_array_equal(loaded.beam_currents, [1.0, 2.0, 3.0])
+    np.testing.assert_array_equal(loaded.data, multi_beam.data)
+
+def test_track_multi_species_reader():
+    beam = BeamDataIOManager.read_multi_species('track', str(DATA_DIR / "coord.out"), 40, [8],
+                                                beam_current=0.0, reference_energy=0.010)
+    single = BeamDataIOManager.read('track', str(DATA_DIR / "coord.out"), 40, 8, 0.0, 0.010)
+    np.testing.assert_array_equal(beam.beam('Ar8+').data, single.data)
+
+def test_track_write_read_round_trip(tmp_path):
+    single = BeamDataIOManager.read('track', str(DATA_DIR / "coord.out"), 40, 8, 0.0, 0.010)
+    filename = tmp_path / "coord.out"
+    TrackIO.write(str(filename), single)
+    beam = BeamDataIOManager.read_multi_species('track', str(filename), 40, [8],
+                                                beam_current=0.0, reference_energy=0.010)
+    np.testing.assert_allclose(beam.beam('Ar8+').data, single.data, rtol=1e-5, atol=1e-12)
+
+def test_track_multi_species_round_trip(multi_beam, tmp_path):
+    filename = tmp_path / "coord.out"
+    BeamDataIOManager.write('track', str(filename), multi_beam)
+    loaded = BeamDataIOManager.read_multi_species('track', str(filename), 40, multi_beam.charge_states,
+                                                  beam_current=multi_beam.beam_currents, reference_energy=0.010)
+    np.testing.assert_array_equal(loaded.counts, multi_beam.counts)
+    np.testing.assert_allclose(loaded.data, multi_beam.data, rtol=1e-5, atol=1e-12)
+
+def test_species_beams_follow_changes(multi_beam):
+    shared = multi_beam.statistics()[1]
+    species = multi_beam.beam('Ar9+')
+    before = species.centroid['x']
+    assert species.statistics() is shared
+    with pytest.raises(ValueError):
+        multi_beam.data[0, 0] = 0.0
+
+    multi_beam.set_column('x', multi_beam.data[:, 0] + 1.0)
+    assert species.centroid['x'] == pytest.approx(before + 1.0)
+    species.set_column('x', species.x + 1.0)
+    assert multi_beam.centroids().loc['Ar9+', 'x'] == pytest.approx(before + 2.0)
+    assert multi_beam.beam('Ar9+').centroid['x'] == pytest.approx(before + 2.0)
+    species.apply_map(np.eye(6), offset=[1.0, 0, 0, 0, 0, 0])
+    assert multi_beam.centroids().loc['Ar9+', 'x'] == pytest.approx(before + 3.0)
+
+def test_empty_species_gives_nan(example_beam_data):
+    beam = MultiSpeciesBeam(example_beam_data, 40, [8, 9, 10], [5000, 0, 5000], reference_energy=0.010)
+    assert np.isnan(beam.twiss()['Ar9+']['twiss_x']['emittance'])
+    assert np.isfinite(beam.twiss()['all']['twiss_x']['emittance'])
+    assert beam.centroids().loc['Ar9+'].isna().all()
+    assert beam.rms_sizes().loc['Ar9+'].isna().all()
+    np.testing.assert_allclose(beam.centroids().loc['Ar10+'], example_beam_data[5000:].mean(axis=0))
+
+def test_npy_round_trip(multi_beam, tmp_path):
+    filename = str(tmp_path / "beams.npy")
+    BeamDataIOManager.save(filename, multi_beam, fmt='npy')
+    loaded = BeamDataIOManager.load(filename, fmt='npy')
+    assert isinstance(loaded, MultiSpeciesBeam)
+    assert list(loaded.species_names) == ['Ar8+', 'Ar9+', 'Ar10+']
+    np.testing.assert_array_equal(loaded.beam_currents, [1.0, 2.0, 3.0])
+    np.testing.assert_array_equal(loaded.data, multi_beam.data)
+    with pytest.raises(ValueError):
+        BeamDataIOManager.load(filename, fmt='npy', start=10)
@@ -0,0 +1,83 @@
+# tests/test_opal_io.py
+import h5py
+import numpy as np
+import pytest
+from scipy.constants import c, physical_constants
+from synapticTrack.io import BeamDataIOManager, OPALIO
+
+amu = physical_constants['atomic mass constant energy equivalent in MeV'][0]
+BEAM_PARAMS = dict(mass_number=40, charge_state=8, beam_current=0.0)
+N_PARTICLES = 1000
+P0 = 0.02  # reference beta*gamma
+
+@pytest.fixture
+def h5part_file(tmp_path):
+    filename = tmp_path / "run.h5"
+    rng = np.random.default_rng(0)
+    with h5py.File(filename, 'w') as f:
+        for step in (0, 5, 10):
+            g = f.create_group(f'Step#{step}')
+            g.attrs['SPOS'] = 0.1 * step
+            g.attrs['RefPartR'] = np.array([0.0, 0.0, 0.1 * step])
+            g.attrs['RefPartP'] = np.array([0.0, 0.0, P0])
+            g['x'] = rng.normal(scale=1e-3, size=N_PARTICLES) + step
+            g['y'] = rng.normal(scale=1e-3, size=N_PARTICLES)
+            g['z'] = 0.1 * step + rng.normal(scale=1e-3, size=N_PARTICLES)
+            g['px'] = rng.normal(scale=1e-5, size=N_PARTICLES)
+            g['py'] = rng.normal(scale=1e-5, size=N_PARTICLES)
+            g['pz'] = P0 * (1 + rng.normal(scale=1e-3, size=N_PARTICLES))
+    return str(filename)
+
+def test_steps_and_attributes(h5part_file):
+    assert OPALIO.steps(h5part_file) == [0, 5, 10]
+    assert OPALIO.step_attributes(h5part_file, 5)['SPOS'] == pytest.approx(0.5)
+    assert OPALIO.step_attributes(h5part_file)['SPOS'] == pytest.approx(1.0)
+    with pytest.raises(KeyError):
+        OPALIO.step_attributes(h5part_file, 3)
+
+def test_read_h5part_converts_coordinates(h5part_file):
+    beam = OPALIO.read_h5part(h5part_file, **BEAM_PARAMS, step=5)
+    with h5py.File(h5part_file, 'r') as f:
+        g = f['Step#5']
+        x, z, px, py, pz = (g[key][()] for key in ('x', 'z', 'px', 'py', 'pz'))
+    gamma0 = np.sqrt(1 + P0**2)
+    np.testing.assert_allclose(beam.x, x * 1e3)
+    np.testing.assert_allclose(beam.xp, px / pz * 1e3)
+    np.testing.assert_allclose(beam.dt, -(z - 0.5) / (P0 / gamma0 * c) * 1e9)
+    np.testing.assert_allclose(beam.dW, (np.sqrt(1 + px**2 + py**2 + pz**2) - gamma0) * amu,
+                               rtol=1e-7, atol=1e-12)
+    assert beam.reference_energy == pytest.approx((gamma0 - 1) * amu)
+
+def test_read_h5part_selected_columns_and_range(h5part_file):
+    beam = OPALIO.read_h5part(h5part_file, **BEAM_PARAMS, columns=['x', 'yp'], start=100, stop=200)
+    assert list(beam.state.columns) == ['x', 'yp']
+    assert beam.macroparticles == 100
+    assert beam.x.mean() == pytest.approx(10e3, rel=1e-3)
+
+def test_iter_steps_and_manager_format(h5part_file):
+    steps = [step for step, beam in OPALIO.iter_steps(h5part_file, **BEAM_PARAMS, columns=['x'])]
+    assert steps == [0, 5, 10]
+    beam = BeamDataIOManager.read('opal', h5part_file, **BEAM_PARAMS, reference_energy=0.2, fmt='h5part')
+    assert beam.reference_energy == 0.2
+    assert BeamDataIOManager.read('opal', h5part_file, **BEAM_PARAMS, reference_energy=0.2).macroparticles == N_PARTICLES
+
+def test_given_reference_energy_sets_dt_velocity(h5part_file):
+    reference_energy = 0.5
+    beam = OPALIO.read_h5part(h5part_file, **BEAM_PARAMS, reference_energy=reference_energy, step=5)
+    with h5py.File(h5part_file, 'r') as f:
+        z = f['Step#5/z'][()]
+    gamma0 = 1 + reference_energy / amu
+    beta0 = np.sqrt(1 - 1 / gamma0**2)
+    np.testing.assert_allclose(beam.dt, -(z - 0.5) / (beta0 * c) * 1e9)
+
+def test_reference_fallback_uses_requested_range(h5part_file):
+    with h5py.File(h5part_file, 'a') as f:
+        g = f['Step#5']
+        del g.attrs['RefPartR'], g.attrs['RefPartP']
+        z, pz = g['z'][100:200], g['pz'][100:200]
+    beam = OPALIO.read_h5part(h5part_file, **BEAM_PARAMS, step=5, columns=['dt'], start=100, stop=200)
+    p0 = pz.mean()
+    gamma0 = np.sqrt(1 + p0**2)
+    assert beam.reference_energy == pytest.approx((gamma0 - 1) * amu)
+    np.testing.assert_allclose(beam.dt, -(z - z.mean()) / (p0 / gamma0 * c) * 1e9)
+    assert beam.dt.mean() == pytest.approx(0.0, abs=1e-9)
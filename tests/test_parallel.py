@@ -0,0 +1,52 @@
+# tests/test_parallel.py
+import numpy as np
+import pytest
+import synapticTrack.beam.beam as beam_module
+from synapticTrack.beam import Beam
+from synapticTrack.utils.parallel import histogram, histogram2d, map_chunks, reduce_moments
+
+@pytest.fixture
+def particles():
+    rng = np.random.default_rng(seed=5)
+    return rng.normal(size=(50_000, 6)) * np.array([1.0, 2.0, 0.5, 1.5, 0.1, 0.01]) + 3.0
+
+def test_map_chunks_keeps_order():
+    parts = map_chunks(lambda start, stop: (start, stop), 10, workers=4, chunk_size=3)
+    assert parts == [(0, 3), (3, 6), (6, 9), (9, 10)]
+
+def test_threaded_moments_match_serial(particles):
+    threaded = reduce_moments(particles, workers=4, chunk_size=4096)
+    columns = reduce_moments([particles[:, 0], particles[:, 1]], workers=4, chunk_size=4096)
+    np.testing.assert_allclose(threaded.mean(), particles.mean(axis=0))
+    np.testing.assert_allclose(threaded.covariance(), np.cov(particles, rowvar=False, ddof=0),
+                               rtol=1e-10, atol=1e-15)
+    np.testing.assert_allclose(columns.covariance(), threaded.covariance()[:2, :2])
+
+def test_threaded_histograms_match_numpy(particles):
+    x, xp = particles[:, 0], particles[:, 1]
+    hist, edges = histogram(x, bins=50, range=(0, 6), workers=4, chunk_size=4096)
+    expected, expected_edges = np.histogram(x, bins=50, range=(0, 6))
+    np.testing.assert_array_equal(hist, expected)
+    np.testing.assert_array_equal(edges, expected_edges)
+    hist2, xedges, yedges = histogram2d(x, xp, bins=40, range=[(0, 6), (-3, 9)], density=True,
+                                        workers=4, chunk_size=4096)
+    expected2 = np.histogram2d(x, xp, bins=40, range=[(0, 6), (-3, 9)], density=True)
+    np.testing.assert_allclose(hist2, expected2[0])
+
+def test_histogram2d_default_range_and_bin_pair(particles):
+    x, y = particles[:, 0], particles[:, 1]
+    hist, xedges, yedges = histogram2d(x, y, bins=(30, 20), workers=4, chunk_size=4096)
+    expected, expected_x, expected_y = np.histogram2d(x, y, bins=(30, 20))
+    np.testing.assert_array_equal(hist, expected)
+    np.testing.assert_array_equal(xedges, expected_x)
+    np.testing.assert_array_equal(yedges, expected_y)
+
+def test_beam_statistics_threaded(particles, monkeypatch):
+    monkeypatch.setattr(beam_module, 'MOMENT_BLOCK_SIZE', 4096)
+    beam = Beam(particles, 40, 8, 0.0, 0.010)
+    stats = beam.statistics(workers=4)
+    np.testing.assert_allclose(stats.covariance(), np.cov(particles, rowvar=False, ddof=0),
+                               rtol=1e-10, atol=1e-15)
+    selection = beam.where(x=(3.0, None))
+    np.testing.assert_allclose(selection.statistics(workers=4).mean(),
+                               particles[particles[:, 0] >= 3.0].mean(axis=0))
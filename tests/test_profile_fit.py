@@ -0,0 +1,64 @@
+# tests/test_profile_fit.py
+import os
+import warnings
+import numpy as np
+import pytest
+from pathlib import Path
+from scipy.optimize import curve_fit
+from synapticTrack.analysis import (fit_gaussians, gaussian_initial_guess, pad_profiles,
+                                    analyze_wire_scanner, analyze_wire_scanners)
+from synapticTrack.io import BeamDataIOManager
+from synapticTrack.utils import gaussian
+
+WIRE_SCANNER_DIR = Path(__file__).parent / "data" / "scanner" / "2_exp_LEBT_WS"
+
+@pytest.fixture
+def noisy_profiles():
+    rng = np.random.default_rng(seed=17)
+    truth = np.column_stack([rng.uniform(1, 5, 50), rng.uniform(-2, 2, 50),
+                             rng.uniform(0.5, 3, 50), rng.uniform(-0.1, 0.1, 50)])
+    positions, currents = [], []
+    for params in truth:
+        x = np.linspace(-10, 10, rng.integers(60, 120))
+        positions.append(x)
+        currents.append(gaussian(x, *params) + rng.normal(scale=0.02, size=len(x)))
+    return truth, positions, currents
+
+def test_batched_fit_matches_curve_fit(noisy_profiles):
+    truth, positions, currents = noisy_profiles
+    x, y, mask = pad_profiles(positions, currents)
+    result = fit_gaussians(x, y, mask)
+    assert result['converged'].all()
+    fitted = result[['amplitude', 'center', 'sigma', 'offset']].to_numpy()
+    for i, (pos, cur) in enumerate(zip(positions, currents)):
+        expected, _ = curve_fit(gaussian, pos, cur, p0=truth[i])
+        np.testing.assert_allclose(fitted[i], expected, rtol=1e-4, atol=1e-6)
+
+def test_log_parabola_guess_is_close(noisy_profiles):
+    truth, positions, currents = noisy_profiles
+    guess = gaussian_initial_guess(*pad_profiles(positions, currents))
+    np.testing.assert_allclose(guess[:, 1], truth[:, 1], atol=0.2)
+    np.testing.assert_allclose(guess[:, 2], truth[:, 2], rtol=0.2)
+
+def test_unfittable_profile_is_flagged():
+    x = np.linspace(-5, 5, 50)
+    flat = np.zeros_like(x)
+    result = fit_gaussians(np.stack([x, x]), np.stack([gaussian(x, 1.0, 0.5, 1.2, 0.0), flat]), method='moments')
+    assert list(result['converged']) == [True, False]
+    assert result['center'][0] == pytest.approx(0.5)
+
+def test_wire_scans_match_per_scan_analysis():
+    scans = [BeamDataIOManager.read_scanner("wire", os.path.join(WIRE_SCANNER_DIR, name))
+             for name in sorted(os.listdir(WIRE_SCANNER_DIR)) if name.endswith(".txt")]
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        batched = analyze_wire_scanners(scans, method='moments')
+        for beamws, (_, row) in zip(scans, batched.iterrows()):
+            single = analyze_wire_scanner(beamws, plot=False)
+            for plane in ('x', 'y'):
+                key = f"gaussian_fit_sigma_{plane}"
+                if np.isfinite(single[key]):
+                    assert row[f"converged_{plane}"]
+                    assert row[key] == pytest.approx(single[key], rel=1e-4)
+                    assert row[f"gaussian_fit_{plane}_center"] == pytest.approx(
+                        single[f"gaussian_fit_{plane}_center"], rel=1e-4, abs=1e-4)
@@ -0,0 +1,53 @@
+# tests/test_scan_archive.py
+import shutil
+import numpy as np
+import pytest
+from pathlib import Path
+from synapticTrack.beam import BeamWS, BeamAS
+from synapticTrack.io import ScanArchive, ScannerIO
+
+SCANNER_DIR = Path(__file__).parent / "data" / "scanner"
+
+@pytest.fixture
+def scan_tree(tmp_path):
+    root = tmp_path / "scans"
+    shutil.copytree(SCANNER_DIR / "2_exp_LEBT_WS", root / "day1")
+    return root
+
+def test_ingest_builds_indexed_table(scan_tree, tmp_path):
+    archive = ScanArchive(tmp_path / "scans.h5")
+    assert archive.ingest(scan_tree, workers=2) == {'wire': 4}
+
+    index = archive.index('wire')
+    assert list(index['scan_id']) == sorted(p.stem for p in (scan_tree / "day1").glob("*.txt"))
+    assert (index['start'].to_numpy()[1:] == index['stop'].to_numpy()[:-1]).all()
+    assert len(archive.table('wire')) == index['stop'].iloc[-1]
+
+    filename = scan_tree / "day1" / "LEBT-WS003-100325.txt"
+    expected = ScannerIO.read_wire_scanner(str(filename))
+    scan = archive.scan('wire', 'LEBT-WS003-100325')
+    assert isinstance(scan, BeamWS)
+    np.testing.assert_array_equal(scan.data.to_numpy(), expected.data.to_numpy())
+    assert np.shares_memory(scan.x_position.to_numpy(), archive.table('wire').to_numpy())
+
+def test_incremental_ingest(scan_tree, tmp_path):
+    archive = ScanArchive(tmp_path / "scans.h5")
+    archive.ingest(scan_tree, workers=1)
+    assert archive.ingest(scan_tree, workers=1) == {}
+
+    shutil.copytree(SCANNER_DIR / "3_exp_Allison", scan_tree / "day2")
+    assert archive.ingest(scan_tree, workers=1) == {'allison': 2}
+    assert archive.scanners() == ['wire', 'allison']
+    assert len(archive.index('wire')) == 4
+
+    scans = list(ScanArchive(tmp_path / "scans.h5").iter_scans('allison'))
+    assert [scan.scan_id for scan in scans] == ['101614_X', '102829_Y']
+    assert all(isinstance(scan, BeamAS) and scan.num_points() == 10000 for scan in scans)
+
+def test_scan_lookup_errors(scan_tree, tmp_path):
+    archive = ScanArchive(tmp_path / "scans.h5")
+    archive.ingest(scan_tree, workers=1)
+    with pytest.raises(KeyError):
+        archive.scan('wire', 'missing')
+    with pytest.raises(KeyError):
+        archive.index('allison')
@@ -0,0 +1,72 @@
+# tests/test_scan_series.py
+import os
+import warnings
+import numpy as np
+import pytest
+from pathlib import Path
+from synapticTrack.analysis import ScanSeriesAnalyzer, analyze_wire_scanner
+from synapticTrack.beam import BeamWS
+from synapticTrack.io import BeamDataIOManager
+
+WIRE_SCANNER_DIR = Path(__file__).parent / "data" / "scanner" / "2_exp_LEBT_WS"
+
+@pytest.fixture
+def steering_scans():
+    """A steering series: one measured scan, shifted a little further at every step."""
+    beamws = BeamDataIOManager.read_scanner("wire", os.path.join(WIRE_SCANNER_DIR, "LEBT-WS002-100523.txt"))
+    scans = []
+    for step in range(4):
+        data = beamws.data.copy()
+        data['x_pos'] = data['x_pos'] + 0.1 * step
+        scans.append(BeamWS(data, scan_id=f"step{step}"))
+    return scans
+
+@pytest.fixture(autouse=True)
+def quiet():
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        yield
+
+def test_warm_started_series_matches_cold_fits(steering_scans):
+    analyzer = ScanSeriesAnalyzer('wire')
+    table = analyzer.analyze(steering_scans)
+    assert list(table.index) == ["step0", "step1", "step2", "step3"]
+    assert analyzer.misses == 4 and analyzer.hits == 0
+    for scan in steering_scans:
+        cold = analyze_wire_scanner(scan, plot=False)
+        assert table.loc[scan.scan_id, "gaussian_fit_x_center"] == pytest.approx(cold["gaussian_fit_x_center"], rel=1e-4)
+        assert table.loc[scan.scan_id, "gaussian_fit_sigma_y"] == pytest.approx(cold["gaussian_fit_sigma_y"], rel=1e-4)
+    shifts = np.diff(table["gaussian_fit_x_center"])
+    np.testing.assert_allclose(shifts, 0.1, rtol=1e-3)
+
+def test_only_new_scans_are_analyzed(steering_scans, tmp_path):
+    cache = tmp_path / "series.json"
+    analyzer = ScanSeriesAnalyzer('wire', cache_file=cache)
+    analyzer.analyze(steering_scans[:3])
+    analyzer.analyze(steering_scans)
+    assert analyzer.misses == 4 and analyzer.hits == 3
+
+    reloaded = ScanSeriesAnalyzer('wire', cache_file=cache)
+    table = reloaded.analyze(steering_scans)
+    assert reloaded.misses == 0 and reloaded.hits == 4
+    assert len(reloaded) == 4
+    assert table.loc["step3", "gaussian_fit_params_x"][1] == pytest.approx(table.loc["step3", "gaussian_fit_x_center"])
+
+def test_key_depends_on_content(steering_scans):
+    analyzer = ScanSeriesAnalyzer('wire')
+    renamed = BeamWS(steering_scans[0].data, scan_id="other")
+    assert analyzer.key(renamed) == analyzer.key(steering_scans[0])
+    assert analyzer.key(steering_scans[1]) != analyzer.key(steering_scans[0])
+    assert ScanSeriesAnalyzer('allison').key(steering_scans[0]) != analyzer.key(steering_scans[0])
+    assert ScanSeriesAnalyzer('wire', warm_start=False).key(steering_scans[0]) != analyzer.key(steering_scans[0])
+
+def test_failed_fit_does_not_poison_series():
+    # The ECR32 profile has a negative current variance, so its fit is NaN; later scans must not start from it
+    names = ["ECR32-WS001-100717.txt", "LEBT-WS002-100523.txt", "LEBT-WS003-100325.txt"]
+    scans = [BeamDataIOManager.read_scanner("wire", os.path.join(WIRE_SCANNER_DIR, name)) for name in names]
+    warm = ScanSeriesAnalyzer('wire').analyze(scans)
+    cold = ScanSeriesAnalyzer('wire', warm_start=False).analyze(scans)
+    assert np.isnan(warm["gaussian_fit_sigma_x"].iloc[0])
+    columns = ["gaussian_fit_x_center", "gaussian_fit_sigma_x", "gaussian_fit_y_center", "gaussian_fit_sigma_y"]
+    assert np.all(np.isfinite(warm[columns].iloc[1:].to_numpy()))
+    np.testing.assert_allclose(warm[columns].iloc[1:].to_numpy(), cold[columns].iloc[1:].to_numpy(), rtol=1e-3)
@@ -0,0 +1,55 @@
+# tests/test_sqlite_catalog.py
+import pytest
+from pathlib import Path
+from synapticTrack.io import BeamDataIOManager, BeamCatalog, lattice_fingerprint
+from synapticTrack.lattice import Lattice, Drift
+
+DATA_DIR = Path(__file__).parent / "data" / "input_beam"
+
+@pytest.fixture
+def track_beam():
+    return BeamDataIOManager.read('track', str(DATA_DIR / "coord.out"),
+                                  mass_number=40, charge_state=8,
+                                  beam_current=0.0, reference_energy=0.010)
+
+@pytest.fixture
+def catalog(tmp_path):
+    catalog = BeamDataIOManager.open_catalog(str(tmp_path / "catalog.sqlite"))
+    yield catalog
+    BeamDataIOManager.close_catalog()
+
+def test_writes_are_catalogued(track_beam, catalog, tmp_path):
+    lattice = Lattice([Drift(name="d1", length=10.0, rx=2.0, ry=2.0)])
+    BeamDataIOManager.write('track', str(tmp_path / "ws3.out"), track_beam, lattice=lattice, label="WS3")
+    BeamDataIOManager.save(str(tmp_path / "beams.h5"), track_beam, group="run_001/WS4", label="WS4")
+    assert len(catalog) == 2
+
+    entries = list(catalog.find(label="WS3"))
+    assert len(entries) == 1
+    entry = entries[0]
+    assert entry.lattice == lattice_fingerprint(lattice)
+    assert entry.macroparticles == track_beam.macroparticles
+    assert entry.sigma_x == pytest.approx(track_beam.rms_size['x'])
+
+def test_range_queries_and_lazy_open(track_beam, catalog, tmp_path):
+    BeamDataIOManager.save(str(tmp_path / "beams.h5"), track_beam, group="run_001/WS3", label="WS3")
+    sigma_x = track_beam.rms_size['x']
+    assert list(catalog.find(label="WS3", sigma_x=(None, sigma_x / 2))) == []
+
+    entry = next(catalog.find(label="WS3", sigma_x=(None, sigma_x * 2)))
+    assert entry.group_name == "run_001/WS3"
+    beam = entry.open(columns=['x', 'y'])
+    assert beam.macroparticles == track_beam.macroparticles
+    assert list(beam.state.columns) == ['x', 'y']
+
+def test_rewrite_replaces_row(track_beam, catalog, tmp_path):
+    filename = str(tmp_path / "beam.out")
+    BeamDataIOManager.write('track', filename, track_beam, lattice="lat-a")
+    BeamDataIOManager.write('track', filename, track_beam, lattice="lat-b")
+    assert len(catalog) == 1
+    assert next(catalog.find(lattice="lat-b")).path == str(Path(filename).resolve())
+
+def test_unknown_column_raises(tmp_path):
+    with BeamCatalog(str(tmp_path / "catalog.sqlite")) as catalog:
+        with pytest.raises(KeyError):
+            list(catalog.find(not_a_column=1))
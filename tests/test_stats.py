@@ -0,0 +1,68 @@
+# tests/test_stats.py
+import numpy as np
+import pytest
+from scipy import stats as sps
+from synapticTrack.utils.stats import (Moments, calc_mean_weighted, calc_variance, calc_covariance,
+                                       calc_correlation, calc_rms, calc_moment)
+
+@pytest.fixture
+def samples():
+    rng = np.random.default_rng(seed=11)
+    values = rng.gamma(2.0, size=(5000, 3)) + np.array([1e4, 0.0, -3.0])
+    weights = rng.uniform(0.1, 2.0, size=5000)
+    return values, weights
+
+def test_chunked_merge_matches_single_pass(samples):
+    values, weights = samples
+    full = Moments(order=4).update(values, weights)
+    merged = Moments(order=4)
+    for chunk in np.array_split(np.arange(len(values)), 7):
+        merged.merge(Moments(order=4).update(values[chunk], weights[chunk]))
+    np.testing.assert_allclose(merged.mean(), full.mean())
+    np.testing.assert_allclose(merged.covariance(), full.covariance(), rtol=1e-10)
+    for order in (3, 4):
+        np.testing.assert_allclose(merged.central_moment(order), full.central_moment(order), rtol=1e-9)
+
+def test_weighted_moments_match_numpy(samples):
+    values, weights = samples
+    moments = Moments(order=3).update(values, weights)
+    mean = np.average(values, axis=0, weights=weights)
+    np.testing.assert_allclose(moments.mean(), mean)
+    np.testing.assert_allclose(moments.covariance(), np.cov(values, rowvar=False, aweights=weights, ddof=0))
+    np.testing.assert_allclose(moments.central_moment(3),
+                               np.average((values - mean)**3, axis=0, weights=weights), rtol=1e-9)
+    unweighted = Moments(order=4).update(values)
+    np.testing.assert_allclose(unweighted.central_moment(4), sps.moment(values, 4, axis=0), rtol=1e-9)
+
+def test_round_trip_state(samples):
+    values, weights = samples
+    moments = Moments(order=3).update(values, weights)
+    restored = Moments.from_dict(moments.to_dict())
+    assert restored.count == moments.count and restored.weight == pytest.approx(moments.weight)
+    np.testing.assert_allclose(restored.central_moment(3), moments.central_moment(3))
+
+def test_wrappers_keep_their_results(samples):
+    values, weights = samples
+    x, y = values[:, 1], values[:, 2]
+    mean = np.sum(weights * x) / np.sum(weights)
+    assert calc_mean_weighted(x, weights) == pytest.approx(mean)
+    assert calc_variance(x, weights) == pytest.approx(np.sum(weights * (x - mean)**2) / np.sum(weights))
+    assert calc_covariance(x, y) == pytest.approx(np.cov(x, y, ddof=0)[0, 1])
+    assert calc_correlation(x, y) == pytest.approx(np.corrcoef(x, y)[0, 1])
+    assert calc_rms(x, weights) == pytest.approx(np.sqrt(np.sum(weights * x**2) / np.sum(weights)))
+    assert calc_moment(x, 3) == pytest.approx(np.mean((x - x.mean())**3))
+
+def test_wrappers_keep_their_edge_case_results():
+    x, y = np.array([1.0, 2.0, 4.0]), np.array([0.5, -1.0, 2.0])
+    zero = np.zeros(3)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        for value in (calc_mean_weighted(x, zero), calc_variance(x, zero), calc_covariance(x, y, zero),
+                      calc_correlation(x, y, zero), calc_rms(x, zero), calc_moment(x, 3, zero)):
+            assert np.isnan(value)
+        with pytest.warns(RuntimeWarning):
+            assert np.isnan(calc_mean_weighted(np.array([])))
+    assert calc_moment(x, 0) == 1.0
+    assert calc_moment(x, 0, weights=np.array([1.0, 2.0, 3.0])) == 1.0
+    # Order 1 is exactly 0 (the plain formula left a rounding residual)
+    assert calc_moment(x, 1) == 0.0
+    assert calc_moment(x, 2) == pytest.approx(calc_variance(x))
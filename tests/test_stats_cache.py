@@ -0,0 +1,106 @@
+# tests/test_stats_cache.py
+import os
+import shutil
+import numpy as np
+import pytest
+from pathlib import Path
+from synapticTrack.io import BeamDataIOManager, StatsCache
+
+DATA_DIR = Path(__file__).parent / "data" / "input_beam"
+BEAM_PARAMS = dict(mass_number=40, charge_state=8, beam_current=0.0, reference_energy=0.010)
+
+@pytest.fixture
+def stats_cache(tmp_path):
+    cache = BeamDataIOManager.open_stats_cache(str(tmp_path / "stats.sqlite"))
+    yield cache
+    BeamDataIOManager.close_stats_cache()
+
+def test_statistics_served_from_cache(stats_cache, tmp_path, monkeypatch):
+    filename = tmp_path / "coord.out"
+    shutil.copy(DATA_DIR / "coord.out", filename)
+    first = BeamDataIOManager.read_statistics('track', str(filename), **BEAM_PARAMS)
+    assert len(stats_cache) == 1
+    assert stats_cache.get(str(filename))["beam_sigma"]["x"] == pytest.approx(first.rms_size["x"])
+
+    def fail(*args, **kwargs):
+        raise AssertionError("particle data should not be read")
+
+    monkeypatch.setattr(BeamDataIOManager, "iter_chunks", fail)
+    second = BeamDataIOManager.read_statistics('track', str(filename), **BEAM_PARAMS)
+    np.testing.assert_array_equal(second.covariance(), first.covariance())
+
+def test_rewritten_file_invalidates_entry(stats_cache, tmp_path):
+    filename = tmp_path / "coord.out"
+    shutil.copy(DATA_DIR / "coord.out", filename)
+    before = BeamDataIOManager.read_statistics('track', str(filename), **BEAM_PARAMS)
+
+    lines = filename.read_text().splitlines(keepends=True)
+    filename.write_text("".join(lines[:5001]))
+    stat = os.stat(filename)
+    os.utime(filename, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    after = BeamDataIOManager.read_statistics('track', str(filename), **BEAM_PARAMS)
+    assert before.count == 10001
+    assert after.count == 5000
+
+def test_file_rewritten_during_pass_is_not_cached(stats_cache, tmp_path, monkeypatch):
+    filename = tmp_path / "coord.out"
+    shutil.copy(DATA_DIR / "coord.out", filename)
+    iter_chunks = BeamDataIOManager.iter_chunks
+
+    def rewrite_midway(*args, **kwargs):
+        for i, chunk in enumerate(iter_chunks(*args, **kwargs)):
+            if i == 0:
+                # Replaced as a new file, so the open pass keeps reading the old contents
+                lines = filename.read_text().splitlines(keepends=True)
+                (tmp_path / "new.out").write_text("".join(lines[:5001]))
+                os.replace(tmp_path / "new.out", filename)
+            yield chunk
+
+    monkeypatch.setattr(BeamDataIOManager, "iter_chunks", rewrite_midway)
+    BeamDataIOManager.read_statistics('track', str(filename), chunk_size=4000, **BEAM_PARAMS)
+    assert len(stats_cache) == 0
+    monkeypatch.undo()
+    assert BeamDataIOManager.read_statistics('track', str(filename), **BEAM_PARAMS).count == 5000
+
+@pytest.mark.parametrize("code", ['track', 'jutrack'])
+def test_seeded_statistics_equal_cold_read(stats_cache, tmp_path, monkeypatch, code):
+    beam = BeamDataIOManager.read('track', str(DATA_DIR / "coord.out"), **BEAM_PARAMS)
+    filename = str(tmp_path / "beam.out")
+    BeamDataIOManager.write(code, filename, beam)
+    assert len(stats_cache) == 1
+
+    def fail(*args, **kwargs):
+        raise AssertionError("particle data should not be read")
+
+    monkeypatch.setattr(BeamDataIOManager, "iter_chunks", fail)
+    seeded = BeamDataIOManager.read_statistics(code, filename)
+    monkeypatch.undo()
+    stats_cache.clear()
+    cold = BeamDataIOManager.read_statistics(code, filename)
+    np.testing.assert_array_equal(seeded.mean(), cold.mean())
+    np.testing.assert_array_equal(seeded.covariance(), cold.covariance())
+
+def test_unreadable_write_is_not_seeded(stats_cache, tmp_path):
+    beam = BeamDataIOManager.read('track', str(DATA_DIR / "coord.out"), **BEAM_PARAMS)
+    BeamDataIOManager.write('opal', str(tmp_path / "beam.txt"), beam)
+    assert len(stats_cache) == 0
+
+def test_lru_bound(tmp_path):
+    with StatsCache(str(tmp_path / "stats.sqlite"), max_entries=2) as cache:
+        for i in range(4):
+            path = tmp_path / f"f{i}.out"
+            path.write_text(str(i))
+            cache.put(str(path), {"i": i})
+        assert len(cache) == 2
+        assert cache.get(str(tmp_path / "f0.out")) is None
+        assert cache.get(str(tmp_path / "f3.out")) == {"i": 3}
+
+def test_metadata_reads_are_cached(tmp_path):
+    beam = BeamDataIOManager.read('track', str(DATA_DIR / "coord.out"), **BEAM_PARAMS)
+    filename = tmp_path / "beam.out"
+    BeamDataIOManager.write('track', str(filename), beam)
+    first = BeamDataIOManager.read_beam_metadata(str(filename))
+    first["mass_number"] = -1
+    second = BeamDataIOManager.read_beam_metadata(str(filename))
+    assert second["mass_number"] == 40
+    assert second["beam_sigma"]["x"] == pytest.approx(beam.rms_size["x"])
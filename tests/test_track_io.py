@@ -0,0 +1,155 @@
+# tests/test_track_io.py
+import numpy as np
+import pandas as pd
+import pytest
+from pathlib import Path
+import synapticTrack.io.track_io as track_io
+from synapticTrack.beam import Beam
+from synapticTrack.io import BeamDataIOManager, TrackIO
+
+DATA_DIR = Path(__file__).parent / "data" / "input_beam"
+
+BEAM_PARAMS = dict(mass_number=40, charge_state=8, beam_current=0.0, reference_energy=0.010)
+
+@pytest.fixture
+def scratch_beam():
+    filename = DATA_DIR / "scratch.#02"
+    assert filename.exists(), f"Missing scratch file: {filename}"
+    return TrackIO.read_scratch(str(filename), **BEAM_PARAMS)
+
+def test_read_scratch_matches_coord_out(scratch_beam):
+    """The binary scratch.#02 decodes to the same particles TRACK dumps in coord.out."""
+    coord = pd.read_csv(DATA_DIR / "coord.out", sep=r'\s+', skiprows=1,
+                        names=["Nseed", "iq", "dt", "dW", "x", "xp", "y", "yp"])
+    # coord.out keeps the reference particle as its first row
+    coord = coord.iloc[1:]
+    assert scratch_beam.macroparticles == len(coord)
+    np.testing.assert_allclose(scratch_beam.x, coord['x'] * 10, rtol=1e-4, atol=1e-4)
+    np.testing.assert_allclose(scratch_beam.xp, coord['xp'], rtol=1e-4, atol=1e-4)
+    np.testing.assert_allclose(scratch_beam.y, coord['y'] * 10, rtol=1e-4, atol=1e-4)
+    np.testing.assert_allclose(scratch_beam.yp, coord['yp'], rtol=1e-4, atol=1e-4)
+    np.testing.assert_allclose(scratch_beam.dt, coord['dt'], rtol=1e-4, atol=1e-4)
+    np.testing.assert_allclose(scratch_beam.dW, coord['dW'], rtol=1e-3, atol=1e-9)
+
+def test_scratch_round_trip(scratch_beam, tmp_path):
+    template = str(DATA_DIR / "scratch.#02")
+    for kwargs in ({}, {"template": template}):
+        filename = tmp_path / "scratch.#03"
+        TrackIO.write_scratch(str(filename), scratch_beam, **kwargs)
+        beam = TrackIO.read_scratch(str(filename), **BEAM_PARAMS)
+        np.testing.assert_allclose(beam.state.values, scratch_beam.state.values, rtol=1e-9, atol=1e-12)
+
+def test_scratch_template_keeps_header(scratch_beam, tmp_path):
+    template = str(DATA_DIR / "scratch.#02")
+    filename = tmp_path / "scratch.#03"
+    TrackIO.write_scratch(str(filename), scratch_beam, template=template)
+    assert TrackIO.scratch_layout(str(filename))[0] == TrackIO.scratch_layout(template)[0]
+
+def test_scratch_through_manager(scratch_beam, tmp_path):
+    filename = tmp_path / "scratch.#04"
+    BeamDataIOManager.write('track', str(filename), scratch_beam, fmt='scratch')
+    assert Path(BeamDataIOManager.metadata_path(str(filename))).name == "scratch.#04.json"
+    beam = BeamDataIOManager.read('track', str(filename), fmt='scratch')
+    assert isinstance(beam, Beam)
+    assert beam.macroparticles == scratch_beam.macroparticles
+
+def test_read_scratch_written_by_fortran():
+    """scratch_gfortran.#02 is written by make_scratch.f90 from the first 200 particles of coord.out."""
+    beam = TrackIO.read_scratch(str(DATA_DIR / "scratch_gfortran.#02"), **BEAM_PARAMS)
+    coord = np.loadtxt(DATA_DIR / "coord.out", skiprows=1, max_rows=201)
+    particles = coord[1:]
+    assert beam.macroparticles == 200
+    np.testing.assert_allclose(beam.x, particles[:, 4] * 10, rtol=1e-12)
+    np.testing.assert_allclose(beam.xp, particles[:, 5], rtol=1e-12)
+    np.testing.assert_allclose(beam.y, particles[:, 6] * 10, rtol=1e-12)
+    np.testing.assert_allclose(beam.yp, particles[:, 7], rtol=1e-12)
+    np.testing.assert_allclose(beam.dt, particles[:, 2], rtol=1e-12, atol=1e-15)
+    # dW is relative to the reference particle, the first row of coord.out
+    np.testing.assert_allclose(beam.dW, particles[:, 3] - coord[0, 3], rtol=1e-6, atol=1e-12)
+
+def test_read_scratch_blocks_match(scratch_beam, monkeypatch):
+    monkeypatch.setattr(track_io, "SCRATCH_BLOCK_SIZE", 999)
+    for dtype in (np.float64, np.float32):
+        beam = TrackIO.read_scratch(str(DATA_DIR / "scratch.#02"), **BEAM_PARAMS, dtype=dtype)
+        np.testing.assert_array_equal(beam.to_numpy(), scratch_beam.to_numpy().astype(dtype))
+
+def test_map_scratch_keeps_file_views():
+    records = TrackIO.map_scratch(str(DATA_DIR / "scratch_gfortran.#02"))
+    assert isinstance(records, np.memmap) and len(records) == 201
+    x = records['x'][1:]
+    assert np.shares_memory(x, records) and not x.flags.writeable
+
+def test_read_scratch_rejects_text_file():
+    with pytest.raises(ValueError):
+        TrackIO.read_scratch(str(DATA_DIR / "coord.out"), **BEAM_PARAMS)
+
+def test_read_matches_pandas_parser():
+    """The shared text parser returns the same beam as the pandas whitespace parser."""
+    filename = DATA_DIR / "coord.out"
+    beam = TrackIO.read(str(filename), **BEAM_PARAMS)
+    df = pd.read_csv(filename, sep=r'\s+', skiprows=1,
+                     names=["Nseed", "iq", "dt", "dW", "x", "xp", "y", "yp"], engine='python')
+    assert list(beam.state.columns) == ["x", "xp", "y", "yp", "dt", "dW"]
+    np.testing.assert_array_equal(beam.x, df['x'] * 10)
+    np.testing.assert_array_equal(beam.dW, df['dW'])
+
+def test_read_many_process_pool(tmp_path):
+    filename = DATA_DIR / "coord.out"
+    files = [str(filename)] * 4
+    beams = BeamDataIOManager.read_many('track', files, workers=2, **BEAM_PARAMS)
+    assert len(beams) == 4
+    assert all(beam.macroparticles == 10001 for beam in beams)
+    stacked = BeamDataIOManager.read_many('track', files, workers=2, stack=True, **BEAM_PARAMS)
+    assert stacked.shape == (4, 10001, 6)
+    np.testing.assert_array_equal(stacked[2, :, 0], beams[0].x)
+
+@pytest.mark.parametrize("fmt", [None, 'scratch'])
+def test_float32_read_keeps_statistics(fmt):
+    filename = DATA_DIR / ("scratch.#02" if fmt else "coord.out")
+    beam64 = BeamDataIOManager.read('track', str(filename), **BEAM_PARAMS, fmt=fmt)
+    beam32 = BeamDataIOManager.read('track', str(filename), **BEAM_PARAMS, fmt=fmt, dtype=np.float32)
+    assert beam32.dtype == np.float32
+    assert beam32.data.nbytes * 2 == beam64.data.nbytes
+    np.testing.assert_allclose(beam32.rms_size, beam64.rms_size, rtol=1e-5)
+    assert beam32.statistics().covariance().dtype == np.float64
+    np.testing.assert_allclose(beam32.centroid, beam64.centroid, rtol=1e-4, atol=1e-9)
+
+def test_lost_ids_mask_coord_out_rows(tmp_path):
+    # TRACK's coord.out carries no particle numbers (Nseed is the seed), so particles are numbered by row
+    beam = TrackIO.read(str(DATA_DIR / "coord.out"), **BEAM_PARAMS)
+    np.testing.assert_array_equal(beam.ids, np.arange(beam.macroparticles))
+    lost = tmp_path / "lost.out"
+    lost.write_text(" Nseed  iq  x  y\n5 1 0.1 0.2\n7 1 0.3 0.4\n")
+    ids = TrackIO.read_lost_ids(lost, macroparticles=beam.macroparticles)
+    survivors = beam.where(exclude_ids=ids)
+    np.testing.assert_array_equal(survivors.data, np.delete(beam.data, [5, 7], axis=0))
+
+    lost.write_text(" Nseed  iq  x  y\n5 1 0.1 0.2\n%d 1 0.3 0.4\n" % beam.macroparticles)
+    with pytest.raises(ValueError):
+        TrackIO.read_lost_ids(lost, macroparticles=beam.macroparticles)
+
+def test_particle_ids_survive_write_and_read(tmp_path):
+    beam = TrackIO.read(str(DATA_DIR / "coord.out"), **BEAM_PARAMS)
+    survivors = beam.where(exclude_ids=[2, 3, 11]).to_beam()
+    filename = tmp_path / "coord.out"
+    TrackIO.write(str(filename), survivors)
+    reread = TrackIO.read(str(filename), **BEAM_PARAMS)
+    np.testing.assert_array_equal(reread.ids, survivors.ids)
+    assert not np.isin([2, 3, 11], reread.ids).any()
+
+def test_read_parses_coord_out_once(tmp_path, monkeypatch):
+    beam = TrackIO.read(str(DATA_DIR / "coord.out"), **BEAM_PARAMS)
+    filename = tmp_path / "coord.out"
+    TrackIO.write(str(filename), beam.where(exclude_ids=[0]).to_beam())
+    calls = []
+    read_columns = track_io.read_columns
+
+    def counting(*args, **kwargs):
+        calls.append(args)
+        return read_columns(*args, **kwargs)
+
+    monkeypatch.setattr(track_io, "read_columns", counting)
+    for dtype in (np.float64, np.float32):
+        reread = TrackIO.read(str(filename), **BEAM_PARAMS, dtype=dtype)
+        np.testing.assert_array_equal(reread.ids, np.arange(1, beam.macroparticles))
+    assert len(calls) == 2